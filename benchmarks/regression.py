@@ -0,0 +1,269 @@
+"""
+Performance regression gate: validates a corpus of SIPs, compares the time of
+the validation and of every stage, and the peak memory, with a baseline file,
+and fails when one of them exceeds its threshold.
+
+    python -m benchmarks.regression                    # compare with the baseline
+    python -m benchmarks.regression --update-baseline  # record a new baseline
+
+By default, a fixed set of synthetic SIPs is used (`--corpus generated`), which
+needs no checkout of the examples submodule. With `--corpus examples`, all SIPs
+under `tests/sip-examples/2.1` are used, including the ones that `test_examples.py`
+excludes.
+
+The baseline file holds one baseline per corpus. The comparison is written to stdout
+as CSV, one row per SIP and metric. A SIP of the baseline that was not measured is
+reported as MISSING and fails the gate, like a regression.
+Timings depend on the machine: record the baseline on the machine that runs the gate.
+"""
+
+from dataclasses import asdict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+import argparse
+import csv
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import tomllib
+
+from .scaling import measure
+from .sip_generator import SipSpec, generate_sip
+
+EXAMPLES_PATH = Path("tests/sip-examples/2.1")
+DEFAULT_BASELINE_PATH = Path("benchmarks/baseline.json")
+
+# Synthetic SIPs of `--corpus generated`
+GENERATED_SPECS = {
+    "basic-small": SipSpec(profile="basic"),
+    "basic-many-files": SipSpec(profile="basic", files=500, events_per_file=2),
+    "film-representations": SipSpec(profile="film", representations=10, files=20),
+    "material-artwork-large-data": SipSpec(
+        profile="material-artwork", files=4, data_size=16 * 1024**2
+    ),
+}
+
+CSV_COLUMNS = ["sip", "metric", "baseline", "current", "ratio", "status"]
+
+
+def get_version() -> str:
+    "The version of the validator, also when it is run from a checkout that is not installed."
+    try:
+        return version("meemoo-sip-validator")
+    except PackageNotFoundError:
+        with open("pyproject.toml", "rb") as f:
+            return tomllib.load(f)["project"]["version"]
+
+
+def get_example_sips(examples_path: Path) -> dict[str, Path]:
+    "Every example SIP, by name. Each example folder holds a single unzipped SIP."
+    if not examples_path.is_dir() or not any(examples_path.iterdir()):
+        raise SystemExit(
+            f"No example SIPs in {examples_path}. Run `git submodule update --init` "
+            "or use `--corpus generated`."
+        )
+    return {
+        path.name: next(path.iterdir())
+        for path in sorted(examples_path.iterdir())
+        if path.is_dir()
+    }
+
+
+def measure_sips(
+    sips: dict[str, Path], repeat: int, skip_stages: tuple[str, ...]
+) -> dict[str, dict[str, Any]]:
+    "The fastest of `repeat` validations of every SIP, each in a fresh process."
+    context = multiprocessing.get_context("spawn")
+    measurements: dict[str, dict[str, Any]] = {}
+    for name, sip_path in sips.items():
+        runs: list[dict[str, Any]] = []
+        for _ in range(repeat):
+            with context.Pool(1) as pool:
+                runs.append(pool.apply(measure, (str(sip_path), skip_stages)))
+        best = min(runs, key=lambda run: run["wall_time"])
+        measurements[name] = {
+            **best,
+            "max_rss": max(run["max_rss"] for run in runs),
+        }
+        print(f"{name}: {best['wall_time']:.3f}s, {best['outcome']}", file=sys.stderr)
+    return measurements
+
+
+def get_metrics(measurement: dict[str, Any]) -> dict[str, float]:
+    "The compared metrics of a SIP: seconds, except `max_rss` in kilobytes."
+    return {
+        "total": measurement["wall_time"],
+        **{
+            f"stage:{stage}": timing["wall_time"]
+            for stage, timing in measurement["stages"].items()
+        },
+        "max_rss": measurement["max_rss"],
+    }
+
+
+def compare(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    time_threshold: float,
+    rss_threshold: float,
+    min_time: float,
+) -> list[dict[str, Any]]:
+    """
+    Compare every metric of every SIP with the baseline. A time regresses when it is
+    more than `time_threshold` times the baseline and at least `min_time` seconds slower,
+    as shorter times are mostly noise. The peak memory regresses when it is more than
+    `rss_threshold` times the baseline.
+    """
+    rows: list[dict[str, Any]] = [
+        {
+            "sip": sip,
+            "metric": "total",
+            "baseline": get_metrics(measurement)["total"],
+            "status": "MISSING",
+        }
+        for sip, measurement in baseline.items()
+        if sip not in current
+    ]
+    for sip, measurement in current.items():
+        current_metrics = get_metrics(measurement)
+        baseline_metrics = get_metrics(baseline[sip]) if sip in baseline else {}
+        for metric, value in current_metrics.items():
+            before = baseline_metrics.get(metric)
+            if before is None:
+                rows.append(
+                    {"sip": sip, "metric": metric, "current": value, "status": "NEW"}
+                )
+                continue
+
+            ratio = value / before if before > 0 else 1.0
+            if metric == "max_rss":
+                regressed = ratio > rss_threshold
+            else:
+                regressed = ratio > time_threshold and value - before >= min_time
+            rows.append(
+                {
+                    "sip": sip,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": value,
+                    "ratio": round(ratio, 3),
+                    "status": "REGRESSION" if regressed else "OK",
+                }
+            )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the validation time and memory of the example SIPs with a baseline."
+    )
+    _ = parser.add_argument(
+        "--corpus", choices=["examples", "generated"], default="generated"
+    )
+    _ = parser.add_argument("--examples", type=Path, default=EXAMPLES_PATH)
+    _ = parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    _ = parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the measurements to the baseline file instead of comparing.",
+    )
+    _ = parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=1.5,
+        help="Maximum ratio of a time to its baseline (default: 1.5).",
+    )
+    _ = parser.add_argument(
+        "--rss-threshold",
+        type=float,
+        default=1.25,
+        help="Maximum ratio of the peak memory to its baseline (default: 1.25).",
+    )
+    _ = parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="Time differences below this many seconds are never a regression (default: 0.05).",
+    )
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    _ = parser.add_argument("--with-commons-ip", action="store_true")
+    _ = parser.add_argument(
+        "--json", type=Path, help="Also write the measurements to this file."
+    )
+    args = parser.parse_args()
+    skip_stages = () if args.with_commons_ip else ("commons-ip",)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.corpus == "examples":
+            sips = get_example_sips(args.examples)
+        else:
+            sips = {
+                name: generate_sip(Path(directory) / name, spec)
+                for name, spec in GENERATED_SPECS.items()
+            }
+        measurements = measure_sips(sips, args.repeat, skip_stages)
+
+    result = {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "corpus": args.corpus,
+        "skip_stages": list(skip_stages),
+        "specs": (
+            {name: asdict(spec) for name, spec in GENERATED_SPECS.items()}
+            if args.corpus == "generated"
+            else None
+        ),
+        "sips": measurements,
+    }
+    if args.json is not None:
+        _ = args.json.write_text(json.dumps(result, indent=2))
+
+    baselines: dict[str, Any] = (
+        json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    )
+    if args.update_baseline:
+        baselines[args.corpus] = result
+        _ = args.baseline.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(
+            f"Wrote the baseline of the {args.corpus} corpus to {args.baseline}",
+            file=sys.stderr,
+        )
+        return 0
+
+    baseline = baselines.get(args.corpus)
+    if baseline is None:
+        print(
+            f"No baseline of the {args.corpus} corpus in {args.baseline}. "
+            "Record one with --update-baseline.",
+            file=sys.stderr,
+        )
+        return 2
+
+    rows = compare(
+        baseline["sips"],
+        measurements,
+        args.time_threshold,
+        args.rss_threshold,
+        args.min_time,
+    )
+    writer = csv.DictWriter(sys.stdout, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+    regressions = [row for row in rows if row["status"] == "REGRESSION"]
+    missing = [row for row in rows if row["status"] == "MISSING"]
+    if regressions or missing:
+        print(
+            f"{len(regressions)} regression(s), {len(missing)} missing SIP(s).",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Times `validate_to_report` and every validation stage on synthetic SIPs of
+growing size, to find rules that do not scale linearly and regressions.
+
+    python -m benchmarks.scaling --dimension files --sizes 10 100 1000
+    python -m benchmarks.scaling --dimension data_size --sizes 1000000 10000000 --files 10
+
+Every SIP is validated in a fresh process, so the peak memory (max RSS) is that
+of a single validation. commons-ip is skipped unless `--with-commons-ip` is given.
+"""
+
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import Any
+import argparse
+import json
+import math
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+
+from .sip_generator import SipSpec, generate_sip
+
+# Growth exponents above this are reported as superlinear.
+SUPERLINEAR_EXPONENT = 1.5
+
+
+def measure(sip_path: str, skip_stages: tuple[str, ...]) -> dict[str, Any]:
+    "Validates a SIP once. Runs in a fresh process."
+    from meemoo_sip_validator.v2_1 import (
+        ValidationOptions,
+        validate_to_report,
+        warm_up_schemas,
+    )
+
+    warm_up_schemas()
+    options = ValidationOptions(skip_stages=skip_stages, timings=True)
+    start = time.perf_counter()
+    report = validate_to_report(Path(sip_path), options)
+    wall_time = time.perf_counter() - start
+
+    return {
+        "wall_time": wall_time,
+        "outcome": report.outcome,
+        "results": len(report.results),
+        "stages": {
+            timing.name: {"wall_time": timing.wall_time, "cpu_time": timing.cpu_time}
+            for timing in report.timings or []
+        },
+        # Kilobytes on Linux
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_case(
+    spec: SipSpec, repeat: int, skip_stages: tuple[str, ...]
+) -> dict[str, Any]:
+    "The fastest of `repeat` validations of the SIP described by `spec`."
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        sip_path = generate_sip(Path(directory), spec)
+        runs: list[dict[str, Any]] = []
+        for _ in range(repeat):
+            with context.Pool(1) as pool:
+                runs.append(pool.apply(measure, (str(sip_path), skip_stages)))
+
+    best = min(runs, key=lambda run: run["wall_time"])
+    data_files = spec.representations * spec.files
+    data_bytes = data_files * spec.data_size
+    return {
+        "spec": asdict(spec),
+        **best,
+        "max_rss": max(run["max_rss"] for run in runs),
+        "files_per_second": data_files / best["wall_time"],
+        "mb_per_second": data_bytes / 1024**2 / best["wall_time"],
+    }
+
+
+def growth_exponents(cases: list[dict[str, Any]], dimension: str) -> dict[str, float]:
+    """
+    The highest growth exponent per stage between consecutive sizes: 1 when the
+    time grows linearly with the size, 2 when it grows quadratically.
+    """
+    exponents: dict[str, float] = {}
+    for previous, case in zip(cases, cases[1:]):
+        size_ratio = case["spec"][dimension] / previous["spec"][dimension]
+        times = {"total": (previous["wall_time"], case["wall_time"])}
+        for stage, timing in case["stages"].items():
+            if stage in previous["stages"]:
+                times[stage] = (
+                    previous["stages"][stage]["wall_time"],
+                    timing["wall_time"],
+                )
+
+        for stage, (before, after) in times.items():
+            # Times this small are mostly noise.
+            if size_ratio <= 1 or before < 0.001 or after < 0.001:
+                continue
+            exponent = math.log(after / before) / math.log(size_ratio)
+            exponents[stage] = max(exponents.get(stage, exponent), exponent)
+    return exponents
+
+
+def print_table(cases: list[dict[str, Any]], dimension: str) -> None:
+    stages = list(cases[0]["stages"])
+    header = [dimension, "total (s)", *stages, "files/s", "MB/s", "max RSS (MB)"]
+    print("  ".join(f"{column:>14}" for column in header))
+    for case in cases:
+        row = [
+            f"{case['spec'][dimension]}",
+            f"{case['wall_time']:.3f}",
+            *(
+                f"{case['stages'].get(stage, {}).get('wall_time', 0):.3f}"
+                for stage in stages
+            ),
+            f"{case['files_per_second']:.1f}",
+            f"{case['mb_per_second']:.1f}",
+            f"{case['max_rss'] / 1024:.1f}",
+        ]
+        print("  ".join(f"{column:>14}" for column in row))
+
+
+def main() -> int:
+    spec_fields = [
+        field.name for field in fields(SipSpec) if field.type in (int, "int")
+    ]
+    parser = argparse.ArgumentParser(
+        description="Time the validation of synthetic SIPs of growing size."
+    )
+    _ = parser.add_argument(
+        "--dimension",
+        choices=[name for name in spec_fields if name != "seed"],
+        default="files",
+    )
+    _ = parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    _ = parser.add_argument("--profile", default="basic")
+    for name in spec_fields:
+        _ = parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=int,
+            help=f"Fixed value of {name} (default: {getattr(SipSpec(), name)}).",
+        )
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    _ = parser.add_argument("--with-commons-ip", action="store_true")
+    _ = parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    args = parser.parse_args()
+
+    base = SipSpec(
+        profile=args.profile,
+        **{
+            name: getattr(args, name)
+            for name in spec_fields
+            if getattr(args, name) is not None
+        },
+    )
+    skip_stages = () if args.with_commons_ip else ("commons-ip",)
+
+    cases: list[dict[str, Any]] = []
+    for size in args.sizes:
+        spec = replace(base, **{args.dimension: size})
+        cases.append(run_case(spec, args.repeat, skip_stages))
+        print(
+            f"{args.dimension}={size}: {cases[-1]['wall_time']:.3f}s, {cases[-1]['outcome']}",
+            file=sys.stderr,
+        )
+
+    print_table(cases, args.dimension)
+    exponents = growth_exponents(cases, args.dimension)
+    superlinear = {
+        stage: exponent
+        for stage, exponent in exponents.items()
+        if exponent > SUPERLINEAR_EXPONENT
+    }
+    for stage, exponent in superlinear.items():
+        print(f"Superlinear: {stage} grows with {args.dimension}^{exponent:.2f}")
+
+    if args.json is not None:
+        _ = args.json.write_text(
+            json.dumps(
+                {"dimension": args.dimension, "cases": cases, "exponents": exponents},
+                indent=2,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+from dataclasses import dataclass
+from hashlib import md5
+from pathlib import Path
+from uuid import UUID
+import argparse
+import random
+from xml.sax.saxutils import escape
+
+PROFILES = {
+    "basic": "https://data.hetarchief.be/id/sip/2.1/basic",
+    "film": "https://data.hetarchief.be/id/sip/2.1/film",
+    "material-artwork": "https://data.hetarchief.be/id/sip/2.1/material-artwork",
+}
+
+PREMIS_NAMESPACES = (
+    'xmlns:premis="http://www.loc.gov/premis/v3" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+)
+
+
+@dataclass
+class SipSpec:
+    """
+    Shape of a synthetic meemoo 2.1 SIP.
+
+    The counts are per SIP, except `files` which is per representation and
+    `events_per_file` and `relationships_per_file` which are per file.
+    `data_size` is the number of bytes written per data file.
+    """
+
+    profile: str = "basic"
+    representations: int = 1
+    files: int = 1
+    events_per_file: int = 1
+    relationships_per_file: int = 1
+    agents: int = 1
+    data_size: int = 1024
+    seed: int = 0
+
+
+class _Ids:
+    "Deterministic UUID source, so generated SIPs are reproducible."
+
+    def __init__(self, seed: int):
+        self._random = random.Random(seed)
+
+    def uuid(self) -> str:
+        return str(UUID(int=self._random.getrandbits(128), version=4))
+
+
+def _object_identifier(uuid: str) -> str:
+    return (
+        "<premis:objectIdentifier>"
+        "<premis:objectIdentifierType>UUID</premis:objectIdentifierType>"
+        f"<premis:objectIdentifierValue>{uuid}</premis:objectIdentifierValue>"
+        "</premis:objectIdentifier>"
+    )
+
+
+def _relationship(sub_type: str, related_uuids: list[str]) -> str:
+    related = "".join(
+        "<premis:relatedObjectIdentifier>"
+        "<premis:relatedObjectIdentifierType>UUID</premis:relatedObjectIdentifierType>"
+        f"<premis:relatedObjectIdentifierValue>{uuid}</premis:relatedObjectIdentifierValue>"
+        "</premis:relatedObjectIdentifier>"
+        for uuid in related_uuids
+    )
+    return (
+        "<premis:relationship>"
+        "<premis:relationshipType>structural</premis:relationshipType>"
+        f"<premis:relationshipSubType>{sub_type}</premis:relationshipSubType>"
+        f"{related}"
+        "</premis:relationship>"
+    )
+
+
+def _event(event_uuid: str, agent_uuid: str, object_uuid: str) -> str:
+    return (
+        "<premis:event>"
+        "<premis:eventIdentifier>"
+        "<premis:eventIdentifierType>UUID</premis:eventIdentifierType>"
+        f"<premis:eventIdentifierValue>{event_uuid}</premis:eventIdentifierValue>"
+        "</premis:eventIdentifier>"
+        "<premis:eventType>creation</premis:eventType>"
+        "<premis:eventDateTime>2024-01-01T00:00:00Z</premis:eventDateTime>"
+        "<premis:eventOutcomeInformation>"
+        "<premis:eventOutcome>success</premis:eventOutcome>"
+        "</premis:eventOutcomeInformation>"
+        "<premis:linkingAgentIdentifier>"
+        "<premis:linkingAgentIdentifierType>UUID</premis:linkingAgentIdentifierType>"
+        f"<premis:linkingAgentIdentifierValue>{agent_uuid}</premis:linkingAgentIdentifierValue>"
+        "<premis:linkingAgentRole>implementer</premis:linkingAgentRole>"
+        "</premis:linkingAgentIdentifier>"
+        "<premis:linkingObjectIdentifier>"
+        "<premis:linkingObjectIdentifierType>UUID</premis:linkingObjectIdentifierType>"
+        f"<premis:linkingObjectIdentifierValue>{object_uuid}</premis:linkingObjectIdentifierValue>"
+        "<premis:linkingObjectRole>outcome</premis:linkingObjectRole>"
+        "</premis:linkingObjectIdentifier>"
+        "</premis:event>"
+    )
+
+
+def _agent(agent_uuid: str, index: int) -> str:
+    return (
+        "<premis:agent>"
+        "<premis:agentIdentifier>"
+        "<premis:agentIdentifierType>UUID</premis:agentIdentifierType>"
+        f"<premis:agentIdentifierValue>{agent_uuid}</premis:agentIdentifierValue>"
+        "</premis:agentIdentifier>"
+        f"<premis:agentName>Agent {index}</premis:agentName>"
+        "<premis:agentType>organization</premis:agentType>"
+        "</premis:agent>"
+    )
+
+
+def _premis(objects: list[str], events: list[str], agents: list[str]) -> str:
+    body = "".join(objects + events + agents)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<premis:premis {PREMIS_NAMESPACES} version="3.0">{body}</premis:premis>\n'
+    )
+
+
+def _mets(objid: str, profile_uri: str | None) -> str:
+    profile = (
+        f' csip:OTHERCONTENTINFORMATIONTYPE="{profile_uri}"'
+        if profile_uri is not None
+        else ""
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<mets:mets xmlns:mets="http://www.loc.gov/METS/" '
+        'xmlns:csip="https://DILCIS.eu/XML/METS/CSIPExtensionMETS" '
+        f'OBJID="{objid}" TYPE="OTHER" csip:CONTENTINFORMATIONTYPE="OTHER"{profile}>'
+        '<mets:structMap><mets:div LABEL="root"/></mets:structMap>'
+        "</mets:mets>\n"
+    )
+
+
+def _dc_schema(profile_uri: str, identifier: str, title: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<metadata xmlns="{profile_uri}" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:schema="https://schema.org/" '
+        'xmlns:edtf="http://id.loc.gov/datatypes/edtf/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"<dcterms:identifier>{identifier}</dcterms:identifier>"
+        f'<dcterms:title xml:lang="nl">{escape(title)}</dcterms:title>'
+        '<dcterms:description xml:lang="nl">Synthetic SIP</dcterms:description>'
+        '<dcterms:created xsi:type="edtf:EDTF-level1">2024-01-01</dcterms:created>'
+        "<dcterms:license>VIAA-PUBLIEK-METADATA-LTD</dcterms:license>"
+        "<dcterms:type>Video</dcterms:type>"
+        "<dcterms:format>video</dcterms:format>"
+        "</metadata>\n"
+    )
+
+
+def generate_sip(root: Path, spec: SipSpec) -> Path:
+    """
+    Write a synthetic SIP described by `spec` into `root` and return its path.
+    """
+    ids = _Ids(spec.seed)
+    sip_path = root / f"uuid-{ids.uuid()}"
+    profile_uri = PROFILES[spec.profile]
+
+    entity_uuid = ids.uuid()
+    agent_uuids = [ids.uuid() for _ in range(max(spec.agents, 1))]
+    representation_uuids = [ids.uuid() for _ in range(spec.representations)]
+
+    (sip_path / "metadata" / "descriptive").mkdir(parents=True)
+    (sip_path / "metadata" / "preservation").mkdir(parents=True)
+    (sip_path / "METS.xml").write_text(_mets(sip_path.name, profile_uri))
+    (sip_path / "metadata" / "descriptive" / "dc+schema.xml").write_text(
+        _dc_schema(profile_uri, sip_path.name, f"SIP {sip_path.name}")
+    )
+
+    entity = (
+        '<premis:object xsi:type="premis:intellectualEntity">'
+        f"{_object_identifier(entity_uuid)}"
+        f"{_relationship('is represented by', representation_uuids)}"
+        "</premis:object>"
+    )
+    root_events = [_event(ids.uuid(), agent_uuids[0], entity_uuid)]
+    root_agents = [_agent(uuid, i) for i, uuid in enumerate(agent_uuids)]
+    (sip_path / "metadata" / "preservation" / "premis.xml").write_text(
+        _premis([entity], root_events, root_agents)
+    )
+
+    for r, representation_uuid in enumerate(representation_uuids):
+        representation_path = sip_path / "representations" / f"representation_{r + 1}"
+        data_path = representation_path / "data"
+        preservation_path = representation_path / "metadata" / "preservation"
+        data_path.mkdir(parents=True)
+        preservation_path.mkdir(parents=True)
+        (representation_path / "METS.xml").write_text(
+            _mets(f"{sip_path.name}-representation_{r + 1}", None)
+        )
+
+        file_uuids = [ids.uuid() for _ in range(spec.files)]
+        objects: list[str] = []
+        events: list[str] = []
+        for f, file_uuid in enumerate(file_uuids):
+            name = f"file_{f + 1}.bin"
+            content = random.Random(f"{spec.seed}-{r}-{f}").randbytes(spec.data_size)
+            (data_path / name).write_bytes(content)
+            objects.append(
+                '<premis:object xsi:type="premis:file">'
+                f"{_object_identifier(file_uuid)}"
+                "<premis:objectCharacteristics>"
+                "<premis:fixity>"
+                "<premis:messageDigestAlgorithm>MD5</premis:messageDigestAlgorithm>"
+                f"<premis:messageDigest>{md5(content).hexdigest()}</premis:messageDigest>"
+                "</premis:fixity>"
+                f"<premis:size>{len(content)}</premis:size>"
+                "<premis:format><premis:formatDesignation>"
+                "<premis:formatName>bin</premis:formatName>"
+                "</premis:formatDesignation></premis:format>"
+                "</premis:objectCharacteristics>"
+                f"<premis:originalName>{name}</premis:originalName>"
+                + _relationship("is included in", [representation_uuid])
+                * max(spec.relationships_per_file, 1)
+                + "</premis:object>"
+            )
+            events += [
+                _event(ids.uuid(), agent_uuids[e % len(agent_uuids)], file_uuid)
+                for e in range(spec.events_per_file)
+            ]
+
+        representation = (
+            '<premis:object xsi:type="premis:representation">'
+            f"{_object_identifier(representation_uuid)}"
+            f"{_relationship('represents', [entity_uuid])}"
+            f"{_relationship('includes', file_uuids)}"
+            "</premis:object>"
+        )
+        (preservation_path / "premis.xml").write_text(
+            _premis([representation, *objects], events, [])
+        )
+
+    return sip_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic meemoo 2.1 SIP.")
+    _ = parser.add_argument("output", type=Path)
+    _ = parser.add_argument("--profile", choices=sorted(PROFILES), default="basic")
+    _ = parser.add_argument("--representations", type=int, default=1)
+    _ = parser.add_argument("--files", type=int, default=1)
+    _ = parser.add_argument("--events-per-file", type=int, default=1)
+    _ = parser.add_argument("--relationships-per-file", type=int, default=1)
+    _ = parser.add_argument("--agents", type=int, default=1)
+    _ = parser.add_argument("--data-size", type=int, default=1024)
+    _ = parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spec = SipSpec(
+        profile=args.profile,
+        representations=args.representations,
+        files=args.files,
+        events_per_file=args.events_per_file,
+        relationships_per_file=args.relationships_per_file,
+        agents=args.agents,
+        data_size=args.data_size,
+        seed=args.seed,
+    )
+    args.output.mkdir(parents=True, exist_ok=True)
+    print(generate_sip(args.output, spec))
+
+
+if __name__ == "__main__":
+    main()
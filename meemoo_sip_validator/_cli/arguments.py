@@ -0,0 +1,106 @@
+import argparse
+import os
+
+
+def add_commons_ip_argument(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument(
+        "--commons-ip-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Keep N commons-ip JVMs running per worker process instead of starting one per SIP.",
+    )
+
+
+def parse_stage_names(value: str) -> tuple[str, ...]:
+    from ..v2_1._core.validate import stage_names
+
+    names = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in names if name not in stage_names]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage(s) {', '.join(unknown)} (choose from {', '.join(stage_names)})"
+        )
+    return names
+
+
+def add_stage_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    _ = group.add_argument(
+        "--only",
+        type=parse_stage_names,
+        metavar="STAGE,...",
+        help="Only run these validation stages.",
+    )
+    _ = group.add_argument(
+        "--skip",
+        type=parse_stage_names,
+        default=(),
+        metavar="STAGE,...",
+        help="Do not run these validation stages.",
+    )
+    _ = parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error, running the cheapest stages and rules first. The report is incomplete.",
+    )
+
+
+def add_timings_argument(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Record the wall time, CPU time and I/O of every stage and rule.",
+    )
+
+
+def add_stream_premis_argument(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument(
+        "--stream-premis",
+        action="store_true",
+        help="Read the PREMIS files element by element, for very large PREMIS files.",
+    )
+
+
+def add_xsd_engine_argument(parser: argparse.ArgumentParser) -> None:
+    from ..v2_1._core.xsd_engines import XsdEngine
+
+    _ = parser.add_argument(
+        "--xsd-engine",
+        type=XsdEngine,
+        choices=list(XsdEngine),
+        default=XsdEngine.XMLSCHEMA,
+        metavar="{" + ",".join(engine.value for engine in XsdEngine) + "}",
+        help="Library that validates the XML files against the XSD schemas (default: xmlschema). lxml is much faster, but needs the `lxml` extra.",
+    )
+
+
+def add_workers_arguments(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument(
+        "--max-workers",
+        type=int,
+        metavar="N",
+        help=(
+            "Hash and XSD-validate at most N files at the same time in a process "
+            "(default: number of CPUs, divided by the number of jobs in a batch)."
+        ),
+    )
+    _ = parser.add_argument(
+        "--xsd-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Validate the XML files of a SIP against the XSD schemas on N processes (default: 0, in a single thread).",
+    )
+
+
+def get_workers_options(args: argparse.Namespace, jobs: int = 1) -> dict[str, int]:
+    """
+    The `ValidationOptions` arguments of `add_workers_arguments`. When SIPs are
+    validated on `jobs` processes, the CPUs are shared between those processes, so
+    that the XSD pools of all jobs together do not start more processes than CPUs.
+    """
+    max_workers = args.max_workers
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // max(1, jobs))
+    return {"max_workers": max_workers, "xsd_workers": args.xsd_workers}
@@ -0,0 +1,214 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, TextIO
+import argparse
+import json
+import os
+import sys
+
+from .arguments import (
+    add_commons_ip_argument,
+    add_stage_arguments,
+    add_stream_premis_argument,
+    add_timings_argument,
+    add_workers_arguments,
+    add_xsd_engine_argument,
+    get_workers_options,
+)
+
+supported_versions = ["2.1"]
+
+# Exit status of a batch
+EXIT_ALL_VALID = 0
+EXIT_SOME_INVALID = 1
+EXIT_SOME_ERRORS = 2
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="meemoo-sip-validator batch",
+        description=(
+            "Validate many SIPs on a pool of worker processes. "
+            "Writes one JSON record per SIP to stdout as soon as it is validated."
+        ),
+        epilog=(
+            f"Exit status: {EXIT_ALL_VALID} if all SIPs are valid, "
+            f"{EXIT_SOME_INVALID} if at least one SIP is not valid, "
+            f"{EXIT_SOME_ERRORS} if at least one SIP could not be validated."
+        ),
+    )
+    _ = parser.add_argument("version", choices=supported_versions, help="SIP version")
+    _ = parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="SIP paths. Read from stdin, one per line, when neither paths nor --paths-from are given.",
+    )
+    _ = parser.add_argument(
+        "--paths-from",
+        metavar="FILE",
+        help="File with one SIP path per line, or '-' for stdin.",
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    add_commons_ip_argument(parser)
+    add_stage_arguments(parser)
+    add_timings_argument(parser)
+    add_xsd_engine_argument(parser)
+    add_stream_premis_argument(parser)
+    add_workers_arguments(parser)
+    return parser
+
+
+def read_paths(lines: Iterable[str]) -> Iterator[Path]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield Path(line)
+
+
+def get_sip_paths(args: argparse.Namespace) -> list[Path]:
+    paths: list[Path] = list(args.paths)
+    if args.paths_from == "-" or (args.paths_from is None and not paths):
+        paths.extend(read_paths(sys.stdin))
+    elif args.paths_from is not None:
+        with open(args.paths_from) as f:
+            paths.extend(read_paths(f))
+    return paths
+
+
+# `ValidationOptions` of the worker process, set by `init_worker`
+worker_options: dict[str, Any] = {}
+
+
+def get_validator_fn(version: str) -> Callable[[Path], Any]:
+    match version:
+        case "2.1":
+            from ..v2_1 import ValidationOptions, validate_to_report
+
+            options = ValidationOptions(**worker_options)
+            return lambda path: validate_to_report(path, options)
+        case _:
+            raise ValueError(f"Unsupported version: '{version}'")
+
+
+def init_worker(version: str, options: dict[str, Any] | None = None) -> None:
+    worker_options.clear()
+    worker_options.update(options or {})
+
+    # Compile (or load) the XSD schemas and import the stages once per worker
+    # instead of on the first SIP.
+    match version:
+        case "2.1":
+            from ..v2_1 import (
+                ValidationOptions,
+                XsdEngine,
+                load_stages,
+                warm_up_schemas,
+            )
+
+            options = ValidationOptions(**worker_options)
+            if options.xsd_engine == XsdEngine.XMLSCHEMA:
+                warm_up_schemas()
+            load_stages(options)
+
+
+def validate_sip(version: str, path: Path) -> dict[str, Any]:
+    """
+    Validate a single SIP and return its JSON Lines record.
+    Runs in a worker process.
+    """
+    try:
+        report = get_validator_fn(version)(path)
+    except Exception as e:
+        return {"path": str(path), "outcome": "ERROR", "error": str(e)}
+    return {"path": str(path), "outcome": report.outcome, "report": report.to_dict()}
+
+
+def write_record(out: TextIO, record: dict[str, Any]) -> None:
+    _ = out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def run_batch(
+    version: str,
+    paths: list[Path],
+    jobs: int,
+    out: TextIO,
+    options: dict[str, Any] | None = None,
+) -> dict[str, int]:
+    "Validates all SIPs, writing each record as soon as it is ready. Returns the number of SIPs per outcome."
+    counts = {"PASSED": 0, "FAILED": 0, "ERROR": 0}
+
+    def handle(record: dict[str, Any]) -> None:
+        counts[record["outcome"]] += 1
+        write_record(out, record)
+
+    if jobs <= 1 or len(paths) <= 1:
+        init_worker(version, options)
+        for path in paths:
+            handle(validate_sip(version, path))
+        return counts
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(paths)),
+        initializer=init_worker,
+        initargs=(version, options),
+    ) as pool:
+        futures: dict[Future[dict[str, Any]], Path] = {
+            pool.submit(validate_sip, version, path): path for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                # The worker process itself failed, e.g. it was killed.
+                record = {
+                    "path": str(futures[future]),
+                    "outcome": "ERROR",
+                    "error": str(e),
+                }
+            handle(record)
+
+    return counts
+
+
+def get_options(args: argparse.Namespace) -> dict[str, Any]:
+    "The `ValidationOptions` arguments from the command line."
+    return {
+        "commons_ip_workers": args.commons_ip_workers,
+        "only_stages": args.only,
+        "skip_stages": args.skip,
+        "fail_fast": args.fail_fast,
+        "timings": args.timings,
+        "xsd_engine": args.xsd_engine,
+        "stream_premis": args.stream_premis,
+        **get_workers_options(args, args.jobs),
+    }
+
+
+def get_exit_status(counts: dict[str, int]) -> int:
+    if counts["ERROR"] > 0:
+        return EXIT_SOME_ERRORS
+    if counts["FAILED"] > 0:
+        return EXIT_SOME_INVALID
+    return EXIT_ALL_VALID
+
+
+def batch_cli(argv: list[str]) -> int:
+    args = get_parser().parse_args(argv)
+    paths = get_sip_paths(args)
+    counts = run_batch(args.version, paths, args.jobs, sys.stdout, get_options(args))
+
+    print(
+        f"Validated {len(paths)} SIP(s): {counts['PASSED']} passed, "
+        f"{counts['FAILED']} failed, {counts['ERROR']} could not be validated.",
+        file=sys.stderr,
+    )
+    return get_exit_status(counts)
@@ -0,0 +1,297 @@
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+
+from .arguments import add_commons_ip_argument
+from .batch import (
+    EXIT_ALL_VALID,
+    EXIT_SOME_ERRORS,
+    EXIT_SOME_INVALID,
+    init_worker,
+    supported_versions,
+    validate_sip,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8750
+
+
+class ValidationService:
+    """
+    Runs validation jobs on a pool of worker processes, with at most
+    `max_pending` jobs queued or running at the same time. The jobs are validated
+    with the `ValidationOptions` arguments in `options`, as in `run_batch`.
+
+    The schemas are loaded in the daemon before the workers are forked,
+    so on platforms with `fork` the workers share them copy-on-write.
+    """
+
+    def __init__(
+        self, workers: int, max_pending: int, options: dict[str, Any] | None = None
+    ):
+        self.workers = workers
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+        init_workers(options)
+
+        start_method = (
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        )
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=init_pool_worker,
+            initargs=(options,),
+        )
+        # Start the workers now, before the server starts any threads.
+        _ = self._pool.submit(os.getpid).result()
+
+    def validate(self, version: str, path: Path) -> dict[str, Any] | None:
+        "The validation record, or None when too many jobs are pending."
+        if not self._pending.acquire(blocking=False):
+            return None
+        try:
+            return self._pool.submit(validate_sip, version, path).result()
+        finally:
+            self._pending.release()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(cancel_futures=True)
+
+
+def init_workers(options: dict[str, Any] | None) -> None:
+    for version in supported_versions:
+        init_worker(version, options)
+
+
+def init_pool_worker(options: dict[str, Any] | None) -> None:
+    # Interrupts are handled by the daemon, which shuts the pool down.
+    _ = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_workers(options)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    GET  /health    -> {"status": "ok", "workers": N}
+    POST /validate  {"version": "2.1", "path": "/path/to/sip"}
+                    -> {"path": ..., "outcome": ..., "report": ...}
+    """
+
+    server: "ValidationHTTPServer | ValidationUnixServer"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        self.send_json(
+            HTTPStatus.OK, {"status": "ok", "workers": self.server.service.workers}
+        )
+
+    def do_POST(self) -> None:
+        if self.path != "/validate":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+            version = body.get("version", "2.1")
+            path = Path(body["path"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.send_json(
+                HTTPStatus.BAD_REQUEST,
+                {
+                    "error": 'Expected a JSON body like {"version": "2.1", "path": "..."}'
+                },
+            )
+            return
+
+        if version not in supported_versions:
+            self.send_json(
+                HTTPStatus.BAD_REQUEST, {"error": f"Unsupported version: '{version}'"}
+            )
+            return
+
+        record = self.server.service.validate(version, path)
+        if record is None:
+            self.send_json(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Too many pending validations, retry later."},
+            )
+            return
+        self.send_json(HTTPStatus.OK, record)
+
+    def send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        _ = self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return str(self.client_address or "unix")
+
+
+class ValidationHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: ValidationService):
+        super().__init__(address, RequestHandler)
+        self.service = service
+
+
+class ValidationUnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: ValidationService):
+        super().__init__(socket_path, RequestHandler)
+        self.service = service
+
+    def server_bind(self) -> None:
+        remove_stale_socket(self.server_address)  # pyright: ignore[reportArgumentType]
+        super().server_bind()
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)  # pyright: ignore[reportArgumentType]
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """
+    Removes the socket file of a daemon that did not shut down cleanly, e.g. one that
+    crashed, so that a new daemon can bind to the path. A socket that a daemon still
+    listens on is kept, and binding to it fails.
+    """
+    if not Path(socket_path).is_socket():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionRefusedError:
+            Path(socket_path).unlink(missing_ok=True)
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def add_address_arguments(parser: argparse.ArgumentParser) -> None:
+    _ = parser.add_argument("--socket", metavar="PATH", help="Unix socket path.")
+    _ = parser.add_argument("--host", default=DEFAULT_HOST)
+    _ = parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+
+def serve_cli(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="meemoo-sip-validator serve",
+        description="Run a validation daemon that keeps the compiled schemas and caches loaded.",
+    )
+    add_address_arguments(parser)
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    _ = parser.add_argument(
+        "--max-pending",
+        type=int,
+        help="Maximum number of queued and running validations (default: 4 per worker).",
+    )
+    add_commons_ip_argument(parser)
+    args = parser.parse_args(argv)
+
+    service = ValidationService(
+        workers=args.jobs,
+        max_pending=args.max_pending or 4 * args.jobs,
+        options={"commons_ip_workers": args.commons_ip_workers},
+    )
+    if args.socket is not None:
+        server = ValidationUnixServer(args.socket, service)
+        address = args.socket
+    else:
+        server = ValidationHTTPServer((args.host, args.port), service)
+        address = f"http://{args.host}:{args.port}"
+
+    def stop(*_: object) -> None:
+        raise KeyboardInterrupt
+
+    _ = signal.signal(signal.SIGTERM, stop)
+    print(f"Listening on {address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+def client_cli(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="meemoo-sip-validator client",
+        description="Validate a SIP with a running validation daemon.",
+    )
+    _ = parser.add_argument("version", choices=supported_versions, help="SIP version")
+    _ = parser.add_argument("path", type=Path, help="SIP path")
+    add_address_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.socket is not None:
+        connection = UnixHTTPConnection(args.socket)
+    else:
+        connection = HTTPConnection(args.host, args.port)
+
+    # The daemon may run in another working directory.
+    body = {"version": args.version, "path": str(args.path.expanduser().resolve())}
+    try:
+        connection.request(
+            "POST",
+            "/validate",
+            body=json.dumps(body),
+            headers={"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        record = json.loads(response.read())
+    except OSError as e:
+        print(f"Could not reach the validation daemon: {e}", file=sys.stderr)
+        return EXIT_SOME_ERRORS
+    finally:
+        connection.close()
+
+    if response.status != HTTPStatus.OK:
+        print(record.get("error", response.reason), file=sys.stderr)
+        return EXIT_SOME_ERRORS
+
+    print(json.dumps(record, indent=4))
+    match record["outcome"]:
+        case "PASSED":
+            return EXIT_ALL_VALID
+        case "FAILED":
+            return EXIT_SOME_INVALID
+        case _:
+            return EXIT_SOME_ERRORS
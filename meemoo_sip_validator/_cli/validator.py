@@ -1,27 +1,96 @@
+import argparse
 import sys
 from pathlib import Path
+from typing import Any
 import json
-from importlib.metadata import version
+
+from .arguments import (
+    add_stage_arguments,
+    add_stream_premis_argument,
+    add_timings_argument,
+    add_workers_arguments,
+    add_xsd_engine_argument,
+    get_workers_options,
+)
 
 
 def validator_cli():
     if len(sys.argv) == 2 and sys.argv[1] == "--version":
+        from importlib.metadata import version
+
         print(f"meemoo-sip-validator {version('meemoo-sip-validator')}")
         exit()
 
-    if len(sys.argv) != 3:
+    if len(sys.argv) >= 2 and sys.argv[1] == "batch":
+        from .batch import batch_cli
+
+        exit(batch_cli(sys.argv[2:]))
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "serve":
+        from .daemon import serve_cli
+
+        exit(serve_cli(sys.argv[2:]))
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "client":
+        from .daemon import client_cli
+
+        exit(client_cli(sys.argv[2:]))
+
+    if len(sys.argv) == 2 and sys.argv[1] == "--build-schema-cache":
+        from ..v2_1._core.schemas import build_bundle
+
+        bundle_path = build_bundle()
+        if bundle_path is None:
+            print("Schema cache is disabled or not writable.")
+            exit(1)
+        print(f"Wrote schema cache to {bundle_path}")
+        exit()
+
+    if len(sys.argv) < 3:
         print(
-            "Usage: meemoo-sip-validator SIP-VERSION PATH\n\nSupported SIP versions: 2.1"
+            "Usage: meemoo-sip-validator SIP-VERSION PATH [--only STAGE,... | --skip STAGE,...] [--fail-fast] [--timings] [--xsd-engine xmlschema|lxml] [--max-workers N] [--xsd-workers N] [--stream-premis] [--format json|ndjson]\n"
+            "       meemoo-sip-validator batch SIP-VERSION [PATH ...] [--jobs N] [--max-workers N] [--xsd-workers N] [--stream-premis]\n"
+            "       meemoo-sip-validator serve [--socket PATH | --host HOST --port PORT]\n"
+            "       meemoo-sip-validator client SIP-VERSION PATH [--socket PATH | --host HOST --port PORT]\n\n"
+            "Supported SIP versions: 2.1"
         )
         exit(1)
 
-    version_arg = sys.argv[1]
-    path = Path(sys.argv[2])
-    validator_fn = get_validator_fn_for_version(version_arg)
-    report = validator_fn(path)
+    parser = argparse.ArgumentParser(prog="meemoo-sip-validator")
+    _ = parser.add_argument("version", help="SIP version")
+    _ = parser.add_argument("path", type=Path, help="SIP path")
+    add_stage_arguments(parser)
+    add_timings_argument(parser)
+    add_xsd_engine_argument(parser)
+    add_stream_premis_argument(parser)
+    add_workers_arguments(parser)
+    _ = parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="'json' prints the failures once the validation is done, 'ndjson' prints every result as soon as its stage is done.",
+    )
+    args = parser.parse_args(sys.argv[1:])
+    options = {
+        "only_stages": args.only,
+        "skip_stages": args.skip,
+        "fail_fast": args.fail_fast,
+        "timings": args.timings,
+        "xsd_engine": args.xsd_engine,
+        "stream_premis": args.stream_premis,
+        **get_workers_options(args),
+    }
+
+    if args.format == "ndjson":
+        exit(stream_ndjson(args.version, args.path, options))
+
+    validator_fn = get_validator_fn_for_version(args.version)
+    report = validator_fn(args.path, **options)
     failures = [failure.to_dict() for failure in report.failures]
 
     print(json.dumps(failures, indent=4))
+    if report.timings is not None:
+        print_timings([timing.to_dict() for timing in report.timings])
     if report.is_valid:
         print(
             "\nNo error produced. The SIP may still be invalid, as the validator is incomplete."
@@ -29,15 +98,91 @@ def validator_cli():
         exit(0)
     else:
         print("\nSIP is not valid.")
+        if report.truncated:
+            print("Stopped at the first error (--fail-fast), there may be more errors.")
         exit(1)
 
 
+def print_timings(timings: list[dict[str, Any]]) -> None:
+    "Prints a table with the timings of the stages and their rules to stderr."
+    print(
+        f"\n{'Stage / rule':<62} {'Wall (s)':>9} {'CPU (s)':>9} {'Read (MB)':>10} {'Files':>6} {'Results':>8}",
+        file=sys.stderr,
+    )
+    for stage in timings:
+        rows = [(stage, stage["name"])]
+        rows += [(rule, "  " + rule["name"]) for rule in stage.get("rules", [])]
+        for timing, name in rows:
+            print(
+                f"{name:<62} {timing['wall_time']:>9.3f} {timing['cpu_time']:>9.3f} "
+                f"{timing['bytes_read'] / 1024**2:>10.1f} {timing['files_opened']:>6} {timing['results']:>8}",
+                file=sys.stderr,
+            )
+
+
+def write_line(record: dict[str, Any]) -> None:
+    print(json.dumps(record), flush=True)
+
+
+def stream_ndjson(version: str, path: Path, options: dict[str, Any]) -> int:
+    """
+    Prints one JSON line per result, tagged with its stage, as soon as the stage is done.
+    Stages that did not run get a line with their status. The last line holds the outcome.
+    """
+    stream_fn = get_stream_fn_for_version(version)
+    is_valid = True
+    skipped_stages: list[str] = []
+    truncated = False
+
+    for outcome in stream_fn(path, **options):
+        if outcome.report is None:
+            write_line({"stage": outcome.stage, "status": outcome.status.upper()})
+            if outcome.status == "skipped":
+                skipped_stages.append(outcome.stage)
+            else:
+                truncated = True
+            continue
+
+        for result in outcome.report.results:
+            write_line({"stage": outcome.stage, **result.to_dict()})
+        for timing in outcome.report.timings or []:
+            write_line({"stage": outcome.stage, "timing": timing.to_dict()})
+        is_valid = is_valid and outcome.report.is_valid
+        truncated = truncated or outcome.report.truncated
+
+    write_line(
+        {
+            "outcome": "PASSED" if is_valid else "FAILED",
+            "skipped_stages": skipped_stages,
+            "truncated": truncated,
+        }
+    )
+    return 0 if is_valid else 1
+
+
 def get_validator_fn_for_version(version: str):
     match version:
         case "2.1":
-            from ..v2_1 import validate_to_report
+            from ..v2_1 import ValidationOptions, validate_to_report
+
+            def validate(path: Path, **options: Any):
+                return validate_to_report(path, ValidationOptions(**options))
+
+            return validate
+        case _:
+            print(f"Unsupported version: '{version}'")
+            exit(1)
+
+
+def get_stream_fn_for_version(version: str):
+    match version:
+        case "2.1":
+            from ..v2_1 import ValidationOptions, iter_validation
+
+            def stream(path: Path, **options: Any):
+                return iter_validation(path, ValidationOptions(**options))
 
-            return validate_to_report
+            return stream
         case _:
             print(f"Unsupported version: '{version}'")
             exit(1)
@@ -0,0 +1,67 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+
+import org.roda_project.commons_ip2.cli.Main;
+import org.roda_project.commons_ip2.cli.model.exception.handlers.PrintExceptionMessageHandler;
+import org.roda_project.commons_ip2.cli.model.exception.handlers.ShortErrorMessageHandler;
+
+import picocli.CommandLine;
+
+/**
+ * Keeps a single JVM with the commons-ip CLI loaded and validates SIPs on request.
+ *
+ * Run with the Java source launcher (Java 11+):
+ *   java -cp commons-ip2-cli.jar CommonsIPWorker.java
+ *
+ * Protocol, one request at a time:
+ *   request (stdin):   "<specification version>\t<sip path>\n"
+ *   response (stdout): "RESULT <exit code> <byte length>\n" followed by exactly
+ *                      <byte length> bytes: what `commons-ip validate` prints to stdout.
+ */
+public class CommonsIPWorker {
+    public static void main(String[] args) throws Exception {
+        // Same default as the commons-ip CLI entry point
+        if (System.getProperty("commonsIp.home") == null) {
+            System.setProperty("commonsIp.home", System.getProperty("user.dir"));
+        }
+
+        PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), false, StandardCharsets.UTF_8);
+        // Anything printed outside of a request must not end up in the protocol stream.
+        System.setOut(System.err);
+
+        BufferedReader requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String request;
+        while ((request = requests.readLine()) != null) {
+            String[] parts = request.split("\t", 2);
+            if (parts.length != 2) {
+                break;
+            }
+
+            ByteArrayOutputStream captured = new ByteArrayOutputStream();
+            int exitCode;
+            System.setOut(new PrintStream(captured, true, StandardCharsets.UTF_8));
+            try {
+                exitCode = new CommandLine(new Main())
+                    .setExecutionExceptionHandler(new PrintExceptionMessageHandler())
+                    .setParameterExceptionHandler(new ShortErrorMessageHandler())
+                    .execute("validate", "-i", parts[1], "--specification-version", parts[0]);
+            } catch (Throwable t) {
+                t.printStackTrace(System.out);
+                exitCode = 1;
+            } finally {
+                System.out.flush();
+                System.setOut(System.err);
+            }
+
+            byte[] output = captured.toByteArray();
+            protocol.print("RESULT " + exitCode + " " + output.length + "\n");
+            protocol.write(output);
+            protocol.flush();
+        }
+    }
+}
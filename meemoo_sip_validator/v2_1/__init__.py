@@ -1,3 +1,19 @@
-from ._core.validate import validate, validate_to_report
+from ._core.validate import validate, validate_to_report, iter_validation, load_stages
+from ._core.options import ValidationOptions
+from ._core.scheduler import StageOutcome
+from ._core.fixity_cache import FixityCacheBackend, FixityCachePolicy
+from ._core.schemas import warm_up as warm_up_schemas
+from ._core.xsd_engines import XsdEngine
 
-__all__ = ["validate", "validate_to_report"]
+__all__ = [
+    "validate",
+    "validate_to_report",
+    "iter_validation",
+    "StageOutcome",
+    "ValidationOptions",
+    "FixityCacheBackend",
+    "FixityCachePolicy",
+    "XsdEngine",
+    "warm_up_schemas",
+    "load_stages",
+]
@@ -0,0 +1,57 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import threading
+
+from .utils import ValidatorError
+
+
+class ValidationCancelled(ValidatorError):
+    pass
+
+
+class Cancellation:
+    """
+    Lets a validation stop work that is still running in other threads or processes.
+    Long running work checks `raise_if_cancelled` regularly, or registers a callback
+    that interrupts it (e.g. kills a subprocess) with `on_cancel`.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ValidationCancelled("The validation was cancelled.")
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        "Calls `callback` when the validation is cancelled while in the block, or right away if it already is."
+        with self._lock:
+            cancelled = self._event.is_set()
+            if not cancelled:
+                self._callbacks.append(callback)
+        if cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
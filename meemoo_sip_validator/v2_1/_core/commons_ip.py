@@ -1,5 +1,7 @@
+from collections.abc import Sequence
 from pathlib import Path
 import json
+import subprocess
 
 import py_commons_ip
 
@@ -7,11 +9,23 @@ from .utils import ValidatorError
 
 from .report import Report, Failure, Severity, Success
 from .codes import Code
+from .context import SipContext
+from .cancellation import Cancellation
+from . import commons_ip_pool
 
 
-def validate_commons_ip(sip_path: Path) -> Report:
-    commons_ip_result = py_commons_ip.validate(sip_path, "2.2.0")
-    _, commons_ip_output = commons_ip_result
+def validate_commons_ip(ctx: SipContext) -> Report:
+    sip_path = ctx.sip_path
+    if ctx.options.commons_ip_workers > 0:
+        pool = commons_ip_pool.get_pool(
+            ctx.options.commons_ip_workers,
+            ctx.options.commons_ip_max_jobs_per_worker,
+        )
+        commons_ip_output = pool.validate(sip_path, "2.2.0", ctx.cancellation)[1]
+    else:
+        commons_ip_output = run_commons_ip_cli(
+            get_cli_command(sip_path, "2.2.0"), ctx.cancellation
+        )
 
     try:
         return commons_ip_report_to_meemoo_report(commons_ip_output)
@@ -28,6 +42,32 @@ def validate_commons_ip(sip_path: Path) -> Report:
         )
 
 
+def get_cli_command(sip_path: Path, version: str) -> list[str]:
+    # The command that `py_commons_ip.validate` runs, which it does not expose.
+    return [
+        "java",
+        "-jar",
+        str(py_commons_ip.cli_jar),
+        "validate",
+        "-i",
+        str(sip_path),
+        "--specification-version",
+        version,
+    ]
+
+
+def run_commons_ip_cli(command: Sequence[str], cancellation: Cancellation) -> str:
+    """
+    The output of the commons-ip CLI, like `py_commons_ip.validate`, but the process is
+    killed when the validation is cancelled.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    with cancellation.on_cancel(process.kill):
+        output, _ = process.communicate()
+    cancellation.raise_if_cancelled()
+    return output.decode()
+
+
 def commons_ip_report_to_meemoo_report(report: str) -> Report:
     # TODO: add csip codes to Code enum
     report_dict = json.loads(report)
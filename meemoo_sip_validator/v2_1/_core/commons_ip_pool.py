@@ -0,0 +1,211 @@
+from collections.abc import Sequence
+from importlib import resources
+from pathlib import Path
+import atexit
+import json
+import queue
+import subprocess
+import threading
+
+import py_commons_ip
+
+from .cancellation import Cancellation
+from .utils import ValidatorError
+
+worker_source_path = str(
+    resources.files("meemoo_sip_validator.assets").joinpath(
+        "commons-ip/CommonsIPWorker.java"
+    )
+)
+
+
+def get_worker_command() -> list[str]:
+    # Runs the worker with the Java source launcher, next to the commons-ip CLI jar.
+    return ["java", "-cp", str(py_commons_ip.cli_jar), worker_source_path]
+
+
+class CommonsIPWorkerError(ValidatorError):
+    pass
+
+
+class CommonsIPWorker:
+    """
+    A single JVM that keeps the commons-ip validator loaded and validates one SIP at a time.
+    See `CommonsIPWorker.java` for the protocol.
+    """
+
+    def __init__(self, command: Sequence[str]):
+        self.jobs = 0
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def validate(self, sip_path: Path, version: str) -> str:
+        "The output of `commons-ip validate` for the given SIP."
+        request = f"{version}\t{sip_path}"
+        if "\n" in request:
+            raise ValueError(f"Unsupported SIP path: {sip_path!r}")
+
+        assert self._process.stdin is not None and self._process.stdout is not None
+        self.jobs += 1
+        try:
+            _ = self._process.stdin.write(request.encode() + b"\n")
+            self._process.stdin.flush()
+            header = self._process.stdout.readline().decode().split()
+            if len(header) != 3 or header[0] != "RESULT":
+                raise CommonsIPWorkerError(
+                    f"Unexpected response from commons-ip worker: {header}"
+                )
+            length = int(header[2])
+            output = self._process.stdout.read(length)
+            if len(output) != length:
+                raise CommonsIPWorkerError("The commons-ip worker exited mid-response.")
+        except (OSError, ValueError) as e:
+            raise CommonsIPWorkerError(f"The commons-ip worker failed: {e}") from e
+
+        return output.decode()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def kill(self) -> None:
+        "Stops the JVM right away, e.g. to interrupt a validation from another thread."
+        self._process.kill()
+
+    def close(self) -> None:
+        if self._process.stdin is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+        try:
+            _ = self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            _ = self._process.wait()
+
+
+class CommonsIPPool:
+    """
+    Validates SIPs with up to `workers` JVMs at the same time, reusing each JVM for
+    up to `max_jobs_per_worker` SIPs. Workers are started on demand. A worker that
+    crashed or produced an unreadable response is replaced and the SIP is retried once.
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_jobs_per_worker: int,
+        command: Sequence[str] | None = None,
+    ):
+        self.workers = max(1, workers)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.command = list(command) if command is not None else get_worker_command()
+        self._idle: queue.LifoQueue[CommonsIPWorker] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def validate(
+        self,
+        sip_path: Path,
+        version: str = "2.2.0",
+        cancellation: Cancellation | None = None,
+    ) -> tuple[bool, str]:
+        """
+        Same result as `py_commons_ip.validate`: whether the SIP is valid and
+        the (JSON) output of commons-ip.
+
+        When the validation is cancelled, the JVM is killed and `ValidationCancelled` is raised.
+        """
+        with self._slots:
+            try:
+                output = self._run(sip_path, version, cancellation)
+            except CommonsIPWorkerError:
+                if cancellation is not None:
+                    cancellation.raise_if_cancelled()
+                try:
+                    output = self._run(sip_path, version, cancellation)
+                except CommonsIPWorkerError as e:
+                    if cancellation is not None:
+                        cancellation.raise_if_cancelled()
+                    # Reported like any other unreadable commons-ip output
+                    return False, str(e)
+
+        try:
+            is_valid = json.loads(output)["summary"]["result"] == "VALID"
+        except json.JSONDecodeError:
+            return False, output
+        return is_valid, output
+
+    def _run(
+        self, sip_path: Path, version: str, cancellation: Cancellation | None
+    ) -> str:
+        worker = self._acquire()
+        try:
+            if cancellation is None:
+                output = worker.validate(sip_path, version)
+            else:
+                with cancellation.on_cancel(worker.kill):
+                    output = worker.validate(sip_path, version)
+        except BaseException:
+            worker.close()
+            raise
+
+        if worker.jobs >= self.max_jobs_per_worker or not worker.is_alive:
+            worker.close()
+        else:
+            self._release(worker)
+        return output
+
+    def _acquire(self) -> CommonsIPWorker:
+        with self._lock:
+            if self._closed:
+                raise CommonsIPWorkerError("The commons-ip pool is closed.")
+        try:
+            worker = self._idle.get_nowait()
+            if worker.is_alive:
+                return worker
+            worker.close()
+        except queue.Empty:
+            pass
+        return CommonsIPWorker(self.command)
+
+    def _release(self, worker: CommonsIPWorker) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.put(worker)
+                return
+        worker.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool: CommonsIPPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: int, max_jobs_per_worker: int) -> CommonsIPPool:
+    """
+    The commons-ip pool of this process, created on first use and closed at exit.
+    The pool keeps the size it was created with.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CommonsIPPool(workers, max_jobs_per_worker)
+            _ = atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,284 @@
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+import threading
+import xml.etree.ElementTree as ET
+
+from . import timings, utils
+from .cancellation import Cancellation
+from .fixity_cache import DigestCache, FixityCacheStats, open_digest_cache
+from .hashing import HashingEngine
+from .manifest import Manifest, build_manifest
+from .options import ValidationOptions
+from .xsd_engines import XsdEngine
+
+if TYPE_CHECKING:
+    from .models import DCPlusSchema, premis, ModelElement
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class XMLDocument:
+    path: Path
+    root: ET.Element
+    namespaces: dict[str, str]
+
+    @property
+    def tree(self) -> ET.ElementTree:
+        return ET.ElementTree(self.root)
+
+    def to_model_element(self) -> "ModelElement":
+        # The models (pydantic) are slow to import, so only import them once a
+        # stage decodes a document.
+        from .models import ModelElement, expand_qname_attributes
+
+        # The models expect expanded `xsi:type` values. Expanding mutates the tree,
+        # so work on a copy and keep the original untouched for XSD validation.
+        root = deepcopy(self.root)
+        _ = expand_qname_attributes(root, self.namespaces)
+        return ModelElement(root, source=str(self.path))
+
+
+def parse_document(path: Path) -> XMLDocument:
+    """
+    Parse an XML file in a single pass, collecting both the element tree and the
+    namespace prefixes declared in the document.
+    """
+    if timings.is_active():
+        timings.record(bytes_read=path.stat().st_size, files_opened=1)
+    namespaces: dict[str, str] = {}
+    events = ET.iterparse(path, events=("start-ns",))
+    for _, (prefix, uri) in cast(Any, events):
+        namespaces[prefix] = uri
+    return XMLDocument(path=path, root=events.root, namespaces=namespaces)  # pyright: ignore[reportAttributeAccessIssue]
+
+
+_worker_slots: dict[int, threading.BoundedSemaphore] = {}
+_worker_slots_lock = threading.Lock()
+
+
+def get_worker_slots(max_workers: int) -> threading.BoundedSemaphore:
+    """
+    The worker slots of this process for `max_workers`. Shared by all validations with
+    the same `max_workers`, so that SIPs validated on several threads at the same time
+    (e.g. by the server) do not each hash and validate `max_workers` files.
+    """
+    max_workers = max(1, max_workers)
+    with _worker_slots_lock:
+        if max_workers not in _worker_slots:
+            _worker_slots[max_workers] = threading.BoundedSemaphore(max_workers)
+        return _worker_slots[max_workers]
+
+
+class SipContext:
+    """
+    Everything that is read from a SIP during a single validation.
+
+    Each XML file is parsed at most once and each model is decoded at most once,
+    no matter how many validation stages need it. A parsed document is dropped once
+    the stages that read it are done with it, see `release_document`; the decoded
+    models are kept for the whole validation. Safe to share between threads.
+    """
+
+    def __init__(self, sip_path: Path, options: ValidationOptions | None = None):
+        self.sip_path = sip_path
+        self.options = options or ValidationOptions()
+        # Shared by the stages and validations, see `ValidationOptions.max_workers`
+        self.worker_slots = get_worker_slots(self.options.max_workers)
+        self.hashing_engine = HashingEngine.from_options(
+            self.options, self.worker_slots
+        )
+        self.fixity_cache_stats = FixityCacheStats()
+        self.cancellation = Cancellation()
+        self._values: dict[Any, Any] = {}
+        self._key_locks: dict[Any, threading.Lock] = {}
+        # How many readers of every document are not done with it yet
+        self._document_readers: dict[Path, int] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "SipContext":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            digest_cache = self._values.pop("digest_cache", None)
+        if digest_cache is not None:
+            digest_cache.close()
+
+    def _once(self, key: Any, factory: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+            value = factory()
+            with self._lock:
+                self._values[key] = value
+            return value
+
+    def _once_or_raise(self, key: Any, factory: Callable[[], T]) -> T:
+        def capture() -> T | Exception:
+            try:
+                return factory()
+            except Exception as e:
+                return e
+
+        value = self._once(key, capture)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def memoize(self, key: Any, factory: Callable[[], T]) -> T:
+        """
+        Returns the value for the given key, computed by `factory` on the first call.
+        Lets validation stages share values they derive from the SIP.
+        """
+        return self._once_or_raise(key, factory)
+
+    @property
+    def root_mets_path(self) -> Path:
+        return self.sip_path / "METS.xml"
+
+    @property
+    def descriptive_path(self) -> Path:
+        return self.sip_path / "metadata" / "descriptive" / "dc+schema.xml"
+
+    @property
+    def profile(self) -> utils.Profile | None:
+        def get_profile() -> utils.Profile | None:
+            try:
+                root_mets = self.document(self.root_mets_path)
+            except Exception:
+                return None
+            finally:
+                self.release_document(self.root_mets_path)
+            return utils.get_profile_from_root(root_mets.root)
+
+        return self._once("profile", get_profile)
+
+    def document(self, path: Path) -> XMLDocument:
+        """
+        Returns the parsed XML document at the given path.
+        Raises the parse error (on every call) if the file is not well-formed.
+        """
+        return self._once_or_raise(("document", path), lambda: parse_document(path))
+
+    def release_document(self, path: Path) -> None:
+        """
+        Tells that a reader is done with the document at the given path. The document
+        is dropped once all of its readers are, so that a validation does not hold
+        every tree of the SIP until it ends. A reader that comes later parses the
+        file again.
+        """
+        # Counted outside of the lock, as it reads the manifest from the context.
+        readers = self._count_document_readers(path)
+        with self._lock:
+            self._document_readers.setdefault(path, readers)
+            self._document_readers[path] -= 1
+            if self._document_readers[path] <= 0:
+                _ = self._values.pop(("document", path), None)
+
+    def _count_document_readers(self, path: Path) -> int:
+        """
+        How many times the stages selected by the options read the document at the
+        given path from the context: the profile reads the root METS, the PREMIS and
+        descriptive stages decode their models, and the XSD stage validates the
+        documents unless it validates them on the XSD pool, lazily, or with lxml.
+        """
+        options = self.options
+
+        def selected(*stages: str) -> bool:
+            return any(
+                (options.only_stages is None or stage in options.only_stages)
+                and stage not in options.skip_stages
+                for stage in stages
+            )
+
+        def validated(paths: list[Path]) -> bool:
+            return (
+                selected("xsd")
+                and options.xsd_engine == XsdEngine.XMLSCHEMA
+                and (options.xsd_workers == 0 or len(paths) == 1)
+            )
+
+        readers = 0
+        if path == self.root_mets_path:
+            readers += 1
+        if path in self.mets_paths:
+            readers += validated(self.mets_paths)
+        if path in self.premis_paths and not options.stream_premis:
+            readers += selected("premis", "file-references", "fixity")
+            readers += validated(self.premis_paths)
+        if path in self.descriptive_paths:
+            readers += path == self.descriptive_path and selected("descriptive")
+            readers += validated(self.descriptive_paths)
+        return readers
+
+    @property
+    def manifest(self) -> Manifest:
+        return self._once("manifest", lambda: build_manifest(self.sip_path))
+
+    @property
+    def digest_cache(self) -> DigestCache | None:
+        backend = self.options.fixity_cache
+        if backend is None:
+            return None
+
+        database_path = self.options.fixity_cache_path or (
+            utils.get_cache_home() / "fixity.sqlite"
+        )
+        return self._once(
+            "digest_cache",
+            lambda: open_digest_cache(
+                backend,
+                database_path,
+                self.options.fixity_cache_max_age,
+                self.options.fixity_cache_max_entries,
+            ),
+        )
+
+    @property
+    def mets_paths(self) -> list[Path]:
+        return self.manifest.find("METS.xml")
+
+    @property
+    def premis_paths(self) -> list[Path]:
+        return self.manifest.find("premis.xml")
+
+    @property
+    def descriptive_paths(self) -> list[Path]:
+        return self.manifest.find("dc+schema.xml")
+
+    def premis(self, path: Path) -> "premis.Premis":
+        from .models import premis
+
+        def decode() -> premis.Premis:
+            try:
+                element = self.document(path).to_model_element()
+            finally:
+                self.release_document(path)
+            return premis.Premis.from_xml_tree(element)
+
+        return self._once_or_raise(("premis", path), decode)
+
+    def dc_schema(self, path: Path) -> "DCPlusSchema":
+        from .models import DCPlusSchema
+
+        def decode() -> DCPlusSchema:
+            try:
+                element = self.document(path).to_model_element()
+            finally:
+                self.release_document(path)
+            return DCPlusSchema.from_xml_tree(element)
+
+        return self._once_or_raise(("dc_schema", path), decode)
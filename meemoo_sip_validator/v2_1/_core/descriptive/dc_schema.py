@@ -1,6 +1,4 @@
 from collections.abc import Iterable
-from functools import reduce
-from pathlib import Path
 from typing import Any, cast
 
 from edtf_validate.valid_edtf import (  # pyright: ignore[reportMissingTypeStubs]
@@ -10,8 +8,16 @@ from edtf_validate.valid_edtf import (  # pyright: ignore[reportMissingTypeStubs
 
 from .. import thesauri
 from ..codes import Code
+from ..context import SipContext
 from ..models import EDTF, DCPlusSchema
-from ..report import Failure, Report, RuleResult, Severity, TupleWithSource
+from ..report import (
+    Failure,
+    Report,
+    RuleResult,
+    Severity,
+    TupleWithSource,
+    run_rule,
+)
 
 
 def is_valid_mediahaven_edtf(edtf: EDTF) -> bool:
@@ -79,10 +85,10 @@ checks = [
 ]
 
 
-def validate_dc_schema(sip_path: Path) -> Report:
-    descriptive_path = sip_path / "metadata" / "descriptive" / "dc+schema.xml"
+def validate_dc_schema(ctx: SipContext) -> Report:
+    descriptive_path = ctx.descriptive_path
     try:
-        dc_schema = DCPlusSchema.from_xml(descriptive_path)
+        dc_schema = ctx.dc_schema(descriptive_path)
     except Exception as e:
         return Report(
             results=[
@@ -95,6 +101,4 @@ def validate_dc_schema(sip_path: Path) -> Report:
             ]
         )
 
-    rule_results = (check(dc_schema) for check in checks)
-    reports = (rule.to_report() for rule in rule_results)
-    return reduce(Report.__add__, reports)
+    return Report.combine(run_rule(check, dc_schema) for check in checks)
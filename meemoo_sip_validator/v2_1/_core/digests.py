@@ -0,0 +1,64 @@
+from collections.abc import Iterable
+from pathlib import Path
+import hashlib
+import threading
+
+from . import timings
+from .cancellation import Cancellation
+
+DEFAULT_BLOCK_SIZE = 1024**2  # 1MB
+
+# Names of the PREMIS message digest algorithms, mapped to their `hashlib` name.
+hashlib_names = {
+    "MD5": "md5",
+    "SHA-1": "sha1",
+    "SHA-256": "sha256",
+    "SHA-512": "sha512",
+}
+
+_buffers = threading.local()
+
+
+def get_buffer(block_size: int) -> memoryview:
+    """
+    A read buffer that is allocated once per thread and reused for every file
+    hashed on that thread.
+    """
+    buffer: memoryview | None = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) != block_size:
+        buffer = memoryview(bytearray(block_size))
+        _buffers.buffer = buffer
+    return buffer
+
+
+def new_hash(algorithm: str) -> "hashlib._Hash":
+    try:
+        return hashlib.new(hashlib_names[algorithm])
+    except KeyError:
+        raise ValueError(f"Unsupported message digest algorithm: {algorithm}")
+
+
+def calculate_digests(
+    path: Path,
+    algorithms: Iterable[str],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    cancellation: Cancellation | None = None,
+) -> dict[str, str]:
+    """
+    Calculate the digest of a file for each of the given algorithms, reading the
+    file only once. Every block is fed to all hashes without copying it.
+    Stops with `ValidationCancelled` between blocks when the validation is cancelled.
+    """
+    hashes = {algorithm: new_hash(algorithm) for algorithm in algorithms}
+    buffer = get_buffer(block_size)
+    bytes_read = 0
+    with open(path, "rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            bytes_read += size
+            block = buffer[:size]
+            for hash in hashes.values():
+                hash.update(block)
+    timings.record(bytes_read=bytes_read, files_opened=1)
+    return {algorithm: hash.hexdigest() for algorithm, hash in hashes.items()}
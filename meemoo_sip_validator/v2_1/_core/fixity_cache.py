@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Protocol, cast
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .manifest import ManifestEntry
+from .utils import ValidatorError
+
+
+class FixityCachePolicy(str, Enum):
+    # Use a cached digest instead of reading the file, when the file identity matches.
+    TRUST = "trust"
+    # Always read the file, but still store the fresh digest in the cache.
+    REHASH = "rehash"
+
+
+class FixityCacheBackend(str, Enum):
+    SQLITE = "sqlite"
+    XATTR = "xattr"
+
+
+@dataclass(frozen=True)
+class FileIdentity:
+    """
+    Identifies the exact contents of a file without reading it. A rewritten file
+    gets a new mtime (and usually a new size), which invalidates the cached digest.
+    """
+
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_manifest_entry(cls, entry: ManifestEntry) -> "FileIdentity":
+        return cls(
+            device=entry.device,
+            inode=entry.inode,
+            size=entry.size,
+            mtime_ns=entry.mtime_ns,
+        )
+
+
+@dataclass
+class FixityCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class DigestCache(Protocol):
+    def get(self, path: Path, identity: FileIdentity, algorithm: str) -> str | None: ...
+
+    def put(
+        self, path: Path, identity: FileIdentity, algorithm: str, digest: str
+    ) -> None: ...
+
+    def evict(self, max_age: float | None, max_entries: int | None) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class SQLiteDigestCache:
+    def __init__(self, database_path: Path):
+        database_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            database_path, check_same_thread=False, isolation_level=None
+        )
+        _ = self._connection.execute("PRAGMA journal_mode=WAL")
+        _ = self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digests (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (device, inode, size, mtime_ns, algorithm)
+            )
+            """
+        )
+        # Eviction finds the oldest entries without sorting the table.
+        _ = self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS digests_created_at ON digests (created_at)"
+        )
+
+    def get(self, path: Path, identity: FileIdentity, algorithm: str) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT digest FROM digests WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? AND algorithm = ?",
+                (
+                    identity.device,
+                    identity.inode,
+                    identity.size,
+                    identity.mtime_ns,
+                    algorithm,
+                ),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def put(
+        self, path: Path, identity: FileIdentity, algorithm: str, digest: str
+    ) -> None:
+        with self._lock:
+            _ = self._connection.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    identity.device,
+                    identity.inode,
+                    identity.size,
+                    identity.mtime_ns,
+                    algorithm,
+                    digest,
+                    time.time(),
+                ),
+            )
+
+    def evict(self, max_age: float | None, max_entries: int | None) -> int:
+        evicted = 0
+        with self._lock:
+            if max_age is not None:
+                evicted += self._connection.execute(
+                    "DELETE FROM digests WHERE created_at < ?",
+                    (time.time() - max_age,),
+                ).rowcount
+            if max_entries is not None:
+                (count,) = self._connection.execute(
+                    "SELECT COUNT(*) FROM digests"
+                ).fetchone()
+                if count > max_entries:
+                    evicted += self._connection.execute(
+                        "DELETE FROM digests WHERE rowid IN (SELECT rowid FROM digests ORDER BY created_at LIMIT ?)",
+                        (count - max_entries,),
+                    ).rowcount
+        return evicted
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class XattrDigestCache:
+    """
+    Stores the digest in an extended attribute on the data file itself, so the
+    cache travels with the file and disappears with it.
+    """
+
+    prefix = "user.meemoo-sip-validator.fixity."
+
+    def __init__(self, max_age: float | None = None):
+        if not hasattr(os, "getxattr"):
+            raise ValidatorError(
+                "Extended attributes are not supported on this platform."
+            )
+        self.max_age = max_age
+
+    def get(self, path: Path, identity: FileIdentity, algorithm: str) -> str | None:
+        try:
+            value = json.loads(os.getxattr(path, self.prefix + algorithm))
+        except (OSError, ValueError):
+            return None
+
+        # Anything else than what `put` writes, e.g. set by another tool, is a miss.
+        if not isinstance(value, dict):
+            return None
+        value = cast(dict[str, Any], value)
+        digest = value.get("digest")
+        created_at = value.get("created_at")
+        if not isinstance(digest, str) or not isinstance(created_at, (int, float)):
+            return None
+        if value.get("identity") != [
+            identity.device,
+            identity.inode,
+            identity.size,
+            identity.mtime_ns,
+        ]:
+            return None
+        if self.max_age is not None and created_at < time.time() - self.max_age:
+            return None
+        return digest
+
+    def put(
+        self, path: Path, identity: FileIdentity, algorithm: str, digest: str
+    ) -> None:
+        value = {
+            "identity": [
+                identity.device,
+                identity.inode,
+                identity.size,
+                identity.mtime_ns,
+            ],
+            "digest": digest,
+            "created_at": time.time(),
+        }
+        try:
+            os.setxattr(path, self.prefix + algorithm, json.dumps(value).encode())
+        except OSError:
+            pass  # e.g. read-only storage or a filesystem without user xattrs
+
+    def evict(self, max_age: float | None, max_entries: int | None) -> int:
+        # Expired entries are ignored on read; there is no central index to trim.
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+def open_digest_cache(
+    backend: FixityCacheBackend,
+    database_path: Path,
+    max_age: float | None,
+    max_entries: int | None,
+) -> DigestCache:
+    match backend:
+        case FixityCacheBackend.SQLITE:
+            cache = SQLiteDigestCache(database_path)
+        case FixityCacheBackend.XATTR:
+            cache = XattrDigestCache(max_age)
+    _ = cache.evict(max_age, max_entries)
+    return cache
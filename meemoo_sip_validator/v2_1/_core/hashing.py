@@ -0,0 +1,123 @@
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+import contextvars
+import threading
+import time
+
+from . import timings
+from .cancellation import Cancellation
+from .options import ValidationOptions
+
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class HashJob:
+    path: Path
+    size: int
+
+
+class _ByteBudget:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        with self._condition:
+            # An oversized job is admitted once nothing else is in flight.
+            _ = self._condition.wait_for(
+                lambda: self.in_flight == 0 or self.in_flight + size <= self.max_bytes
+            )
+            self.in_flight += size
+
+    def release(self, size: int) -> None:
+        with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
+
+class HashingEngine:
+    """
+    Hashes data files on a thread pool. `hashlib` releases the GIL while
+    digesting, so the workers read and hash in parallel.
+
+    Jobs are started largest first, while the combined size of the files that
+    are being hashed at the same time stays below `max_bytes_in_flight`.
+    Results are returned in the order of the jobs.
+    No new jobs are started once the validation is cancelled.
+
+    Every job also takes one of the `worker_slots` of the process, if given, so hashing
+    and XSD validation together stay within `max_workers`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_bytes_in_flight: int,
+        worker_slots: threading.Semaphore | None = None,
+    ):
+        self.workers = max(1, workers)
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.worker_slots = worker_slots
+
+    @classmethod
+    def from_options(
+        cls,
+        options: ValidationOptions,
+        worker_slots: threading.Semaphore | None = None,
+    ) -> "HashingEngine":
+        return cls(
+            workers=options.hash_workers,
+            max_bytes_in_flight=options.hash_max_bytes_in_flight,
+            worker_slots=worker_slots,
+        )
+
+    def map(
+        self,
+        hash_fn: Callable[[Path], R],
+        jobs: Sequence[HashJob],
+        cancellation: Cancellation | None = None,
+    ) -> list[R]:
+        def run(path: Path) -> R:
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            if self.worker_slots is None:
+                return hash_fn(path)
+            with self.worker_slots:
+                return hash_fn(path)
+
+        if self.workers == 1 or len(jobs) <= 1:
+            return [run(job.path) for job in jobs]
+
+        def timed_run(path: Path) -> R:
+            # Counts the CPU time of the hashing thread for the stage that is measured.
+            start = time.thread_time()
+            try:
+                return run(path)
+            finally:
+                timings.record(cpu_time=time.thread_time() - start)
+
+        task = timed_run if timings.is_active() else run
+        budget = _ByteBudget(self.max_bytes_in_flight)
+        futures: dict[int, Future[R]] = {}
+        by_size = sorted(range(len(jobs)), key=lambda i: jobs[i].size, reverse=True)
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="fixity"
+        ) as pool:
+            for index in by_size:
+                job = jobs[index]
+                budget.acquire(job.size)
+                if cancellation is not None and cancellation.is_cancelled:
+                    break
+                future = pool.submit(contextvars.copy_context().run, task, job.path)
+                future.add_done_callback(lambda _, size=job.size: budget.release(size))
+                futures[index] = future
+
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            return [futures[index].result() for index in range(len(jobs))]
@@ -0,0 +1,157 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from types import MappingProxyType
+import os
+import stat
+
+
+class EntryType(Enum):
+    FILE = "file"
+    DIRECTORY = "directory"
+    OTHER = "other"
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    path: Path
+    type: EntryType
+    size: int
+    mtime_ns: int
+    device: int
+    inode: int
+    is_symlink: bool
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """
+    Immutable snapshot of all paths in a SIP, gathered with a single directory walk.
+
+    Symbolic links are resolved for the entry type, size and mtime (like `Path.exists`
+    and `Path.stat`). Symlinked directories are descended into, so `exists` and `iterdir`
+    see their contents like the filesystem does, but `find` leaves them out (like
+    `Path.rglob`). Each directory is walked once, so symlink cycles end the walk.
+    """
+
+    root: Path
+    entries: Mapping[Path, ManifestEntry]
+    children: Mapping[Path, tuple[Path, ...]]
+    by_name: Mapping[str, tuple[Path, ...]]
+
+    def get(self, path: Path) -> ManifestEntry | None:
+        return self.entries.get(normalize(path))
+
+    def exists(self, path: Path) -> bool:
+        return normalize(path) in self.entries
+
+    def is_file(self, path: Path) -> bool:
+        entry = self.get(path)
+        return entry is not None and entry.type == EntryType.FILE
+
+    def is_dir(self, path: Path) -> bool:
+        entry = self.get(path)
+        return entry is not None and entry.type == EntryType.DIRECTORY
+
+    def iterdir(self, path: Path) -> tuple[Path, ...]:
+        "The direct children of a directory, in the same order as `Path.iterdir`."
+        return self.children.get(normalize(path), ())
+
+    def find(self, name: str) -> list[Path]:
+        "All paths with the given name, in the same order as `Path.rglob(name)`."
+        return list(self.by_name.get(name, ()))
+
+
+def normalize(path: Path) -> Path:
+    return Path(os.path.normpath(path))
+
+
+def get_entry_type(mode: int) -> EntryType:
+    if stat.S_ISREG(mode):
+        return EntryType.FILE
+    if stat.S_ISDIR(mode):
+        return EntryType.DIRECTORY
+    return EntryType.OTHER
+
+
+def build_manifest(root: Path) -> Manifest:
+    root = normalize(root)
+    entries: dict[Path, ManifestEntry] = {}
+    children: dict[Path, tuple[Path, ...]] = {}
+    by_name: dict[str, list[Path]] = {}
+
+    try:
+        root_stat = root.stat()
+    except OSError:
+        return Manifest(
+            root=root,
+            entries=MappingProxyType(entries),
+            children=MappingProxyType(children),
+            by_name=MappingProxyType({}),
+        )
+
+    entries[root] = ManifestEntry(
+        path=root,
+        type=get_entry_type(root_stat.st_mode),
+        size=root_stat.st_size,
+        mtime_ns=root_stat.st_mtime_ns,
+        device=root_stat.st_dev,
+        inode=root_stat.st_ino,
+        is_symlink=root.is_symlink(),
+    )
+
+    # Depth-first, pre-order walk: this is the order in which `Path.rglob` yields matches.
+    # Every directory comes with whether it is (below) a symlinked directory.
+    stack = [(root, False)] if entries[root].type == EntryType.DIRECTORY else []
+    walked = {(root_stat.st_dev, root_stat.st_ino)}
+    while stack:
+        directory, below_symlink = stack.pop()
+        directory_children: list[Path] = []
+        subdirectories: list[tuple[Path, bool]] = []
+        try:
+            with os.scandir(directory) as it:
+                dir_entries = list(it)
+        except OSError:
+            dir_entries = []
+
+        for dir_entry in dir_entries:
+            path = directory / dir_entry.name
+            try:
+                entry_stat = dir_entry.stat()
+            except OSError:
+                # Dangling symlink or a file removed during the walk
+                continue
+
+            is_symlink = dir_entry.is_symlink()
+            entry = ManifestEntry(
+                path=path,
+                type=get_entry_type(entry_stat.st_mode),
+                size=entry_stat.st_size,
+                mtime_ns=entry_stat.st_mtime_ns,
+                device=entry_stat.st_dev,
+                inode=entry_stat.st_ino,
+                is_symlink=is_symlink,
+            )
+            entries[path] = entry
+            directory_children.append(path)
+            if not below_symlink:
+                by_name.setdefault(dir_entry.name, []).append(path)
+            if (
+                entry.type == EntryType.DIRECTORY
+                and (entry.device, entry.inode) not in walked
+            ):
+                walked.add((entry.device, entry.inode))
+                subdirectories.append((path, below_symlink or is_symlink))
+
+        children[directory] = tuple(directory_children)
+        stack.extend(reversed(subdirectories))
+
+    return Manifest(
+        root=root,
+        entries=MappingProxyType(entries),
+        children=MappingProxyType(children),
+        by_name=MappingProxyType(
+            {name: tuple(paths) for name, paths in by_name.items()}
+        ),
+    )
@@ -2,6 +2,8 @@
 from eark_models.sip.v2_2_0 import SIP as SIP, Representation
 import eark_models.premis.v3_0 as premis
 from eark_models.dc_schema.v2_1 import DCPlusSchema, EDTF
+from eark_models.etree import _Element as ModelElement
+from eark_models.utils import expand_qname_attributes
 
 
 __all__ = [
@@ -9,4 +11,6 @@ __all__ = [
     "Representation",
     "DCPlusSchema",
     "EDTF",
+    "ModelElement",
+    "expand_qname_attributes",
 ]
@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+import os
+
+from .digests import DEFAULT_BLOCK_SIZE
+from .fixity_cache import FixityCacheBackend, FixityCachePolicy
+from .xsd_engines import XsdEngine
+
+
+def default_hash_workers() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+def default_max_workers() -> int:
+    return os.cpu_count() or 1
+
+
+@dataclass(frozen=True, kw_only=True)
+class ValidationOptions:
+    # Upper bound on the number of files that are hashed or validated against an XSD
+    # schema at the same time in this process, on threads and processes combined. Shared
+    # by all validations in the process that use the same value.
+    max_workers: int = field(default_factory=default_max_workers)
+    # Number of threads used to calculate the message digest of the data files.
+    hash_workers: int = field(default_factory=default_hash_workers)
+    # Upper bound on the combined size of the data files being hashed at the same time.
+    # A single file that is larger than the bound is still hashed, on its own.
+    hash_max_bytes_in_flight: int = 8 * 1024**3
+    # Size of the blocks in which data files are read while hashing.
+    hash_block_size: int = DEFAULT_BLOCK_SIZE
+    # Persistent cache of data file digests, keyed by file identity. Disabled when None.
+    fixity_cache: FixityCacheBackend | None = None
+    # Location of the SQLite database, defaults to `fixity.sqlite` in the user cache directory.
+    fixity_cache_path: Path | None = None
+    fixity_cache_policy: FixityCachePolicy = FixityCachePolicy.TRUST
+    # Cached digests older than this many seconds are evicted.
+    fixity_cache_max_age: float | None = None
+    # Only the most recent entries are kept when the cache grows beyond this size.
+    fixity_cache_max_entries: int | None = None
+    # Number of commons-ip JVMs that are kept running between SIPs.
+    # When 0, a new JVM is started for every SIP.
+    commons_ip_workers: int = 0
+    # A commons-ip JVM is restarted after validating this many SIPs.
+    commons_ip_max_jobs_per_worker: int = 100
+    # Names of the validation stages to run. All stages run when None.
+    only_stages: tuple[str, ...] | None = None
+    # Names of the validation stages to leave out.
+    skip_stages: tuple[str, ...] = ()
+    # Stop at the first error: stages and rules run from cheapest to most expensive,
+    # and the work that is still running is cancelled. The report is marked as truncated.
+    fail_fast: bool = False
+    # Library that validates the XML files against the XSD schemas. Both engines report
+    # the same files as invalid, but with messages in their own words.
+    xsd_engine: XsdEngine = XsdEngine.XMLSCHEMA
+    # Number of processes that validate the XML files against the XSD schemas in parallel.
+    # The processes load the schemas once and are kept for later SIPs. When 0, the files
+    # are validated one after another in the XSD stage. At most `max_workers` processes
+    # are used. The processes are spawned, so a script that validates with `xsd_workers`
+    # needs an `if __name__ == "__main__":` guard; without it the processes cannot start
+    # and the files are validated in the current process instead.
+    xsd_workers: int = 0
+    # Read the PREMIS files element by element instead of as whole documents. The XSD
+    # stage validates them while they are parsed, and the PREMIS rules only keep the
+    # decoded objects, events and agents. Keeps the memory use of very large PREMIS
+    # files down, but the files are read twice, as the stages no longer share a tree.
+    stream_premis: bool = False
+    # Record the wall time, CPU time and I/O of every stage and rule in the report.
+    timings: bool = False
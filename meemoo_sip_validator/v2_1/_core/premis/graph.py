@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+from ..models import premis
+from .helpers import IdentifierKey, to_identifier_key
+
+
+@dataclass(frozen=True)
+class PremisGraph:
+    """
+    Index over the objects of all PREMIS files in a SIP.
+
+    `objects_by_identifier` maps every object identifier to the objects that carry it.
+    `relationships` maps every object (by `id`) to the identifiers it relates to,
+    with the sub-types of those relationships.
+    """
+
+    objects_by_identifier: dict[IdentifierKey, list[premis.Object]]
+    relationships: dict[int, dict[IdentifierKey, list[premis.RelationshipSubType]]]
+
+    @classmethod
+    def from_premises(cls, premises: list[premis.Premis]) -> "PremisGraph":
+        return cls.from_objects(
+            [object for premis in premises for object in premis.objects]
+        )
+
+    @classmethod
+    def from_objects(cls, objects: list[premis.Object]) -> "PremisGraph":
+        objects_by_identifier: dict[IdentifierKey, list[premis.Object]] = {}
+        relationships: dict[
+            int, dict[IdentifierKey, list[premis.RelationshipSubType]]
+        ] = {}
+
+        for object in objects:
+            for key in dict.fromkeys(
+                to_identifier_key(identifier) for identifier in object.identifiers
+            ):
+                objects_by_identifier.setdefault(key, []).append(object)
+
+            targets = relationships.setdefault(id(object), {})
+            for relationship in object.relationships:
+                for related_identifier in relationship.related_object_identifiers:
+                    key = to_identifier_key(related_identifier)
+                    targets.setdefault(key, []).append(relationship.sub_type)
+
+        return cls(
+            objects_by_identifier=objects_by_identifier,
+            relationships=relationships,
+        )
+
+    def has_object(
+        self,
+        identifier: premis.ObjectIdentifier
+        | premis.RelatedObjectIdentifier
+        | premis.LinkingObjectIdentifier,
+    ) -> bool:
+        return to_identifier_key(identifier) in self.objects_by_identifier
+
+    def find_object(
+        self,
+        identifier: premis.RelatedObjectIdentifier | premis.LinkingObjectIdentifier,
+    ) -> premis.Object | None:
+        "The object with the given identifier, if exactly one object has it."
+        objects = self.objects_by_identifier.get(to_identifier_key(identifier), [])
+        if len(objects) != 1:
+            return None
+        return objects[0]
+
+    def relationship_sub_types(
+        self, source: premis.Object, target: premis.Object
+    ) -> list[premis.RelationshipSubType]:
+        "Sub-types of all relationships from the source object to any identifier of the target object."
+        targets = self.relationships.get(id(source), {})
+        return [
+            sub_type
+            for key in dict.fromkeys(
+                to_identifier_key(identifier) for identifier in target.identifiers
+            )
+            for sub_type in targets.get(key, [])
+        ]
@@ -1,41 +1,38 @@
-from typing import TypeVar
+from collections import Counter
+from collections.abc import Hashable, Sequence
+from typing import Any, TypeVar, cast
+import dataclasses
 from pathlib import Path
-from hashlib import md5
 
 from meemoo_sip_validator.v2_1._core import thesauri
 from ..models import premis
 from ..report import Report, Failure, Success, Severity
 from ..codes import Code
+from .. import digests
+from ..context import SipContext
+from ..fixity_cache import FileIdentity, FixityCachePolicy
+from ..hashing import HashJob
+from ..manifest import Manifest
 
 
-def get_all_premis_models(sip_path: Path) -> tuple[list[premis.Premis], Report]:
-    premis_paths = sip_path.rglob("premis.xml")
+def get_all_premis_models(ctx: SipContext) -> tuple[list[premis.Premis], Report]:
     premis_models: list[premis.Premis] = []
     failures: list[Failure | Success] = []
-    for path in premis_paths:
+    for path in ctx.premis_paths:
         try:
-            premis_models.append(premis.Premis.from_xml(path))
+            premis_models.append(ctx.premis(path))
         except Exception:
-            failures.append(
-                Failure(
-                    code=Code.xsd_valid,
-                    severity=Severity.ERROR,
-                    message=f"Unable to parse premis file: {path}",
-                    source=str(path),
-                )
-            )
+            failures.append(get_premis_parse_failure(path))
     return premis_models, Report(results=failures)
 
 
-def get_all_object_identifiers(
-    premises: list[premis.Premis],
-) -> list[premis.ObjectIdentifier]:
-    return [
-        identifier
-        for premis in premises
-        for object in premis.objects
-        for identifier in object.identifiers
-    ]
+def get_premis_parse_failure(path: Path) -> Failure:
+    return Failure(
+        code=Code.xsd_valid,
+        severity=Severity.ERROR,
+        message=f"Unable to parse premis file: {path}",
+        source=str(path),
+    )
 
 
 T = TypeVar("T")
@@ -49,38 +46,52 @@ def unique(items: list[T]) -> list[T]:
     return result
 
 
-def to_identifier(
-    convertable_to_object_id: premis.RelatedObjectIdentifier
-    | premis.LinkingObjectIdentifier,
-):
-    return premis.ObjectIdentifier(
-        __source__=convertable_to_object_id.__source__,
-        type=premis.ObjectIdentifierType(
-            __source__=convertable_to_object_id.__source__,
-            text=convertable_to_object_id.type.text,
-            authority=convertable_to_object_id.type.authority,
-            authority_uri=convertable_to_object_id.type.authority_uri,
-            value_uri=convertable_to_object_id.type.value_uri,
-        ),
-        value=premis.ObjectIdentifierValue(
-            __source__=convertable_to_object_id.__source__,
-            text=convertable_to_object_id.value.text,
-        ),
-        simple_link=convertable_to_object_id.simple_link,
-    )
+def comparison_key(value: Any) -> Hashable:
+    """
+    Hashable key that is equal for two values exactly when the values compare equal.
+    The models are (unhashable) dataclasses, whose equality ignores fields such as `__source__`.
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (
+            type(value),
+            tuple(
+                comparison_key(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+                if field.compare
+            ),
+        )
+    if isinstance(value, list):
+        return tuple(comparison_key(item) for item in cast(list[Any], value))
+    return value
 
 
-def find_related_object(
-    related_object_identifier: premis.RelatedObjectIdentifier,
-    all_objects: list[premis.Object],
-) -> premis.Object | None:
-    related_identifier = to_identifier(related_object_identifier)
-    objects = [
-        object for object in all_objects if related_identifier in object.identifiers
-    ]
-    if len(objects) != 1:
-        return None
-    return objects[0]
+def duplicates(items: list[T]) -> list[T]:
+    "All items that are equal to at least one other item, in their original order."
+    keys = [comparison_key(item) for item in items]
+    counts = Counter(keys)
+    return [item for item, key in zip(items, keys) if counts[key] != 1]
+
+
+IdentifierKey = tuple[str, str | None, str | None, str | None, str, str | None]
+
+
+def to_identifier_key(
+    identifier: premis.ObjectIdentifier
+    | premis.RelatedObjectIdentifier
+    | premis.LinkingObjectIdentifier,
+) -> IdentifierKey:
+    """
+    Hashable key of an identifier of (or pointing to) a PREMIS object.
+    Two object identifiers are equal exactly when their keys are equal.
+    """
+    return (
+        identifier.type.text,
+        identifier.type.authority,
+        identifier.type.authority_uri,
+        identifier.type.value_uri,
+        identifier.value.text,
+        identifier.simple_link,
+    )
 
 
 def get_inverse_relationship(sub_type: premis.RelationshipSubType) -> str:
@@ -100,12 +111,85 @@ def get_data_path_for_file(file: premis.File) -> Path | None:
     return representation_path / "data" / original_name.text
 
 
-def calculate_message_digest(path: Path) -> str:
-    hash = md5()
-    with open(path, "rb") as f:
-        while chunk := f.read(1024 * 2014):  # 1MB
-            hash.update(chunk)
-    return hash.hexdigest()
+def data_exists(data_path: Path, manifest: Manifest | None) -> bool:
+    if manifest is None:
+        return data_path.exists()
+    return manifest.exists(data_path)
+
+
+def calculate_message_digest(path: Path, algorithm: str = "MD5") -> str:
+    return digests.calculate_digests(path, [algorithm])[algorithm]
+
+
+def calculate_message_digests(
+    data_paths: list[Path],
+    ctx: SipContext | None,
+    algorithms: Sequence[str] = ("MD5",),
+) -> list[dict[str, str]]:
+    """
+    Calculate the digests of all data paths, in order, for each of the given
+    algorithms. Every file is read at most once. Digests are taken from the
+    persistent fixity cache when it is enabled and trusted, and the remaining
+    files are hashed in parallel.
+    """
+    if ctx is None:
+        return [
+            {
+                algorithm: calculate_message_digest(path, algorithm)
+                for algorithm in algorithms
+            }
+            for path in data_paths
+        ]
+
+    cache = ctx.digest_cache
+    trust_cache = ctx.options.fixity_cache_policy == FixityCachePolicy.TRUST
+    entries = [ctx.manifest.get(path) for path in data_paths]
+    identities = [
+        FileIdentity.from_manifest_entry(entry) if entry is not None else None
+        for entry in entries
+    ]
+
+    results: list[dict[str, str] | None] = [None] * len(data_paths)
+    if cache is not None:
+        for index, (path, identity) in enumerate(zip(data_paths, identities)):
+            if trust_cache and identity is not None:
+                cached = {
+                    algorithm: cache.get(path, identity, algorithm)
+                    for algorithm in algorithms
+                }
+                if all(digest is not None for digest in cached.values()):
+                    results[index] = cast(dict[str, str], cached)
+            if results[index] is None:
+                ctx.fixity_cache_stats.misses += 1
+            else:
+                ctx.fixity_cache_stats.hits += 1
+
+    to_hash = [index for index, result in enumerate(results) if result is None]
+    jobs = [
+        HashJob(
+            path=data_paths[index],
+            size=identities[index].size if identities[index] is not None else 0,
+        )
+        for index in to_hash
+    ]
+    block_size = ctx.options.hash_block_size
+    cancellation = ctx.cancellation
+    calculated = ctx.hashing_engine.map(
+        lambda path: digests.calculate_digests(
+            path, algorithms, block_size, cancellation
+        ),
+        jobs,
+        cancellation,
+    )
+
+    for index, result in zip(to_hash, calculated):
+        results[index] = result
+        identity = identities[index]
+        if cache is not None and identity is not None:
+            for algorithm, digest in result.items():
+                cache.put(data_paths[index], identity, algorithm, digest)
+
+    return cast(list[dict[str, str]], results)
 
 
 def get_object_id(file: premis.File) -> str:
@@ -120,7 +204,7 @@ def get_object_id(file: premis.File) -> str:
     return str((id.type.text, id.value.text))
 
 
-def get_file_fixity(file: premis.File) -> str | None:
+def get_supported_fixity(file: premis.File) -> premis.Fixity | None:
     fixities = [
         fixity
         for characteristics in file.characteristics
@@ -130,4 +214,4 @@ def get_file_fixity(file: premis.File) -> str | None:
     if len(fixities) != 1:
         return None
 
-    return fixities[0].message_digest.text
+    return fixities[0]
@@ -1,17 +1,30 @@
-from functools import reduce
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from .. import thesauri
 from ..codes import Code
+from ..context import SipContext
 from ..models import premis
-from ..report import Report, RuleResult, TupleWithSource
+from ..report import Report, RuleResult, TupleWithSource, run_rule
 from . import helpers
+from .view import PremisView, get_premis_view
+
+# The allowed values in failure messages, joined once instead of for every message
+event_agent_roles_text = ", ".join(thesauri.event_agent_roles)
+event_object_roles_text = ", ".join(thesauri.event_object_roles)
+event_types_text = ", ".join(thesauri.event_types)
+relationship_sub_types_text = ", ".join(thesauri.relationship_sub_types)
+relationship_types_text = ", ".join(thesauri.relationship_types)
+agent_types_text = ",".join(thesauri.agent_types)
+event_outcomes_text = ",".join(thesauri.event_outcomes)
+supported_hashes_text = ",".join(thesauri.supported_hashes)
 
 
 def check_object_identifier_type_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.ObjectIdentifier]:
-    all_object_identifiers = helpers.get_all_object_identifiers(premises)
+    all_object_identifiers = view.object_identifiers
     invalid_identifiers = [
         identifier
         for identifier in all_object_identifiers
@@ -26,9 +39,9 @@ def check_object_identifier_type_vocabulary(
 
 
 def check_object_identifier_type_uuid_existance(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Object]:
-    all_object = [object for premis in premises for object in premis.objects]
+    all_object = view.objects
     objects_without_uuid = [
         object
         for object in all_object
@@ -50,18 +63,11 @@ def check_object_identifier_type_uuid_existance(
 
 
 def check_object_identifiers_uniqueness(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.ObjectIdentifier]:
-    all_object_identifiers = helpers.get_all_object_identifiers(premises)
+    all_object_identifiers = view.object_identifiers
 
-    # Excuse the slightly cryptic code here. My excuse for doing it this way
-    # is because the `premis.ObjectIdentifier` dataclass is not hashable (because it is not frozen).
-    # This gets the identifiers that appear more than once over all the premis files.
-    duplicate_identifiers = [
-        identifier
-        for identifier in all_object_identifiers
-        if len([_id for _id in all_object_identifiers if _id == identifier]) != 1
-    ]
+    duplicate_identifiers = helpers.duplicates(all_object_identifiers)
 
     return RuleResult(
         code=Code.object_identifiers_uniqueness,
@@ -72,9 +78,9 @@ def check_object_identifiers_uniqueness(
 
 
 def check_event_type_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Event]:
-    all_events = [event for premis in premises for event in premis.events]
+    all_events = view.events
     invalid_events = [
         event for event in all_events if event.type.text not in thesauri.event_types
     ]
@@ -82,17 +88,15 @@ def check_event_type_vocabulary(
     return RuleResult(
         code=Code.event_type_thesauri,
         failed_items=invalid_events,
-        fail_msg=lambda event: f"Usage of non-existant event type '{event.type.text}' on event '{event.identifier.value.text}'. PREMIS event type must be one of ({', '.join(thesauri.event_types)})",
+        fail_msg=lambda event: f"Usage of non-existant event type '{event.type.text}' on event '{event.identifier.value.text}'. PREMIS event type must be one of ({event_types_text})",
         success_msg="Validated PREMIS event type vocabulary.",
     )
 
 
 def check_event_identifier_type_is_uuid(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.EventIdentifier]:
-    all_events_identifiers = [
-        event.identifier for premis in premises for event in premis.events
-    ]
+    all_events_identifiers = view.event_identifiers
     invalid_event_identifiers = [
         identifier
         for identifier in all_events_identifiers
@@ -108,16 +112,10 @@ def check_event_identifier_type_is_uuid(
 
 
 def check_event_identifier_uniqueness(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.EventIdentifier]:
-    all_events_identifiers = [
-        event.identifier for premis in premises for event in premis.events
-    ]
-    duplicate_identifiers = [
-        identifier
-        for identifier in all_events_identifiers
-        if len([_id for _id in all_events_identifiers if _id == identifier]) != 1
-    ]
+    all_events_identifiers = view.event_identifiers
+    duplicate_identifiers = helpers.duplicates(all_events_identifiers)
 
     return RuleResult(
         code=Code.event_identifier_uniqueness,
@@ -128,9 +126,9 @@ def check_event_identifier_uniqueness(
 
 
 def check_event_outcome_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Event]:
-    all_events = [event for premis in premises for event in premis.events]
+    all_events = view.events
     invalid_events = [
         event
         for event in all_events
@@ -152,15 +150,15 @@ def check_event_outcome_vocabulary(
     return RuleResult(
         code=Code.event_outcome_thesauri,
         failed_items=invalid_events,
-        fail_msg=lambda event: f"Usage of non-existant event outcome(s) '{invalid_outcomes(event)}' on event ({event.identifier.type.text}, {event.identifier.value.text}). Outcome must be one of ({','.join(thesauri.event_outcomes)})",
+        fail_msg=lambda event: f"Usage of non-existant event outcome(s) '{invalid_outcomes(event)}' on event ({event.identifier.type.text}, {event.identifier.value.text}). Outcome must be one of ({event_outcomes_text})",
         success_msg="Validated PREMIS event outcome vocabulary.",
     )
 
 
 def check_event_linking_agent_identifier_cardinality(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Event]:
-    all_events = [event for premis in premises for event in premis.events]
+    all_events = view.events
     invalid_events = [
         event for event in all_events if len(event.linking_agent_identifiers) == 0
     ]
@@ -174,9 +172,9 @@ def check_event_linking_agent_identifier_cardinality(
 
 
 def check_event_linking_object_identifier_cardinality(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Event]:
-    all_events = [event for premis in premises for event in premis.events]
+    all_events = view.events
     invalid_events = [
         event for event in all_events if len(event.linking_object_identifiers) == 0
     ]
@@ -190,14 +188,9 @@ def check_event_linking_object_identifier_cardinality(
 
 
 def check_event_linking_agent_role_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.LinkingAgentIdentifier]:
-    all_linking_agent_identifiers = [
-        linking_agent_identifier
-        for premis in premises
-        for event in premis.events
-        for linking_agent_identifier in event.linking_agent_identifiers
-    ]
+    all_linking_agent_identifiers = view.linking_agent_identifiers
     invalid_linking_agent_identifiers = [
         linking_agent_identifier
         for linking_agent_identifier in all_linking_agent_identifiers
@@ -218,20 +211,15 @@ def check_event_linking_agent_role_vocabulary(
     return RuleResult(
         code=Code.event_linking_agent_identifier_role_thesauri,
         failed_items=invalid_linking_agent_identifiers,
-        fail_msg=lambda agent_id: f"Usage of non-existant linking agent identifier role(s) '{invalid_roles(agent_id)}' on linking agent ({agent_id.type.text}, {agent_id.value.text}). Agent roles must be one of ({', '.join(thesauri.event_agent_roles)})",
+        fail_msg=lambda agent_id: f"Usage of non-existant linking agent identifier role(s) '{invalid_roles(agent_id)}' on linking agent ({agent_id.type.text}, {agent_id.value.text}). Agent roles must be one of ({event_agent_roles_text})",
         success_msg="Validated PREMIS linking agent identifier role vocabulary.",
     )
 
 
 def check_event_linking_object_role_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.LinkingObjectIdentifier]:
-    all_linking_object_identifiers = [
-        linking_object_identifier
-        for premis in premises
-        for event in premis.events
-        for linking_object_identifier in event.linking_object_identifiers
-    ]
+    all_linking_object_identifiers = view.linking_object_identifiers
     invalid_linking_object_identifiers = [
         linking_object_identifier
         for linking_object_identifier in all_linking_object_identifiers
@@ -252,15 +240,15 @@ def check_event_linking_object_role_vocabulary(
     return RuleResult(
         code=Code.event_linking_object_identifier_role_thesauri,
         failed_items=invalid_linking_object_identifiers,
-        fail_msg=lambda object_id: f"Usage of non-existant linking object identifier role(s) '{invalid_roles(object_id)}' on linking object ({object_id.type.text}, {object_id.value.text}). Object roles must be one of ({', '.join(thesauri.event_object_roles)})",
+        fail_msg=lambda object_id: f"Usage of non-existant linking object identifier role(s) '{invalid_roles(object_id)}' on linking object ({object_id.type.text}, {object_id.value.text}). Object roles must be one of ({event_object_roles_text})",
         success_msg="Validated PREMIS linking object identifier role vocabulary.",
     )
 
 
 def check_event_has_one_implementer(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Event]:
-    all_events = [event for premis in premises for event in premis.events]
+    all_events = view.events
 
     def get_implementer_roles(event: premis.Event) -> list[premis.LinkingAgentRole]:
         return [
@@ -283,38 +271,26 @@ def check_event_has_one_implementer(
 
 
 def check_event_sources_exist(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.LinkingObjectIdentifier]:
-    all_events = [event for premis in premises for event in premis.events]
     source_objects = [
         linking_object_identifier
-        for event in all_events
-        for linking_object_identifier in event.linking_object_identifiers
+        for linking_object_identifier in view.linking_object_identifiers
         if "source" in [role.text for role in linking_object_identifier.roles]
     ]
-    all_object_identifiers = helpers.get_all_object_identifiers(premises)
 
-    def is_outcome(linking_obj: premis.LinkingObjectIdentifier) -> bool:
-        return "outcome" in [role.text for role in linking_obj.roles]
-
-    def object_id_exists(linking_obj: premis.LinkingObjectIdentifier) -> bool:
-        return helpers.to_identifier(linking_obj) not in all_object_identifiers
-
-    all_temporary_created_object_ids = [
-        helpers.to_identifier(linking_object_identifier)
-        for event in all_events
-        for linking_object_identifier in event.linking_object_identifiers
-        if is_outcome(linking_object_identifier)
-        and object_id_exists(linking_object_identifier)
-    ]
-    all_objects_including_temporary = (
-        all_temporary_created_object_ids + all_object_identifiers
-    )
+    # Sources may also be objects that are only created as the outcome of an event.
+    outcome_identifiers = {
+        helpers.to_identifier_key(linking_object_identifier)
+        for linking_object_identifier in view.linking_object_identifiers
+        if "outcome" in [role.text for role in linking_object_identifier.roles]
+    }
 
     invalid_source_objects = [
         source
         for source in source_objects
-        if helpers.to_identifier(source) not in all_objects_including_temporary
+        if not view.graph.has_object(source)
+        and helpers.to_identifier_key(source) not in outcome_identifiers
     ]
 
     return RuleResult(
@@ -326,23 +302,18 @@ def check_event_sources_exist(
 
 
 def check_related_objects_identifier_uses_existing_object(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.RelatedObjectIdentifier]:
     # TODO: is it possible to have a relationship to a "temporary" object created by an event?
     all_related_identifiers = [
         related_object_identifier
-        for premis in premises
-        for object in premis.objects
-        for relationship in object.relationships
+        for _, relationship in view.object_relationships
         for related_object_identifier in relationship.related_object_identifiers
     ]
-    all_object_identifiers = [
-        object for object in helpers.get_all_object_identifiers(premises)
-    ]
     non_existant_object_identifiers = [
         related_identifier
         for related_identifier in all_related_identifiers
-        if helpers.to_identifier(related_identifier) not in all_object_identifiers
+        if not view.graph.has_object(related_identifier)
     ]
 
     return RuleResult(
@@ -354,18 +325,16 @@ def check_related_objects_identifier_uses_existing_object(
 
 
 def check_related_objects_inverse_relationship_valid(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[
     TupleWithSource[premis.RelationshipSubType, premis.RelatedObjectIdentifier]
 ]:
     all_relationship_sub_type_and_rel_object_id_pairs = (
         (relationship.sub_type, related_object_identifier, object)
-        for premis in premises
-        for object in premis.objects
-        for relationship in object.relationships
+        for object, relationship in view.object_relationships
         for related_object_identifier in relationship.related_object_identifiers
     )
-    all_objects = [object for premis in premises for object in premis.objects]
+    graph = view.graph
 
     invalid_items: list[
         TupleWithSource[premis.RelationshipSubType, premis.RelatedObjectIdentifier]
@@ -375,21 +344,16 @@ def check_related_objects_inverse_relationship_valid(
         rel_obj_id,
         self_object,
     ) in all_relationship_sub_type_and_rel_object_id_pairs:
-        related_object = helpers.find_related_object(rel_obj_id, all_objects)
+        related_object = graph.find_object(rel_obj_id)
         if related_object is None:
             # could not determine related object
             continue
 
-        relationships_pointing_to_self = [
-            relationship
-            for relationship in related_object.relationships
-            for related_object_identifier in relationship.related_object_identifiers
-            if helpers.to_identifier(related_object_identifier)
-            in self_object.identifiers
-        ]
         inverse_found = any(
-            helpers.get_inverse_relationship(relationship.sub_type) == sub_type.text
-            for relationship in relationships_pointing_to_self
+            helpers.get_inverse_relationship(inverse_sub_type) == sub_type.text
+            for inverse_sub_type in graph.relationship_sub_types(
+                related_object, self_object
+            )
         )
         if not inverse_found:
             invalid_items.append(
@@ -408,14 +372,9 @@ def check_related_objects_inverse_relationship_valid(
 
 
 def check_relationships_type_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Relationship]:
-    all_relationships = [
-        relationship
-        for premis in premises
-        for object in premis.objects
-        for relationship in object.relationships
-    ]
+    all_relationships = [relationship for _, relationship in view.object_relationships]
     invalid_relationships = [
         relationship
         for relationship in all_relationships
@@ -425,20 +384,15 @@ def check_relationships_type_vocabulary(
     return RuleResult(
         code=Code.relationship_type_thesauri,
         failed_items=invalid_relationships,
-        fail_msg=lambda relationship: f"Usage of non-existant relationship type '{relationship.type.text}'. PREMIS  type must be one of ({', '.join(thesauri.relationship_types)}).",
+        fail_msg=lambda relationship: f"Usage of non-existant relationship type '{relationship.type.text}'. PREMIS  type must be one of ({relationship_types_text}).",
         success_msg="PREMIS relationship types vocabulary validated.",
     )
 
 
 def check_relationships_sub_type_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Relationship]:
-    all_relationships = [
-        relationship
-        for premis in premises
-        for object in premis.objects
-        for relationship in object.relationships
-    ]
+    all_relationships = [relationship for _, relationship in view.object_relationships]
     invalid_relationships = [
         relationship
         for relationship in all_relationships
@@ -448,20 +402,15 @@ def check_relationships_sub_type_vocabulary(
     return RuleResult(
         code=Code.relationship_sub_type_thesauri,
         failed_items=invalid_relationships,
-        fail_msg=lambda relationship: f"Usage of non-existant relationship sub-type '{relationship.sub_type.text}'. PREMIS relationship sub-type must be one of ({', '.join(thesauri.relationship_sub_types)}).",
+        fail_msg=lambda relationship: f"Usage of non-existant relationship sub-type '{relationship.sub_type.text}'. PREMIS relationship sub-type must be one of ({relationship_sub_types_text}).",
         success_msg="PREMIS relationship sub-types vocabulary validated.",
     )
 
 
 def check_relationships_sub_type_vocabulary_per_object_type(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Relationship]:
-    object_and_relationhip_pairs = [
-        (object, relationship)
-        for premis in premises
-        for object in premis.objects
-        for relationship in object.relationships
-    ]
+    object_and_relationhip_pairs = view.object_relationships
     invalid_relationships = [
         relationship
         for object, relationship in object_and_relationhip_pairs
@@ -478,9 +427,9 @@ def check_relationships_sub_type_vocabulary_per_object_type(
 
 
 def check_agent_identifier_type_uuid_existance(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Agent]:
-    all_agent = [agent for premis in premises for agent in premis.agents]
+    all_agent = view.agents
     agents_without_uuid = [
         agent
         for agent in all_agent
@@ -502,19 +451,10 @@ def check_agent_identifier_type_uuid_existance(
 
 
 def check_agent_identifier_uniqueness(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.AgentIdentifier]:
-    all_agent_identifiers = [
-        identifier
-        for premis in premises
-        for agent in premis.agents
-        for identifier in agent.identifiers
-    ]
-    duplicate_identifiers = [
-        identifier
-        for identifier in all_agent_identifiers
-        if len([_id for _id in all_agent_identifiers if _id == identifier]) != 1
-    ]
+    all_agent_identifiers = view.agent_identifiers
+    duplicate_identifiers = helpers.duplicates(all_agent_identifiers)
 
     return RuleResult(
         code=Code.agent_identifier_uniqueness,
@@ -525,9 +465,9 @@ def check_agent_identifier_uniqueness(
 
 
 def check_agent_type_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.Agent]:
-    all_agents = [agent for premis in premises for agent in premis.agents]
+    all_agents = view.agents
     invalid_agents = [
         agent for agent in all_agents if agent.type.text not in thesauri.agent_types
     ]
@@ -535,20 +475,15 @@ def check_agent_type_vocabulary(
     return RuleResult(
         code=Code.agent_type_thesauri,
         failed_items=invalid_agents,
-        fail_msg=lambda agent: f"Usage of non-existant agent type '{agent.type.text}'. PREMIS agent type must be one of ({','.join(thesauri.agent_types)}).",
+        fail_msg=lambda agent: f"Usage of non-existant agent type '{agent.type.text}'. PREMIS agent type must be one of ({agent_types_text}).",
         success_msg="Validated PREMIS agent type vocabulary.",
     )
 
 
 def check_fixity_message_digest_algorithm_vocabulary(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.File]:
-    all_files = [
-        object
-        for premis in premises
-        for object in premis.objects
-        if object.xsi_type == "{http://www.loc.gov/premis/v3}file"
-    ]
+    all_files = view.files
     invalid_files = [
         file
         for file in all_files
@@ -560,20 +495,15 @@ def check_fixity_message_digest_algorithm_vocabulary(
     return RuleResult(
         code=Code.fixity_message_digest_algorithm_thesauri,
         failed_items=invalid_files,
-        fail_msg=lambda file: f"Usage of non-supported message digest algorithm(s) in PREMIS file '{helpers.get_object_id(file)}'. PREMIS message digest algorithm must be one of ({','.join(thesauri.supported_hashes)}).",
+        fail_msg=lambda file: f"Usage of non-supported message digest algorithm(s) in PREMIS file '{helpers.get_object_id(file)}'. PREMIS message digest algorithm must be one of ({supported_hashes_text}).",
         success_msg="Validated supported PREMIS fixity message digest algorithm.",
     )
 
 
 def check_file_orignal_name_present(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.File]:
-    files = [
-        file
-        for premis in premises
-        for file in premis.objects
-        if file.xsi_type == "{http://www.loc.gov/premis/v3}file"
-    ]
+    files = view.files
     invalid_files = [file for file in files if file.original_name is None]
 
     return RuleResult(
@@ -584,14 +514,9 @@ def check_file_orignal_name_present(
     )
 
 
-def check_file_fixity_present(premises: list[premis.Premis]) -> RuleResult[premis.File]:
-    files = [
-        file
-        for premis in premises
-        for file in premis.objects
-        if file.xsi_type == "{http://www.loc.gov/premis/v3}file"
-    ]
-    invalid_files = [file for file in files if helpers.get_file_fixity(file) is None]
+def check_file_fixity_present(view: PremisView) -> RuleResult[premis.File]:
+    files = view.files
+    invalid_files = [file for file in files if view.fixity(file) is None]
 
     return RuleResult(
         code=Code.file_fixity_present,
@@ -602,16 +527,13 @@ def check_file_fixity_present(premises: list[premis.Premis]) -> RuleResult[premi
 
 
 def check_file_references_existing_data(
-    premises: list[premis.Premis],
-) -> RuleResult[premis.File]:
-    files = [
-        file
-        for premis in premises
-        for file in premis.objects
-        if file.xsi_type == "{http://www.loc.gov/premis/v3}file"
-    ]
-    data_paths = [helpers.get_data_path_for_file(file) for file in files]
-    invalid_files: list[premis.File] = []
+    view: PremisView,
+) -> RuleResult[TupleWithSource[str, str]]:
+    manifest = view.manifest
+    files = view.files
+    data_paths = view.data_paths
+    # Only the values of the message, to not keep the view alive with the report
+    invalid_files: list[TupleWithSource[str, str]] = []
     for file, data_path in zip(files, data_paths):
         if file.original_name is None:
             continue  # Checked by other rule
@@ -619,39 +541,53 @@ def check_file_references_existing_data(
         if data_path is None:
             continue  # checked by other rule: data_path is None if the original name is None
 
-        if not data_path.exists():
-            invalid_files.append(file)
+        if not helpers.data_exists(data_path, manifest):
+            invalid_files.append(
+                TupleWithSource(
+                    __source__=file.__source__,
+                    items=(str(data_path), helpers.get_object_id(file)),
+                )
+            )
 
     return RuleResult(
         code=Code.file_is_mappable_to_data,
         failed_items=invalid_files,
-        fail_msg=lambda file: f"Could not find data '{helpers.get_data_path_for_file(file)}' referenced by PREMIS file {helpers.get_object_id(file)}.",
+        fail_msg=lambda file: f"Could not find data '{file.items[0]}' referenced by PREMIS file {file.items[1]}.",
         success_msg="Validated reference from PREMIS files to data.",
     )
 
 
 def check_fixity_message_digest_matches_actual_hash(
-    premises: list[premis.Premis],
+    view: PremisView,
 ) -> RuleResult[premis.File]:
-    files = [
-        file
-        for premis in premises
-        for file in premis.objects
-        if file.xsi_type == "{http://www.loc.gov/premis/v3}file"
-    ]
-    data_paths = [helpers.get_data_path_for_file(file) for file in files]
+    manifest = view.manifest
+    files = view.files
+    data_paths = view.data_paths
 
-    invalid_files: list[premis.File] = []
-    for file, data_path in zip(files, data_paths):
+    files_to_hash: list[tuple[premis.File, premis.Fixity]] = []
+    paths_to_hash: list[Path] = []
+    for file, data_path, fixity in zip(files, data_paths, view.fixities):
         if data_path is None:
             continue  # checked by other rule
-        if not data_path.exists():
+        if not helpers.data_exists(data_path, manifest):
             continue  # checked by other rule
-        calculated_digest = helpers.calculate_message_digest(data_path)
-        fixity = helpers.get_file_fixity(file)
         if fixity is None:
             continue  # checked by other rule
-        if fixity.lower() != calculated_digest.lower():
+        files_to_hash.append((file, fixity))
+        paths_to_hash.append(data_path)
+
+    # All algorithms are calculated in the same pass over a file.
+    algorithms = sorted(
+        {fixity.message_digest_algorithm.text for _, fixity in files_to_hash}
+    )
+    calculated_digests = helpers.calculate_message_digests(
+        paths_to_hash, view.ctx, algorithms
+    )
+
+    invalid_files: list[premis.File] = []
+    for (file, fixity), calculated in zip(files_to_hash, calculated_digests):
+        calculated_digest = calculated[fixity.message_digest_algorithm.text]
+        if fixity.message_digest.text.lower() != calculated_digest.lower():
             invalid_files.append(file)
 
     return RuleResult(
@@ -685,17 +621,54 @@ checks = [
     check_agent_identifier_type_uuid_existance,
     check_agent_type_vocabulary,
     check_fixity_message_digest_algorithm_vocabulary,
-    check_fixity_message_digest_matches_actual_hash,
     check_file_orignal_name_present,
     check_file_fixity_present,
-    check_file_references_existing_data,
 ]
 
 
-def validate_premis(sip_path: Path) -> Report:
-    premises, failed_parse_report = helpers.get_all_premis_models(sip_path)
-    rule_results = (check(premises) for check in checks)
-    reports = (rule.to_report() for rule in rule_results)
-    combined_report = reduce(Report.__add__, reports)
+# Rules that compare every identifier with every other identifier or build the
+# PREMIS graph. With `fail_fast` they run after the other rules.
+expensive_checks = [
+    check_object_identifiers_uniqueness,
+    check_event_identifier_uniqueness,
+    check_agent_identifier_uniqueness,
+    check_related_objects_identifier_uses_existing_object,
+    check_related_objects_inverse_relationship_valid,
+    check_event_sources_exist,
+]
+
+
+def run_checks(
+    view: PremisView, checks: list[Callable[[PremisView], RuleResult[Any]]]
+) -> Report:
+    ctx = view.ctx
+    if ctx is None or not ctx.options.fail_fast:
+        return Report.combine(run_rule(check, view) for check in checks)
+
+    # Cheapest rules first, up to the first rule that fails.
+    reports: list[Report] = []
+    ordered = sorted(checks, key=lambda check: check in expensive_checks)
+    for index, check in enumerate(ordered):
+        ctx.cancellation.raise_if_cancelled()
+        reports.append(run_rule(check, view))
+        if not reports[-1].is_valid:
+            reports[-1].truncated = index < len(ordered) - 1
+            break
+    return Report.combine(reports)
+
+
+def validate_premis(ctx: SipContext) -> Report:
+    "All PREMIS rules that only look at the PREMIS files."
+    view, failed_parse_report = get_premis_view(ctx)
+    return failed_parse_report + run_checks(view, checks)
+
+
+def validate_file_references(ctx: SipContext) -> Report:
+    view, _ = get_premis_view(ctx)
+    return run_checks(view, [check_file_references_existing_data])
+
 
-    return failed_parse_report + combined_report
+def validate_fixity(ctx: SipContext) -> Report:
+    "Compares the PREMIS fixity of every file with the digest of its data."
+    view, _ = get_premis_view(ctx)
+    return run_checks(view, [check_fixity_message_digest_matches_actual_hash])
@@ -0,0 +1,97 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, cast
+import xml.etree.ElementTree as ET
+
+from .. import timings
+from ..models import ModelElement, expand_qname_attributes, premis
+
+XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+# The model of every object xsi:type, as in `premis.Premis.from_xml_tree`. Objects of
+# other types are left out.
+object_models: dict[str, type[premis.Object]] = {
+    "{http://www.loc.gov/premis/v3}intellectualEntity": premis.IntellectualEntity,
+    "{http://www.loc.gov/premis/v3}representation": premis.Representation,
+    "{http://www.loc.gov/premis/v3}file": premis.File,
+}
+
+Entity = premis.Object | premis.Event | premis.Agent
+
+
+def decode(
+    element: ET.Element, namespaces: dict[str, str], path: Path
+) -> Entity | None:
+    "The model of a child of the PREMIS root, or None when the rules do not use it."
+    _ = expand_qname_attributes(element, namespaces)
+    model_element = ModelElement(element, source=str(path))
+    match element.tag:
+        case "{http://www.loc.gov/premis/v3}event":
+            return premis.Event.from_xml_tree(model_element)
+        case "{http://www.loc.gov/premis/v3}agent":
+            return premis.Agent.from_xml_tree(model_element)
+        case "{http://www.loc.gov/premis/v3}object":
+            model = object_models.get(element.get(XSI_TYPE, ""))
+            return model.from_xml_tree(model_element) if model is not None else None
+        case _:
+            return None
+
+
+def iter_premis(path: Path) -> Iterator[Entity]:
+    """
+    Decodes the objects, events and agents of a PREMIS file one by one, while the file
+    is parsed. Each element is removed from the tree once it is decoded, so at most one
+    of them is held in memory.
+
+    Raises when the file is not well-formed or not PREMIS 3.0, like `premis.Premis`.
+    """
+    if timings.is_active():
+        timings.record(bytes_read=path.stat().st_size, files_opened=1)
+    namespaces: dict[str, str] = {}
+    root: ET.Element | None = None
+    depth = 0
+    for event, item in ET.iterparse(path, events=("start-ns", "start", "end")):
+        if event == "start-ns":
+            prefix, uri = cast(tuple[str, str], item)
+            namespaces[prefix] = uri
+            continue
+
+        element = cast(ET.Element, item)
+        if event == "start":
+            if root is None:
+                root = element
+                if root.get("version") != "3.0":
+                    raise ValueError(f"Not a PREMIS 3.0 file: {path}")
+            depth += 1
+            continue
+
+        depth -= 1
+        # Only the children of the root, once they are complete
+        if depth != 1 or root is None:
+            continue
+        entity = decode(element, namespaces, path)
+        root.remove(element)
+        if entity is not None:
+            yield entity
+
+
+def read_premis(
+    path: Path,
+) -> tuple[list[premis.Object], list[premis.Event], list[premis.Agent]]:
+    """
+    The objects, events and agents of a PREMIS file, decoded with `iter_premis`. The
+    objects are ordered as in `premis.Premis`: entities, then representations, then files.
+    """
+    objects: dict[type[Any], list[premis.Object]] = {
+        model: [] for model in object_models.values()
+    }
+    events: list[premis.Event] = []
+    agents: list[premis.Agent] = []
+    for entity in iter_premis(path):
+        if isinstance(entity, premis.Event):
+            events.append(entity)
+        elif isinstance(entity, premis.Agent):
+            agents.append(entity)
+        else:
+            objects[type(entity)].append(entity)
+    return [object for group in objects.values() for object in group], events, agents
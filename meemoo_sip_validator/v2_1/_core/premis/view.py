@@ -0,0 +1,119 @@
+from functools import cached_property
+from pathlib import Path
+from typing import cast
+
+from ..context import SipContext
+from ..manifest import Manifest
+from ..models import premis
+from ..report import Failure, Report, Success
+from . import helpers
+from .graph import PremisGraph
+from .stream import read_premis
+
+FILE_XSI_TYPE = "{http://www.loc.gov/premis/v3}file"
+
+
+class PremisView:
+    """
+    The contents of all PREMIS files in a SIP, flattened once and shared by all PREMIS rules.
+
+    Per-file values (data path, fixity) are stored in lists aligned with `files`.
+    The view is filled from whole PREMIS models, or file by file with `add`.
+    """
+
+    def __init__(self, premises: list[premis.Premis], ctx: SipContext | None = None):
+        self.ctx = ctx
+
+        self.objects: list[premis.Object] = []
+        self.files: list[premis.File] = []
+        self.events: list[premis.Event] = []
+        self.agents: list[premis.Agent] = []
+
+        self.object_identifiers: list[premis.ObjectIdentifier] = []
+        self.event_identifiers: list[premis.EventIdentifier] = []
+        self.agent_identifiers: list[premis.AgentIdentifier] = []
+        self.object_relationships: list[tuple[premis.Object, premis.Relationship]] = []
+        self.linking_agent_identifiers: list[premis.LinkingAgentIdentifier] = []
+        self.linking_object_identifiers: list[premis.LinkingObjectIdentifier] = []
+
+        self.data_paths: list[Path | None] = []
+        self.fixities: list[premis.Fixity | None] = []
+        self._file_index: dict[int, int] = {}
+
+        for premis_model in premises:
+            self.add(premis_model.objects, premis_model.events, premis_model.agents)
+
+    def add(
+        self,
+        objects: list[premis.Object],
+        events: list[premis.Event],
+        agents: list[premis.Agent],
+    ) -> None:
+        "Adds the contents of a PREMIS file to the view."
+        for object in objects:
+            self.objects.append(object)
+            self.object_identifiers.extend(object.identifiers)
+            self.object_relationships.extend(
+                (object, relationship) for relationship in object.relationships
+            )
+            if object.xsi_type == FILE_XSI_TYPE:
+                file = cast(premis.File, object)
+                self._file_index[id(file)] = len(self.files)
+                self.files.append(file)
+                self.data_paths.append(helpers.get_data_path_for_file(file))
+                self.fixities.append(helpers.get_supported_fixity(file))
+
+        for event in events:
+            self.events.append(event)
+            self.event_identifiers.append(event.identifier)
+            self.linking_agent_identifiers.extend(event.linking_agent_identifiers)
+            self.linking_object_identifiers.extend(event.linking_object_identifiers)
+
+        for agent in agents:
+            self.agents.append(agent)
+            self.agent_identifiers.extend(agent.identifiers)
+
+    @property
+    def manifest(self) -> Manifest | None:
+        return self.ctx.manifest if self.ctx is not None else None
+
+    @cached_property
+    def graph(self) -> PremisGraph:
+        return PremisGraph.from_objects(self.objects)
+
+    def data_path(self, file: premis.File) -> Path | None:
+        return self.data_paths[self._file_index[id(file)]]
+
+    def fixity(self, file: premis.File) -> premis.Fixity | None:
+        return self.fixities[self._file_index[id(file)]]
+
+
+def get_premis_view(ctx: SipContext) -> tuple[PremisView, Report]:
+    "The PREMIS view of the SIP, built once per validation, with the failures to parse PREMIS files."
+
+    def build() -> tuple[PremisView, Report]:
+        if ctx.options.stream_premis:
+            return get_streamed_premis_view(ctx)
+        premises, failed_parse_report = helpers.get_all_premis_models(ctx)
+        return PremisView(premises, ctx), failed_parse_report
+
+    return ctx.memoize("premis_view", build)
+
+
+def get_streamed_premis_view(ctx: SipContext) -> tuple[PremisView, Report]:
+    """
+    Fills the view from the PREMIS files without parsing them as whole documents, see
+    `ValidationOptions.stream_premis`. Each file is added once it is read completely,
+    so a file that cannot be parsed adds nothing, as with whole documents.
+    """
+    view = PremisView([], ctx)
+    failures: list[Failure | Success] = []
+    for path in ctx.premis_paths:
+        ctx.cancellation.raise_if_cancelled()
+        try:
+            objects, events, agents = read_premis(path)
+        except Exception:
+            failures.append(helpers.get_premis_parse_failure(path))
+            continue
+        view.add(objects, events, agents)
+    return view, Report(results=failures)
@@ -8,11 +8,14 @@ from typing import (
     Generic,
     Unpack,
 )
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import sys
 
+from . import timings
 from .codes import Code
+from .timings import Timing
 
 
 class Severity(str, Enum):
@@ -21,14 +24,69 @@ class Severity(str, Enum):
     INFO = "INFO"
 
 
-@dataclass
+class Message:
+    """
+    A message that is rendered from an item when it is first read, so a rule with
+    many failed items does not format a string for each of them upfront. The text is
+    kept once it is rendered, and the item is let go.
+    """
+
+    __slots__ = ("render", "item", "text")
+
+    def __init__(self, render: Callable[[Any], str], item: Any):
+        self.render: Callable[[Any], str] | None = render
+        self.item = item
+        self.text: str | None = None
+
+    def __str__(self) -> str:
+        if self.text is None:
+            assert self.render is not None
+            self.text = self.render(self.item)
+            self.render = None
+            self.item = None
+        return self.text
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The rules render with local functions, which cannot be pickled, so a message
+        # crosses process boundaries as its text.
+        return (str, (str(self),))
+
+
 class Failure:
-    code: Code
-    message: str
-    severity: Severity
-    source: str
+    __slots__ = ("code", "_message", "severity", "source")
+
     result: Literal["FAIL"] = "FAIL"
 
+    def __init__(
+        self,
+        code: Code,
+        message: str | Message,
+        severity: Severity,
+        source: str,
+    ):
+        self.code = code
+        self._message = message
+        self.severity = severity
+        # Many failures share the same source file.
+        self.source = sys.intern(source)
+
+    @property
+    def message(self) -> str:
+        return str(self._message)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Failure):
+            return NotImplemented
+        return (self.code, self.message, self.severity, self.source) == (
+            other.code,
+            other.message,
+            other.severity,
+            other.source,
+        )
+
+    def __repr__(self) -> str:
+        return f"Failure(code={self.code!r}, message={self.message!r}, severity={self.severity!r}, source={self.source!r})"
+
     def to_dict(self) -> dict[str, Any]:
         return {
             # "code": self.code, # Include this once the constraints list is finilized
@@ -39,7 +97,7 @@ class Failure:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Success:
     code: Code
     message: str
@@ -56,9 +114,31 @@ class Success:
 @dataclass
 class Report:
     results: list[Success | Failure]
+    # Hit and miss counters of the persistent fixity cache, when it is enabled
+    fixity_cache: dict[str, int] | None = field(default=None, kw_only=True)
+    # Validation stages that did not run because a stage they require failed
+    skipped_stages: list[str] = field(default_factory=list, kw_only=True)
+    # Whether the validation stopped at the first error, leaving out the remaining results
+    truncated: bool = field(default=False, kw_only=True)
+    # Wall time, CPU time and I/O per stage, when the `timings` option is enabled
+    timings: list[Timing] | None = field(default=None, kw_only=True)
 
     def __add__(self, other: "Report") -> "Report":
-        return Report(results=self.results + other.results)
+        return Report.combine([self, other])
+
+    @classmethod
+    def combine(cls, reports: Iterable["Report"]) -> "Report":
+        "Combines many reports in linear time, where folding them with `+` copies the results over and over."
+        combined = cls(results=[])
+        for report in reports:
+            combined.results.extend(report.results)
+            combined.fixity_cache = combined.fixity_cache or report.fixity_cache
+            combined.skipped_stages.extend(report.skipped_stages)
+            combined.truncated = combined.truncated or report.truncated
+            if report.timings is not None:
+                combined.timings = combined.timings or []
+                combined.timings.extend(report.timings)
+        return combined
 
     @property
     def outcome(self) -> Literal["PASSED", "FAILED"]:
@@ -81,7 +161,7 @@ class Report:
         return (result for result in self.results if isinstance(result, Success))
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        report_dict: dict[str, Any] = {
             "results": [result.to_dict() for result in self.results],
             "errors": [
                 failure.to_dict()
@@ -89,6 +169,15 @@ class Report:
                 if failure.severity == Severity.ERROR
             ],
         }
+        if self.fixity_cache is not None:
+            report_dict["fixity_cache"] = self.fixity_cache
+        if self.skipped_stages:
+            report_dict["skipped_stages"] = self.skipped_stages
+        if self.truncated:
+            report_dict["truncated"] = True
+        if self.timings is not None:
+            report_dict["timings"] = [timing.to_dict() for timing in self.timings]
+        return report_dict
 
 
 class WithSource(Protocol):
@@ -96,6 +185,7 @@ class WithSource(Protocol):
 
 
 T = TypeVar("T", bound=WithSource)
+A = TypeVar("A")
 
 
 @dataclass
@@ -115,7 +205,7 @@ class RuleResult(Generic[T]):
                 report_results.append(
                     Failure(
                         code=self.code,
-                        message=self.fail_msg(fail_item),
+                        message=Message(self.fail_msg, fail_item),
                         severity=Severity.ERROR,
                         source=fail_item.__source__,
                     )
@@ -124,6 +214,16 @@ class RuleResult(Generic[T]):
         return Report(results=report_results)
 
 
+def run_rule(check: Callable[[A], RuleResult[Any] | None], arg: A) -> Report:
+    "Runs a rule and returns its report. The rule is measured when its stage is."
+    with timings.measure_rule(check.__name__) as timing:
+        rule = check(arg)
+        report = rule.to_report() if rule is not None else Report(results=[])
+        if timing is not None:
+            timing.results = len(report.results)
+    return report
+
+
 Ts = TypeVarTuple("Ts")
 
 
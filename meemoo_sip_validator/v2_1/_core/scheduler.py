@@ -0,0 +1,173 @@
+from collections.abc import Callable, Collection, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Literal
+import importlib
+
+from . import timings
+from .cancellation import ValidationCancelled
+from .context import SipContext
+from .report import Report
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    # The stage function, or its "module:function" path. A path is only imported when
+    # the stage runs, so the dependencies of stages that do not run are never imported.
+    run: Callable[[SipContext], Report] | str
+    # Stages that must pass before this stage is worth running
+    requires: tuple[str, ...] = field(default=())
+    # Relative cost of the stage. With `fail_fast`, cheaper stages run first.
+    cost: int = 0
+
+    def load(self) -> Callable[[SipContext], Report]:
+        if not isinstance(self.run, str):
+            return self.run
+        module, name = self.run.split(":")
+        return getattr(importlib.import_module(module), name)
+
+
+def select_stages(
+    stages: Sequence[Stage],
+    only: Collection[str] | None = None,
+    skip: Collection[str] = (),
+) -> list[Stage]:
+    names = {stage.name for stage in stages}
+    unknown = [name for name in [*(only or ()), *skip] if name not in names]
+    if unknown:
+        raise ValueError(
+            f"Unknown validation stage(s): {', '.join(unknown)}. Stages are: {', '.join(names)}."
+        )
+    return [
+        stage
+        for stage in stages
+        if (only is None or stage.name in only) and stage.name not in skip
+    ]
+
+
+@dataclass(frozen=True)
+class StageOutcome:
+    stage: str
+    # "done" with the report of the stage, "skipped" when a stage it requires failed,
+    # or "cancelled" when the stage was stopped or never started because of `fail_fast`.
+    status: Literal["done", "skipped", "cancelled"]
+    report: Report | None = None
+
+
+def run_stage(ctx: SipContext, stage: Stage) -> Report:
+    "Runs the stage, measuring it and its rules with the `timings` option."
+    run = stage.load()
+    if not ctx.options.timings:
+        return run(ctx)
+
+    with timings.measure(stage.name) as timing:
+        report = run(ctx)
+    timing.results = len(report.results)
+    report.timings = [timing]
+    return report
+
+
+def iter_stages(ctx: SipContext, stages: Sequence[Stage]) -> Iterator[StageOutcome]:
+    """
+    Runs the stages on a thread pool, each stage as soon as the stages it requires are done,
+    and yields the outcome of every stage as soon as it is known.
+
+    A stage is skipped when a stage it requires failed or was skipped. Required stages that
+    are not part of `stages` (e.g. not selected by the user) do not hold a stage back.
+
+    With the `fail_fast` option, a stage also waits for all cheaper stages. The first
+    stage that fails cancels the stages that are still running, and the remaining
+    stages do not run.
+
+    The validation is cancelled when the consumer stops iterating early. Closing the
+    iterator waits for the running stages, so it only returns early when they check
+    `ctx.cancellation` (see `Cancellation`).
+    """
+    fail_fast = ctx.options.fail_fast
+    selected = {stage.name for stage in stages}
+    requirements = {
+        stage.name: [
+            *stage.requires,
+            *(other.name for other in stages if fail_fast and other.cost < stage.cost),
+        ]
+        for stage in stages
+    }
+    reports: dict[str, Report] = {}
+    skipped: list[str] = []
+    pending = list(stages)
+    running: dict[Future[Report], Stage] = {}
+
+    def is_settled(name: str) -> bool:
+        return name not in selected or name in reports or name in skipped
+
+    def has_failed(name: str) -> bool:
+        return name in skipped or (name in reports and not reports[name].is_valid)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, len(stages)), thread_name_prefix="stage"
+    ) as pool:
+        try:
+            while pending or running:
+                ready = [
+                    stage
+                    for stage in pending
+                    if all(is_settled(name) for name in requirements[stage.name])
+                ]
+                for stage in ready:
+                    pending.remove(stage)
+                    if any(has_failed(name) for name in stage.requires):
+                        skipped.append(stage.name)
+                        yield StageOutcome(stage.name, "skipped")
+                    else:
+                        # Import the stage here rather than on its thread, so
+                        # stages never import the same modules concurrently.
+                        _ = stage.load()
+                        running[pool.submit(run_stage, ctx, stage)] = stage
+
+                if not running:
+                    if pending and not ready:
+                        raise ValueError(
+                            f"Circular stage requirements: {', '.join(stage.name for stage in pending)}"
+                        )
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        reports[stage.name] = future.result()
+                    except ValidationCancelled:
+                        yield StageOutcome(stage.name, "cancelled")
+                        continue
+                    yield StageOutcome(stage.name, "done", reports[stage.name])
+
+                    if fail_fast and not reports[stage.name].is_valid:
+                        ctx.cancellation.cancel()
+                        for other in pending:
+                            yield StageOutcome(other.name, "cancelled")
+                        pending.clear()
+        finally:
+            if pending or running:
+                # The consumer stopped early, or a stage raised an error.
+                ctx.cancellation.cancel()
+
+
+def run_stages(ctx: SipContext, stages: Sequence[Stage]) -> Report:
+    """
+    Runs the stages with `iter_stages` and combines their reports in the order of
+    `stages`, regardless of the order in which they finish. The report is marked as
+    truncated when `fail_fast` cancelled stages.
+    """
+    outcomes = {outcome.stage: outcome for outcome in iter_stages(ctx, stages)}
+    ordered = [outcomes[stage.name] for stage in stages]
+
+    report = Report.combine(
+        outcome.report for outcome in ordered if outcome.report is not None
+    )
+    report.skipped_stages = [
+        outcome.stage for outcome in ordered if outcome.status == "skipped"
+    ]
+    report.truncated = report.truncated or any(
+        outcome.status == "cancelled" for outcome in ordered
+    )
+    return report
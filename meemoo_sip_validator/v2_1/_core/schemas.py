@@ -0,0 +1,263 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from hashlib import sha256
+from importlib import resources
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import TYPE_CHECKING
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+
+from .utils import Profile, get_cache_home
+
+if TYPE_CHECKING:
+    from xmlschema import XMLSchema
+
+assets = resources.files("meemoo_sip_validator.assets")
+
+mets_xsd_path = str(assets.joinpath("mets-1-12.xsd.xml"))
+premis_xsd_path = str(assets.joinpath("premis-3-0.xsd.xml"))
+xlink_xsd_path = str(assets.joinpath("xlink-2.xsd.xml"))
+basic_xsd_path = str(assets.joinpath("2.1/basic-2-1.xsd.xml"))
+film_xsd_path = str(assets.joinpath("2.1/film-2-1.xsd.xml"))
+material_artwork_xsd_path = str(assets.joinpath("2.1/material-artwork-2-1.xsd.xml"))
+
+# Bump when the layout of the pickled bundle changes.
+BUNDLE_FORMAT_VERSION = 1
+
+
+class Schema(Enum):
+    METS = "mets"
+    PREMIS = "premis"
+    BASIC = "basic"
+    FILM = "film"
+    MATERIAL_ARTWORK = "material-artwork"
+
+
+def get_descriptive_schema(profile: Profile) -> Schema:
+    match profile:
+        case Profile.BASIC:
+            return Schema.BASIC
+        case Profile.FILM:
+            return Schema.FILM
+        case Profile.MATERIAL_ARTWORK:
+            return Schema.MATERIAL_ARTWORK
+
+
+def get_schema_path(schema: Schema) -> str:
+    match schema:
+        case Schema.METS:
+            return mets_xsd_path
+        case Schema.PREMIS:
+            return premis_xsd_path
+        case Schema.BASIC:
+            return basic_xsd_path
+        case Schema.FILM:
+            return film_xsd_path
+        case Schema.MATERIAL_ARTWORK:
+            return material_artwork_xsd_path
+
+
+# Remote schemas that are imported by the bundled schemas, and their local copy
+schema_locations = {
+    "http://www.loc.gov/standards/xlink/xlink.xsd": xlink_xsd_path,
+}
+
+
+def compile_schema(schema: Schema) -> "XMLSchema":
+    # Imported here, as xmlschema is slow to import and not needed when the
+    # schemas are loaded from a bundle or when the XSD stage does not run.
+    from xmlschema import XMLSchema
+
+    if schema == Schema.METS:
+        xlink_location = [("http://www.w3.org/1999/xlink", xlink_xsd_path)]
+        return XMLSchema(mets_xsd_path, locations=xlink_location, allow="local")
+    return XMLSchema(get_schema_path(schema))
+
+
+def get_cache_dir() -> Path | None:
+    if os.environ.get("MEEMOO_SIP_VALIDATOR_NO_SCHEMA_CACHE"):
+        return None
+    return get_cache_home()
+
+
+def get_bundle_key() -> str:
+    """
+    Fingerprint of everything a pickled bundle depends on: the asset files,
+    the xmlschema version and the Python version used to pickle it.
+    """
+    import xmlschema
+
+    digest = sha256()
+    digest.update(f"{BUNDLE_FORMAT_VERSION}".encode())
+    digest.update(xmlschema.__version__.encode())
+    digest.update(f"{sys.version_info.major}.{sys.version_info.minor}".encode())
+
+    def asset_files(directory: Traversable) -> Iterator[Traversable]:
+        for entry in sorted(directory.iterdir(), key=lambda entry: entry.name):
+            if entry.is_dir():
+                yield from asset_files(entry)
+            elif entry.name.endswith(".xml"):
+                yield entry
+
+    for asset in asset_files(assets):
+        digest.update(asset.name.encode())
+        digest.update(asset.read_bytes())
+
+    return digest.hexdigest()[:16]
+
+
+def get_bundle_prefix() -> str:
+    "Bundles with this prefix were pickled by the same Python and xmlschema versions."
+    import xmlschema
+
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    return f"schemas-py{python_version}-xmlschema{xmlschema.__version__}-"
+
+
+def get_bundle_path(cache_dir: Path) -> Path:
+    return cache_dir / f"{get_bundle_prefix()}{get_bundle_key()}.pickle"
+
+
+def load_bundle(cache_dir: Path) -> "dict[Schema, XMLSchema] | None":
+    try:
+        with open(get_bundle_path(cache_dir), "rb") as f:
+            bundle = pickle.load(f)
+    except Exception:
+        # A missing, truncated or otherwise unreadable bundle is rebuilt.
+        return None
+
+    if not isinstance(bundle, dict) or set(bundle) != set(Schema):
+        return None
+    return bundle
+
+
+def save_bundle(cache_dir: Path, schemas: "dict[Schema, XMLSchema]") -> Path | None:
+    bundle_path = get_bundle_path(cache_dir)
+    tmp_path: str | None = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent processes never read a partial bundle.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(schemas, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, bundle_path)
+        tmp_path = None
+    except Exception:
+        # E.g. a full disk or a schema that cannot be pickled: the schemas are
+        # compiled again by the next process.
+        return None
+    finally:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    # Older bundles of the same Python and xmlschema versions are stale. Bundles of
+    # other versions may belong to another environment that shares the cache directory.
+    for stale_bundle in cache_dir.glob(f"{get_bundle_prefix()}*.pickle"):
+        if stale_bundle != bundle_path:
+            stale_bundle.unlink(missing_ok=True)
+
+    return bundle_path
+
+
+@dataclass
+class SchemaRegistryStats:
+    hits: int = 0
+    compilations: int = 0
+    compile_time: float = 0.0  # seconds
+    bundle_loaded: bool = False
+    bundle_load_time: float = 0.0  # seconds
+
+
+class SchemaRegistry:
+    """
+    Compiles each XSD schema once and hands out the compiled schema on every
+    subsequent request. Safe to share between threads.
+
+    When a `cache_dir` is given, the compiled schemas are also persisted to a
+    pickled bundle so that new processes can skip compilation altogether.
+    """
+
+    def __init__(self, cache_dir: Path | None = None):
+        self.cache_dir = cache_dir
+        self._schemas: dict[Schema, XMLSchema] = {}
+        self._bundle_checked = cache_dir is None
+        self._lock = threading.Lock()
+        self.stats = SchemaRegistryStats()
+
+    def get(self, schema: Schema) -> "XMLSchema":
+        with self._lock:
+            if not self._bundle_checked:
+                self._load_or_build_bundle()
+
+            compiled = self._schemas.get(schema)
+            if compiled is not None:
+                self.stats.hits += 1
+                return compiled
+
+            compiled = self._compile(schema)
+            self._schemas[schema] = compiled
+            return compiled
+
+    def warm_up(self, schemas: Iterable[Schema] = tuple(Schema)) -> None:
+        for schema in schemas:
+            with self._lock:
+                if self._bundle_checked and schema in self._schemas:
+                    continue
+            _ = self.get(schema)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+            self._bundle_checked = self.cache_dir is None
+            self.stats = SchemaRegistryStats()
+
+    def _compile(self, schema: Schema) -> "XMLSchema":
+        start = time.perf_counter()
+        compiled = compile_schema(schema)
+        self.stats.compile_time += time.perf_counter() - start
+        self.stats.compilations += 1
+        return compiled
+
+    def _load_or_build_bundle(self) -> None:
+        assert self.cache_dir is not None
+        self._bundle_checked = True
+
+        start = time.perf_counter()
+        bundle = load_bundle(self.cache_dir)
+        if bundle is not None:
+            self._schemas.update(bundle)
+            self.stats.bundle_loaded = True
+            self.stats.bundle_load_time = time.perf_counter() - start
+            return
+
+        # First use for this combination of assets and xmlschema version:
+        # compile everything so the next process finds a complete bundle.
+        for schema in Schema:
+            if schema not in self._schemas:
+                self._schemas[schema] = self._compile(schema)
+        _ = save_bundle(self.cache_dir, self._schemas)
+
+
+registry = SchemaRegistry(cache_dir=get_cache_dir())
+
+
+def get_schema(schema: Schema) -> "XMLSchema":
+    return registry.get(schema)
+
+
+def warm_up() -> None:
+    registry.warm_up()
+
+
+def build_bundle(cache_dir: Path | None = None) -> Path | None:
+    cache_dir = cache_dir or get_cache_dir()
+    if cache_dir is None:
+        return None
+    schemas = {schema: compile_schema(schema) for schema in Schema}
+    return save_bundle(cache_dir, schemas)
@@ -1,10 +1,10 @@
 from pathlib import Path
-from functools import reduce
 from dataclasses import dataclass
 
-from .report import Report, RuleResult
+from .report import Report, RuleResult, run_rule
 from . import utils
 from .codes import Code
+from .context import SipContext
 
 
 @dataclass
@@ -13,9 +13,11 @@ class _Path:
     path: Path
 
 
-def check_descriptive_folder_exists(sip_path: Path) -> RuleResult[_Path]:
-    descriptive_dir = sip_path / "metadata" / "descriptive"
-    invalid_paths = [descriptive_dir] if not descriptive_dir.exists() else []
+def check_descriptive_folder_exists(ctx: SipContext) -> RuleResult[_Path]:
+    descriptive_dir = ctx.sip_path / "metadata" / "descriptive"
+    invalid_paths = (
+        [descriptive_dir] if not ctx.manifest.exists(descriptive_dir) else []
+    )
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -24,12 +26,12 @@ def check_descriptive_folder_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_descriptive_file_exists(sip_path: Path) -> RuleResult[_Path] | None:
-    profile = utils.get_profile(sip_path)
+def check_descriptive_file_exists(ctx: SipContext) -> RuleResult[_Path] | None:
+    profile = ctx.profile
     if profile is None:
         return None
 
-    descriptive_dir = sip_path / "metadata" / "descriptive"
+    descriptive_dir = ctx.sip_path / "metadata" / "descriptive"
     match profile:
         case utils.Profile.BASIC:
             descriptive_file = descriptive_dir / "dc+schema.xml"
@@ -38,7 +40,9 @@ def check_descriptive_file_exists(sip_path: Path) -> RuleResult[_Path] | None:
         case utils.Profile.MATERIAL_ARTWORK:
             descriptive_file = descriptive_dir / "dc+schema.xml"
 
-    invalid_paths = [descriptive_file] if not descriptive_file.exists() else []
+    invalid_paths = (
+        [descriptive_file] if not ctx.manifest.exists(descriptive_file) else []
+    )
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -47,9 +51,11 @@ def check_descriptive_file_exists(sip_path: Path) -> RuleResult[_Path] | None:
     )
 
 
-def check_representations_folder_exists(sip_path: Path) -> RuleResult[_Path]:
-    representations_dir = sip_path / "representations"
-    invalid_paths = [representations_dir] if not representations_dir.exists() else []
+def check_representations_folder_exists(ctx: SipContext) -> RuleResult[_Path]:
+    representations_dir = ctx.sip_path / "representations"
+    invalid_paths = (
+        [representations_dir] if not ctx.manifest.exists(representations_dir) else []
+    )
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -58,12 +64,14 @@ def check_representations_folder_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_at_least_one_repesentation_exists(sip_path: Path) -> RuleResult[_Path] | None:
-    representations_dir = sip_path / "representations"
-    if not representations_dir.exists():
+def check_at_least_one_repesentation_exists(
+    ctx: SipContext,
+) -> RuleResult[_Path] | None:
+    representations_dir = ctx.sip_path / "representations"
+    if not ctx.manifest.exists(representations_dir):
         return None
 
-    representations = list(representations_dir.iterdir())
+    representations = ctx.manifest.iterdir(representations_dir)
     invalid_paths = [representations_dir] if len(representations) < 1 else []
 
     return RuleResult(
@@ -74,9 +82,11 @@ def check_at_least_one_repesentation_exists(sip_path: Path) -> RuleResult[_Path]
     )
 
 
-def check_root_preservation_folder_exists(sip_path: Path) -> RuleResult[_Path]:
-    preservation_dir = sip_path / "metadata" / "preservation"
-    invalid_paths = [preservation_dir] if not preservation_dir.exists() else []
+def check_root_preservation_folder_exists(ctx: SipContext) -> RuleResult[_Path]:
+    preservation_dir = ctx.sip_path / "metadata" / "preservation"
+    invalid_paths = (
+        [preservation_dir] if not ctx.manifest.exists(preservation_dir) else []
+    )
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -85,9 +95,9 @@ def check_root_preservation_folder_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_root_premis_exists(sip_path: Path) -> RuleResult[_Path]:
-    premis_file = sip_path / "metadata" / "preservation" / "premis.xml"
-    invalid_paths = [premis_file] if not premis_file.exists() else []
+def check_root_premis_exists(ctx: SipContext) -> RuleResult[_Path]:
+    premis_file = ctx.sip_path / "metadata" / "preservation" / "premis.xml"
+    invalid_paths = [premis_file] if not ctx.manifest.exists(premis_file) else []
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -96,12 +106,12 @@ def check_root_premis_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_representation_premis_exists(sip_path: Path) -> RuleResult[_Path]:
-    representations = sip_path.joinpath("representations").glob("*")
+def check_representation_premis_exists(ctx: SipContext) -> RuleResult[_Path]:
+    representations = ctx.manifest.iterdir(ctx.sip_path / "representations")
     premises = (
         repr / "metadata" / "preservation" / "premis.xml" for repr in representations
     )
-    invalid_paths = [premis for premis in premises if not premis.exists()]
+    invalid_paths = [premis for premis in premises if not ctx.manifest.exists(premis)]
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -110,10 +120,10 @@ def check_representation_premis_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_representation_mets_exists(sip_path: Path) -> RuleResult[_Path]:
-    representations = sip_path.joinpath("representations").glob("*")
+def check_representation_mets_exists(ctx: SipContext) -> RuleResult[_Path]:
+    representations = ctx.manifest.iterdir(ctx.sip_path / "representations")
     metses = (repr / "METS.xml" for repr in representations)
-    invalid_paths = [mets for mets in metses if not mets.exists()]
+    invalid_paths = [mets for mets in metses if not ctx.manifest.exists(mets)]
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -122,10 +132,12 @@ def check_representation_mets_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_representation_data_exists(sip_path: Path) -> RuleResult[_Path]:
-    representations = sip_path.joinpath("representations").glob("*")
+def check_representation_data_exists(ctx: SipContext) -> RuleResult[_Path]:
+    representations = ctx.manifest.iterdir(ctx.sip_path / "representations")
     data_folders = (repr / "data" for repr in representations)
-    invalid_paths = [folder for folder in data_folders if not folder.exists()]
+    invalid_paths = [
+        folder for folder in data_folders if not ctx.manifest.exists(folder)
+    ]
     return RuleResult(
         code=Code.structure_valid,
         failed_items=[_Path(str(p), p) for p in invalid_paths],
@@ -134,13 +146,15 @@ def check_representation_data_exists(sip_path: Path) -> RuleResult[_Path]:
     )
 
 
-def check_representation_data_contains_file(sip_path: Path) -> RuleResult[_Path]:
-    representations = sip_path.joinpath("representations").glob("*")
+def check_representation_data_contains_file(ctx: SipContext) -> RuleResult[_Path]:
+    representations = ctx.manifest.iterdir(ctx.sip_path / "representations")
     data_folders = [
-        repr / "data" for repr in representations if repr.joinpath("data").exists()
+        repr / "data"
+        for repr in representations
+        if ctx.manifest.exists(repr.joinpath("data"))
     ]
     invalid_paths = [
-        folder for folder in data_folders if len(list(folder.iterdir())) < 1
+        folder for folder in data_folders if len(ctx.manifest.iterdir(folder)) < 1
     ]
     return RuleResult(
         code=Code.structure_valid,
@@ -164,7 +178,5 @@ checks = [
 ]
 
 
-def validate_structural(sip_path: Path) -> Report:
-    rule_results = (check(sip_path) for check in checks)
-    reports = (rule.to_report() for rule in rule_results if rule is not None)
-    return reduce(Report.__add__, reports)
+def validate_structural(ctx: SipContext) -> Report:
+    return Report.combine(run_rule(check, ctx) for check in checks)
@@ -0,0 +1,97 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+import threading
+import time
+
+
+@dataclass
+class Timing:
+    """
+    Wall time, CPU time and I/O of a validation stage or rule.
+
+    CPU time includes the hashing threads that work for the stage. Bytes read and
+    files opened count the XML files parsed and the data files hashed; the first
+    stage that needs a parsed XML file is charged for it.
+    """
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    bytes_read: int = 0
+    files_opened: int = 0
+    results: int = 0
+    rules: list["Timing"] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        timing_dict: dict[str, Any] = {
+            "name": self.name,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "bytes_read": self.bytes_read,
+            "files_opened": self.files_opened,
+            "results": self.results,
+        }
+        if self.rules:
+            timing_dict["rules"] = [rule.to_dict() for rule in self.rules]
+        return timing_dict
+
+
+# The timings that are being measured in the current thread, outermost first.
+_active: ContextVar[tuple[Timing, ...]] = ContextVar("active_timings", default=())
+_lock = threading.Lock()
+
+
+def is_active() -> bool:
+    return bool(_active.get())
+
+
+def record(bytes_read: int = 0, files_opened: int = 0, cpu_time: float = 0.0) -> None:
+    "Adds work to the stage and rule that are being measured, if any."
+    active = _active.get()
+    if not active:
+        return
+    with _lock:
+        for timing in active:
+            timing.bytes_read += bytes_read
+            timing.files_opened += files_opened
+            timing.cpu_time += cpu_time
+
+
+@contextmanager
+def measure(name: str) -> Iterator[Timing]:
+    """
+    Measures the block as a stage, or as a rule of the stage that is being measured.
+    The CPU time of the current thread is only added to the innermost timing, as it
+    is already part of the thread time of the outer ones. Work in other threads is
+    counted when it is `record`ed from a copy of this context.
+    """
+    active = _active.get()
+    timing = Timing(name)
+    if active:
+        with _lock:
+            active[-1].rules.append(timing)
+
+    token = _active.set((*active, timing))
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield timing
+    finally:
+        cpu_time = time.thread_time() - cpu_start
+        _active.reset(token)
+        with _lock:
+            timing.wall_time = time.perf_counter() - wall_start
+            timing.cpu_time += cpu_time
+
+
+@contextmanager
+def measure_rule(name: str) -> Iterator[Timing | None]:
+    "Measures a rule when its stage is being measured, otherwise does nothing."
+    if not _active.get():
+        yield None
+        return
+    with measure(name) as timing:
+        yield timing
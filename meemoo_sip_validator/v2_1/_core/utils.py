@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 import xml.etree.ElementTree as ET
 from enum import Enum
 
@@ -22,10 +23,24 @@ def get_profile(sip_path: Path) -> Profile | None:
         mets_root = ET.parse(root_mets_path).getroot()
     except Exception:
         return None
+    return get_profile_from_root(mets_root)
 
+
+def get_profile_from_root(mets_root: ET.Element) -> Profile | None:
     profile = mets_root.get(
         "{https://DILCIS.eu/XML/METS/CSIPExtensionMETS}OTHERCONTENTINFORMATIONTYPE"
     )
     if profile not in profiles:
         return None
     return Profile(profile)
+
+
+def get_cache_home() -> Path:
+    cache_dir = os.environ.get("MEEMOO_SIP_VALIDATOR_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "meemoo-sip-validator"
+    return Path.home() / ".cache" / "meemoo-sip-validator"
@@ -1,46 +1,108 @@
+from collections.abc import Iterator
 from typing import Any, Callable
 from pathlib import Path
 
 
 from .report import Report, Failure, Severity
-from . import xsd, codes, utils, commons_ip, structural
-from .premis.premis import validate_premis
-from .descriptive.dc_schema import validate_dc_schema
+from . import codes, utils
+from .context import SipContext
+from .options import ValidationOptions
+from .scheduler import Stage, StageOutcome, iter_stages, run_stages, select_stages
 
+# The stages are imported when they run: xmlschema, edtf-validate, the
+# eark-models and py-commons-ip take most of the startup time otherwise.
+premis_stages = f"{__package__}.premis.premis"
 
-def _validate(sip_path: Path) -> Report:
-    profile = utils.get_profile(sip_path)
-    if profile is None:
-        validate_descriptive = get_profile_failure_report
-    else:
-        validate_descriptive = get_descriptive_validation_fn(profile)
-
-    return (
-        structural.validate_structural(sip_path)
-        + commons_ip.validate_commons_ip(sip_path)
-        + xsd.validate_xsd(sip_path)
-        + validate_premis(sip_path)
-        + validate_descriptive(sip_path)
-    )
+
+def get_stages() -> list[Stage]:
+    # Costs are relative: the metadata stages are cheap, commons-ip (a JVM) and fixity
+    # (reading all data) are expensive. They only matter with `fail_fast`.
+    return [
+        Stage("structural", f"{__package__}.structural:validate_structural", cost=1),
+        Stage("commons-ip", f"{__package__}.commons_ip:validate_commons_ip", cost=5),
+        Stage("profile", validate_profile, cost=0),
+        Stage("xsd", f"{__package__}.xsd:validate_xsd", requires=("profile",), cost=4),
+        Stage("premis", f"{premis_stages}:validate_premis", cost=3),
+        Stage("file-references", f"{premis_stages}:validate_file_references", cost=2),
+        # The fixity rule skips the files without data itself, so a missing file does
+        # not hide the digest mismatches of the other files.
+        Stage("fixity", f"{premis_stages}:validate_fixity", cost=5),
+        Stage("descriptive", validate_descriptive, requires=("profile",), cost=3),
+    ]
+
+
+def get_selected_stages(ctx: SipContext) -> list[Stage]:
+    return select_stages(get_stages(), ctx.options.only_stages, ctx.options.skip_stages)
+
+
+def load_stages(options: ValidationOptions | None = None) -> None:
+    """
+    Imports the selected stages now instead of when they first run, e.g. in a
+    worker process before it validates its first SIP or before it is forked.
+    """
+    options = options or ValidationOptions()
+    for stage in select_stages(get_stages(), options.only_stages, options.skip_stages):
+        _ = stage.load()
+
+
+def _validate(sip_path: Path, options: ValidationOptions | None) -> Report:
+    with SipContext(sip_path, options) as ctx:
+        report = run_stages(ctx, get_selected_stages(ctx))
+
+        if ctx.options.fixity_cache is not None:
+            report.fixity_cache = ctx.fixity_cache_stats.to_dict()
+        return report
 
 
-def validate_to_report(sip_path: Path) -> Report:
-    return _validate(sip_path.expanduser().resolve())
+def validate_to_report(
+    sip_path: Path, options: ValidationOptions | None = None
+) -> Report:
+    return _validate(sip_path.expanduser().resolve(), options)
 
 
-def validate(sip_path: Path) -> tuple[bool, dict[str, Any]]:
-    report = validate_to_report(sip_path)
+def iter_validation(
+    sip_path: Path, options: ValidationOptions | None = None
+) -> Iterator[StageOutcome]:
+    """
+    Validates the SIP and yields the outcome of every stage as soon as the stage is done,
+    so the results of the cheap stages are available long before the fixity check is.
+    Stopping the iteration cancels the stages that are still running: commons-ip is
+    killed and the other stages stop at their next cancellation check. Closing the
+    iterator returns once they have stopped.
+    """
+    with SipContext(sip_path.expanduser().resolve(), options) as ctx:
+        yield from iter_stages(ctx, get_selected_stages(ctx))
+
+
+def validate(
+    sip_path: Path, options: ValidationOptions | None = None
+) -> tuple[bool, dict[str, Any]]:
+    report = validate_to_report(sip_path, options)
     return report.is_valid, report.to_dict()
 
 
-def get_profile_failure_report(sip_path: Path) -> Report:
+def validate_profile(ctx: SipContext) -> Report:
+    "Whether the profile of the SIP can be determined from the root METS."
+    if ctx.profile is None:
+        return get_profile_failure_report(ctx)
+    return Report(results=[])
+
+
+def validate_descriptive(ctx: SipContext) -> Report:
+    profile = ctx.profile
+    if profile is None:
+        return get_profile_failure_report(ctx)
+    return get_descriptive_validation_fn(profile)(ctx)
+
+
+def get_profile_failure_report(ctx: SipContext) -> Report:
     return Report(
         results=[
             Failure(
                 code=codes.Code.mets_other_content_information_type,
                 message="The root mets must contain the csip:OTHERCONTENTINFORMATIONTYPE attribute indicating the profile ot the SIP.",
                 severity=Severity.ERROR,
-                source=str(sip_path / "METS.xml"),
+                source=str(ctx.root_mets_path),
             ),
         ]
     )
@@ -48,7 +110,9 @@ def get_profile_failure_report(sip_path: Path) -> Report:
 
 def get_descriptive_validation_fn(
     profile: utils.Profile,
-) -> Callable[[Path], Report]:
+) -> Callable[[SipContext], Report]:
+    from .descriptive.dc_schema import validate_dc_schema
+
     match profile:
         case utils.Profile.BASIC:
             return validate_dc_schema
@@ -56,3 +120,6 @@ def get_descriptive_validation_fn(
             return validate_dc_schema
         case utils.Profile.MATERIAL_ARTWORK:
             return validate_dc_schema
+
+
+stage_names = [stage.name for stage in get_stages()]
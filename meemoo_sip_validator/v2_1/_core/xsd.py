@@ -1,30 +1,120 @@
-from importlib import resources
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import CancelledError, Future
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
-from xmlschema import XMLSchema, XMLSchemaException
-
 from .report import Report, Success, Failure, Severity
-from .utils import Profile, get_profile
+from .utils import Profile
 from .codes import Code
-
-assets = resources.files("meemoo_sip_validator.assets")
-
-mets_xsd_path = str(assets.joinpath("mets-1-12.xsd.xml"))
-premis_xsd_path = str(assets.joinpath("premis-3-0.xsd.xml"))
-xlink_xsd_path = str(assets.joinpath("xlink-2.xsd.xml"))
-basic_xsd_path = str(assets.joinpath("2.1/basic-2-1.xsd.xml"))
-film_xsd_path = str(assets.joinpath("2.1/film-2-1.xsd.xml"))
-material_artwork_xsd_path = str(assets.joinpath("2.1/material-artwork-2-1.xsd.xml"))
-
-
-def validate_files_with_xsd(paths: list[Path], schema: XMLSchema) -> Report:
-    code = Code.xsd_valid
-    failures: list[Failure | Success] = []
+from .context import SipContext
+from .schemas import Schema, get_descriptive_schema, get_schema_path
+from .xsd_engines import get_schema_validator
+from . import xsd_pool
+
+
+def is_streamed(ctx: SipContext, schema: Schema) -> bool:
+    "Whether the files are validated lazily, see `ValidationOptions.stream_premis`."
+    return ctx.options.stream_premis and schema == Schema.PREMIS
+
+
+def iter_errors(
+    ctx: SipContext, paths: list[Path], schema: Schema
+) -> Iterator[tuple[Path, str | None]]:
+    "The first XSD error of every file, or None when the file is valid, in the order of `paths`."
+    workers = max(1, min(ctx.options.xsd_workers, ctx.options.max_workers))
+    pool = (
+        xsd_pool.get_pool(workers, ctx.options.xsd_engine)
+        if ctx.options.xsd_workers > 0 and len(paths) > 1
+        else None
+    )
+    if pool is None:
+        yield from iter_errors_in_thread(ctx, paths, schema)
+        return
+
+    done = 0
+    try:
+        for path, error in iter_errors_in_pool(ctx, pool, paths, schema):
+            yield path, error
+            done += 1
+    except BrokenProcessPool:
+        # The workers could not start, e.g. because the main module of a script that
+        # is not guarded by `if __name__ == "__main__"` cannot be imported again.
+        xsd_pool.discard_pool(pool)
+        yield from iter_errors_in_thread(ctx, paths[done:], schema)
+
+
+def iter_errors_in_thread(
+    ctx: SipContext, paths: list[Path], schema: Schema
+) -> Iterator[tuple[Path, str | None]]:
+    validator = get_schema_validator(ctx.options.xsd_engine, schema)
+    streamed = is_streamed(ctx, schema)
     for path in paths:
+        ctx.cancellation.raise_if_cancelled()
+        with ctx.worker_slots:
+            if streamed:
+                error = validator.validate_file(path, lazy=True)
+            else:
+                error = validator.validate(ctx, path)
+        yield path, error
+
+
+def iter_errors_in_pool(
+    ctx: SipContext, pool: xsd_pool.XsdPool, paths: list[Path], schema: Schema
+) -> Iterator[tuple[Path, str | None]]:
+    """
+    Validates the files on the XSD pool. Every file in flight takes one of the worker
+    slots of the process, so the XSD pool and the hashing threads share `max_workers`.
+    Files that have not started yet are cancelled when the iteration stops early.
+    """
+    pending: deque[tuple[Path, Future[str | None]]] = deque()
+
+    def cancel_pending() -> None:
+        for _, future in list(pending):
+            _ = future.cancel()
+
+    def result(future: Future[str | None]) -> str | None:
         try:
-            schema.validate(path)
-        except XMLSchemaException as e:
-            message = f"XSD validation failed on {path} - {e}"
+            return future.result()
+        except CancelledError:
+            ctx.cancellation.raise_if_cancelled()
+            raise
+
+    try:
+        with ctx.cancellation.on_cancel(cancel_pending):
+            for path in paths:
+                ctx.worker_slots.acquire()
+                try:
+                    ctx.cancellation.raise_if_cancelled()
+                    future = pool.submit(schema, path, is_streamed(ctx, schema))
+                except BaseException:
+                    ctx.worker_slots.release()
+                    raise
+                future.add_done_callback(lambda _: ctx.worker_slots.release())
+                pending.append((path, future))
+
+                while pending and pending[0][1].done():
+                    path, future = pending.popleft()
+                    yield path, result(future)
+
+            while pending:
+                path, future = pending[0]
+                error = result(future)
+                _ = pending.popleft()
+                yield path, error
+    finally:
+        cancel_pending()
+
+
+def validate_files_with_xsd(
+    ctx: SipContext, paths: list[Path], schema: Schema
+) -> Report:
+    code = Code.xsd_valid
+    failures: list[Failure | Success] = []
+    errors = iter_errors(ctx, paths, schema)
+    for index, (path, error) in enumerate(errors):
+        if error is not None:
+            message = f"XSD validation failed on {path} - {error}"
             failures.append(
                 Failure(
                     source=str(path),
@@ -33,58 +123,47 @@ def validate_files_with_xsd(paths: list[Path], schema: XMLSchema) -> Report:
                     severity=Severity.ERROR,
                 )
             )
+            if ctx.options.fail_fast and index < len(paths) - 1:
+                errors.close()
+                return Report(results=failures, truncated=True)
 
     if len(failures) != 0:
         return Report(results=failures)
 
-    message = f"Structural XML files validated using XSD: {schema.name}"
+    schema_name = Path(get_schema_path(schema)).name
+    message = f"Structural XML files validated using XSD: {schema_name}"
     return Report(results=[Success(code=code, message=message)])
 
 
-def validate_mets(sip_path: Path) -> Report:
-    xlink_location = [("http://www.w3.org/1999/xlink", xlink_xsd_path)]
-    mets_xsd = XMLSchema(mets_xsd_path, locations=xlink_location, allow="local")
-    mets_files = list(sip_path.rglob("METS.xml"))
-    mets_report = validate_files_with_xsd(mets_files, mets_xsd)
-
-    return mets_report
-
+def validate_mets(ctx: SipContext) -> Report:
+    return validate_files_with_xsd(ctx, ctx.mets_paths, Schema.METS)
 
-def validate_preservation(sip_path: Path) -> Report:
-    premis_xsd = XMLSchema(premis_xsd_path)
-    premis_files = list(sip_path.rglob("premis.xml"))
-    premis_report = validate_files_with_xsd(premis_files, premis_xsd)
 
-    return premis_report
+def validate_preservation(ctx: SipContext) -> Report:
+    return validate_files_with_xsd(ctx, ctx.premis_paths, Schema.PREMIS)
 
 
-def validate_descriptive(sip_path: Path, profile: Profile) -> Report:
-    basic_xsd = XMLSchema(basic_xsd_path)
-    film_xsd = XMLSchema(film_xsd_path)
-    material_xsd = XMLSchema(material_artwork_xsd_path)
+def validate_descriptive(ctx: SipContext, profile: Profile) -> Report:
+    descriptive_schema = get_descriptive_schema(profile)
+    return validate_files_with_xsd(ctx, ctx.descriptive_paths, descriptive_schema)
 
-    descriptive_files = list(sip_path.rglob("dc+schema.xml"))
 
-    match profile:
-        case Profile.BASIC:
-            return validate_files_with_xsd(descriptive_files, basic_xsd)
-        case Profile.FILM:
-            return validate_files_with_xsd(descriptive_files, film_xsd)
-        case Profile.MATERIAL_ARTWORK:
-            return validate_files_with_xsd(descriptive_files, material_xsd)
-
-
-def validate_xsd(sip_path: Path) -> Report:
-    profile = get_profile(sip_path)
+def validate_xsd(ctx: SipContext) -> Report:
+    profile = ctx.profile
     if profile is None:
-        return get_profile_failure_report(sip_path)
-    profile = Profile(profile)
-
-    return (
-        validate_mets(sip_path)
-        + validate_preservation(sip_path)
-        + validate_descriptive(sip_path, profile)
-    )
+        return get_profile_failure_report(ctx.sip_path)
+
+    reports: list[Report] = []
+    for validate_files in (
+        validate_mets,
+        validate_preservation,
+        lambda ctx: validate_descriptive(ctx, profile),
+    ):
+        if ctx.options.fail_fast and not all(report.is_valid for report in reports):
+            reports[-1].truncated = True
+            break
+        reports.append(validate_files(ctx))
+    return Report.combine(reports)
 
 
 def get_profile_failure_report(sip_path: Path):
@@ -0,0 +1,155 @@
+from collections.abc import Callable
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+import threading
+import xml.etree.ElementTree as ET
+
+from . import timings
+from .schemas import Schema, get_schema, get_schema_path, schema_locations
+from .utils import ValidatorError
+
+if TYPE_CHECKING:
+    from xmlschema import XMLSchema
+
+    from .context import SipContext, XMLDocument
+
+
+class XsdEngine(str, Enum):
+    # Pure Python, always available.
+    XMLSCHEMA = "xmlschema"
+    # libxml2, much faster on large documents. Needs the `lxml` extra.
+    LXML = "lxml"
+
+
+class SchemaValidator(Protocol):
+    # File name of the schema
+    name: str
+
+    def validate(self, ctx: "SipContext", path: Path) -> str | None:
+        "The first reason why the document is not valid, or None when it is valid."
+        ...
+
+    def validate_file(self, path: Path, lazy: bool = False) -> str | None:
+        """
+        Like `validate`, outside of a validation, e.g. in another process. When `lazy`,
+        the engine does not hold the whole document in memory, if it is able to.
+        """
+        ...
+
+
+class XmlschemaValidator:
+    def __init__(self, schema: Schema):
+        self.schema: XMLSchema = get_schema(schema)
+        self.name = Path(get_schema_path(schema)).name
+
+    def validate(self, ctx: "SipContext", path: Path) -> str | None:
+        # Reuses the document that the other stages parse as well.
+        try:
+            return self._validate(lambda: ctx.document(path))
+        finally:
+            ctx.release_document(path)
+
+    def validate_file(self, path: Path, lazy: bool = False) -> str | None:
+        from .context import parse_document
+
+        if lazy:
+            return self._validate_lazy(path)
+        return self._validate(lambda: parse_document(path))
+
+    def _validate(self, parse: Callable[[], "XMLDocument"]) -> str | None:
+        from xmlschema import XMLSchemaException
+
+        try:
+            document = parse()
+            self.schema.validate(document.tree, namespaces=document.namespaces)
+        except (XMLSchemaException, ET.ParseError, OSError) as e:
+            return str(e)
+        return None
+
+    def _validate_lazy(self, path: Path) -> str | None:
+        "Validates the document while it is parsed, dropping the elements that are done."
+        from xmlschema import XMLResource, XMLSchemaException
+
+        try:
+            if timings.is_active():
+                timings.record(bytes_read=path.stat().st_size, files_opened=1)
+            self.schema.validate(XMLResource(str(path), lazy=True))
+        except (XMLSchemaException, ET.ParseError, OSError) as e:
+            return str(e)
+        return None
+
+
+# lxml schemas must not be used by several threads at the same time. They only take
+# a few milliseconds to compile, so every thread compiles its own.
+_lxml_schemas = threading.local()
+
+
+def get_lxml_schema(schema: Schema) -> Any:
+    from lxml import etree
+
+    if not hasattr(_lxml_schemas, "compiled"):
+        _lxml_schemas.compiled = {}
+    compiled: dict[Schema, etree.XMLSchema] = _lxml_schemas.compiled
+    if schema not in compiled:
+        compiled[schema] = etree.XMLSchema(
+            etree.parse(get_schema_path(schema), get_lxml_parser())
+        )
+    return compiled[schema]
+
+
+def get_lxml_parser() -> Any:
+    from lxml import etree
+
+    class LocalSchemaResolver(etree.Resolver):
+        def resolve(self, system_url: str, public_id: str, context: Any) -> Any:
+            if system_url in schema_locations:
+                return self.resolve_filename(schema_locations[system_url], context)
+            return None
+
+    parser = etree.XMLParser(no_network=True, resolve_entities=False)
+    parser.resolvers.add(LocalSchemaResolver())
+    return parser
+
+
+class LxmlValidator:
+    def __init__(self, schema: Schema):
+        try:
+            from lxml import etree
+        except ImportError:
+            raise ValidatorError(
+                "The lxml XSD engine needs lxml: pip install 'meemoo-sip-validator[lxml]'."
+            ) from None
+
+        self._etree = etree
+        self.schema = get_lxml_schema(schema)
+        self.name = Path(get_schema_path(schema)).name
+
+    def validate(self, ctx: "SipContext", path: Path) -> str | None:
+        return self.validate_file(path)
+
+    def validate_file(self, path: Path, lazy: bool = False) -> str | None:
+        # libxml2 only reports the line of an error when it validates a whole tree. Its
+        # trees are compact and never shared with the other stages, so `lazy` is ignored.
+        etree = self._etree
+        try:
+            if timings.is_active():
+                timings.record(bytes_read=path.stat().st_size, files_opened=1)
+            tree = etree.parse(
+                path, etree.XMLParser(no_network=True, resolve_entities=False)
+            )
+        except (etree.XMLSyntaxError, OSError) as e:
+            return str(e)
+
+        if self.schema.validate(tree):
+            return None
+        error = self.schema.error_log[0]
+        return f"{error.message} (line {error.line})"
+
+
+def get_schema_validator(engine: XsdEngine, schema: Schema) -> SchemaValidator:
+    match engine:
+        case XsdEngine.XMLSCHEMA:
+            return XmlschemaValidator(schema)
+        case XsdEngine.LXML:
+            return LxmlValidator(schema)
@@ -0,0 +1,84 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import util
+from pathlib import Path
+import multiprocessing
+import threading
+
+from .schemas import Schema
+from .xsd_engines import XsdEngine, get_schema_validator
+
+
+def init_worker(engine: XsdEngine) -> None:
+    # Load or compile all schemas before the first file arrives.
+    for schema in Schema:
+        _ = get_schema_validator(engine, schema)
+
+
+def validate_file(
+    engine: XsdEngine, schema: Schema, path: Path, lazy: bool
+) -> str | None:
+    "Runs in a worker process."
+    return get_schema_validator(engine, schema).validate_file(path, lazy)
+
+
+class XsdPool:
+    """
+    Worker processes that validate XML files against the XSD schemas, with the schemas
+    of `engine` loaded upfront. xmlschema holds the GIL, so the files of a SIP can only
+    be validated in parallel in separate processes.
+    """
+
+    def __init__(self, workers: int, engine: XsdEngine):
+        self.workers = workers
+        self.engine = engine
+        # Not forked, as the validation that starts the pool runs its stages on threads.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(engine,),
+        )
+
+    def submit(
+        self, schema: Schema, path: Path, lazy: bool = False
+    ) -> Future[str | None]:
+        return self._executor.submit(validate_file, self.engine, schema, path, lazy)
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+
+_pools: dict[tuple[int, XsdEngine], XsdPool] = {}
+# Pools whose workers could not start, see `discard_pool`
+_broken: set[tuple[int, XsdEngine]] = set()
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers: int, engine: XsdEngine) -> XsdPool | None:
+    """
+    The XSD pool of this process for the given size and engine, created on first use
+    and closed at exit. None when the workers of such a pool could not be started.
+    """
+    key = (workers, engine)
+    with _pools_lock:
+        if key in _broken:
+            return None
+        if key not in _pools:
+            pool = XsdPool(workers, engine)
+            # Unlike `atexit`, also runs when a worker process of a batch exits, which
+            # would otherwise wait for the processes of the pool forever. Runs before
+            # the queues of the pool are closed (priority 10), which would lose the
+            # shutdown messages to the processes.
+            _ = util.Finalize(pool, pool.close, exitpriority=20)
+            _pools[key] = pool
+        return _pools[key]
+
+
+def discard_pool(pool: XsdPool) -> None:
+    "Closes a broken pool. Later validations with the same settings do not use a pool."
+    key = (pool.workers, pool.engine)
+    with _pools_lock:
+        if _pools.get(key) is pool:
+            del _pools[key]
+        _broken.add(key)
+    pool.close()
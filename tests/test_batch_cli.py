@@ -0,0 +1,68 @@
+import io
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from meemoo_sip_validator._cli import batch
+
+
+def get_report(outcome: str) -> MagicMock:
+    report = MagicMock()
+    report.outcome = outcome
+    report.to_dict.return_value = {"results": [], "errors": []}
+    return report
+
+
+def fake_validate(path: Path) -> MagicMock:
+    if path.name == "broken":
+        raise RuntimeError("boom")
+    return get_report("PASSED" if path.name == "valid" else "FAILED")
+
+
+@patch.object(batch, "init_worker")
+@patch.object(batch, "get_validator_fn", return_value=fake_validate)
+def test_run_batch_writes_json_lines(_: MagicMock, init_mock: MagicMock):
+    out = io.StringIO()
+    paths = [Path("valid"), Path("invalid"), Path("broken")]
+
+    counts = batch.run_batch("2.1", paths, jobs=1, out=out)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(record["path"], record["outcome"]) for record in records] == [
+        ("valid", "PASSED"),
+        ("invalid", "FAILED"),
+        ("broken", "ERROR"),
+    ]
+    assert records[2]["error"] == "boom"
+    assert counts == {"PASSED": 1, "FAILED": 1, "ERROR": 1}
+    assert batch.get_exit_status(counts) == batch.EXIT_SOME_ERRORS
+    assert init_mock.call_count == 1
+
+
+def test_exit_status():
+    assert batch.get_exit_status({"PASSED": 2, "FAILED": 0, "ERROR": 0}) == 0
+    assert batch.get_exit_status({"PASSED": 1, "FAILED": 1, "ERROR": 0}) == 1
+
+
+def test_get_sip_paths(tmp_path: Path):
+    paths_file = tmp_path / "paths.txt"
+    paths_file.write_text("a\n\n  b  \n")
+
+    args = batch.get_parser().parse_args(["2.1", "c", "--paths-from", str(paths_file)])
+    assert batch.get_sip_paths(args) == [Path("c"), Path("a"), Path("b")]
+
+    args = batch.get_parser().parse_args(["2.1"])
+    with patch.object(batch.sys, "stdin", io.StringIO("d\ne\n")):
+        assert batch.get_sip_paths(args) == [Path("d"), Path("e")]
+
+
+@patch.object(batch.os, "cpu_count", return_value=8)
+def test_get_options_shares_cpus_between_jobs(_: MagicMock):
+    args = batch.get_parser().parse_args(["2.1", "--jobs", "4", "--xsd-workers", "4"])
+    assert batch.get_options(args)["max_workers"] == 2
+
+    args = batch.get_parser().parse_args(["2.1", "--jobs", "16"])
+    assert batch.get_options(args)["max_workers"] == 1
+
+    args = batch.get_parser().parse_args(["2.1", "--jobs", "4", "--max-workers", "3"])
+    assert batch.get_options(args)["max_workers"] == 3
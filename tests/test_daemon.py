@@ -0,0 +1,113 @@
+import json
+import socket
+import threading
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.sip_generator import SipSpec, generate_sip
+
+from meemoo_sip_validator._cli.daemon import (
+    UnixHTTPConnection,
+    ValidationHTTPServer,
+    ValidationService,
+    ValidationUnixServer,
+)
+
+
+def get_service(record: dict[str, Any] | None) -> MagicMock:
+    service = MagicMock()
+    service.workers = 2
+    service.validate.return_value = record
+    return service
+
+
+def post(connection: HTTPConnection, body: str) -> tuple[int, dict[str, Any]]:
+    connection.request("POST", "/validate", body=body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_http_server():
+    record = {"path": "/sip", "outcome": "PASSED", "report": {}}
+    service = get_service(record)
+    server = ValidationHTTPServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        connection = HTTPConnection("127.0.0.1", server.server_address[1])
+        status, body = post(connection, json.dumps({"version": "2.1", "path": "/sip"}))
+        assert (status, body) == (200, record)
+        service.validate.assert_called_once_with("2.1", Path("/sip"))
+
+        assert post(connection, "not json")[0] == 400
+        assert (
+            post(connection, json.dumps({"version": "1.0", "path": "/sip"}))[0] == 400
+        )
+
+        service.validate.return_value = None
+        assert post(connection, json.dumps({"path": "/sip"}))[0] == 503
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_unix_server(tmp_path: Path):
+    socket_path = str(tmp_path / "validator.sock")
+    server = ValidationUnixServer(socket_path, get_service(None))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        connection = UnixHTTPConnection(socket_path)
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        assert json.loads(response.read()) == {"status": "ok", "workers": 2}
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert not Path(socket_path).exists()
+
+
+def test_unix_server_replaces_a_stale_socket(tmp_path: Path):
+    socket_path = str(tmp_path / "validator.sock")
+    # Left behind by a daemon that crashed: the file exists, nothing listens on it.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(socket_path)
+
+    server = ValidationUnixServer(socket_path, get_service(None))
+    try:
+        # A socket that a daemon listens on is not taken over.
+        with pytest.raises(OSError):
+            _ = ValidationUnixServer(socket_path, get_service(None))
+    finally:
+        server.server_close()
+
+
+def test_service_validates_a_sip(tmp_path: Path):
+    sip_path = generate_sip(tmp_path / "sips", SipSpec(files=2))
+    socket_path = str(tmp_path / "validator.sock")
+    service = ValidationService(
+        workers=1, max_pending=1, options={"skip_stages": ("commons-ip",)}
+    )
+    server = ValidationUnixServer(socket_path, service)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        connection = UnixHTTPConnection(socket_path)
+        status, record = post(
+            connection, json.dumps({"version": "2.1", "path": str(sip_path)})
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+        service.shutdown()
+
+    assert status == 200
+    assert record["path"] == str(sip_path)
+    assert record["outcome"] == "PASSED", record
@@ -0,0 +1,62 @@
+from pathlib import Path
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Slow to import, and only needed by the stages that use them
+HEAVY_MODULES = [
+    "xmlschema",
+    "eark_models",
+    "pydantic",
+    "edtf_validate",
+    "py_commons_ip",
+]
+
+# Cumulative import time in seconds. Importing all stages takes over a second.
+IMPORT_TIME_BUDGET = 0.5
+
+root = Path(__file__).parent.parent
+
+
+def import_times(module: str) -> dict[str, float]:
+    "The cumulative import time in seconds of `module` and every module it imports."
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": str(root)},
+    )
+    times: dict[str, float] = {}
+    # import time: <self [us]> | <cumulative [us]> | <module>
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "meemoo_sip_validator.v2_1",
+        "meemoo_sip_validator._cli.validator",
+        "meemoo_sip_validator._cli.batch",
+    ],
+)
+def test_heavy_dependencies_are_not_imported(module: str):
+    times = import_times(module)
+
+    assert module in times
+    assert [name for name in times if name.split(".")[0] in HEAVY_MODULES] == []
+    assert times[module] < IMPORT_TIME_BUDGET
+
+
+def test_stages_are_imported_when_loaded():
+    from meemoo_sip_validator.v2_1._core.validate import get_stages
+
+    for stage in get_stages():
+        assert callable(stage.load())
@@ -0,0 +1,36 @@
+from benchmarks.regression import compare
+
+
+def measurement(total: float, premis: float, max_rss: int) -> dict[str, object]:
+    return {
+        "wall_time": total,
+        "stages": {"premis": {"wall_time": premis, "cpu_time": premis}},
+        "max_rss": max_rss,
+    }
+
+
+def test_compare_with_baseline():
+    baseline = {
+        "sip": measurement(total=1.0, premis=0.01, max_rss=100_000),
+        "removed-sip": measurement(total=1.0, premis=0.01, max_rss=100_000),
+    }
+    current = {
+        "sip": measurement(total=2.0, premis=0.03, max_rss=110_000),
+        "new-sip": measurement(total=1.0, premis=0.01, max_rss=100_000),
+    }
+
+    rows = compare(
+        baseline, current, time_threshold=1.5, rss_threshold=1.25, min_time=0.05
+    )
+    statuses = {(row["sip"], row["metric"]): row["status"] for row in rows}
+
+    assert statuses == {
+        ("sip", "total"): "REGRESSION",
+        # Three times slower, but only by 20ms
+        ("sip", "stage:premis"): "OK",
+        ("sip", "max_rss"): "OK",
+        ("new-sip", "total"): "NEW",
+        ("new-sip", "stage:premis"): "NEW",
+        ("new-sip", "max_rss"): "NEW",
+        ("removed-sip", "total"): "MISSING",
+    }
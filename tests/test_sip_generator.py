@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.sip_generator import PROFILES, SipSpec, generate_sip
+from meemoo_sip_validator.v2_1 import ValidationOptions, validate_to_report
+
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_generated_sips_are_valid(tmp_path: Path, profile: str):
+    spec = SipSpec(
+        profile=profile,
+        representations=2,
+        files=3,
+        events_per_file=2,
+        relationships_per_file=2,
+        agents=2,
+    )
+    sip_path = generate_sip(tmp_path, spec)
+
+    report = validate_to_report(
+        sip_path, ValidationOptions(skip_stages=("commons-ip",))
+    )
+
+    assert [failure.to_dict() for failure in report.failures] == []
+    assert report.skipped_stages == []
+
+
+def test_generated_sips_are_reproducible(tmp_path: Path):
+    first = generate_sip(tmp_path / "first", SipSpec(seed=1))
+    second = generate_sip(tmp_path / "second", SipSpec(seed=1))
+
+    assert first.name == second.name
+    assert (first / "metadata/preservation/premis.xml").read_text() == (
+        second / "metadata/preservation/premis.xml"
+    ).read_text()
@@ -0,0 +1,152 @@
+import json
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import py_commons_ip
+import pytest
+
+from benchmarks.sip_generator import SipSpec, generate_sip
+
+from meemoo_sip_validator.v2_1._core import commons_ip
+from meemoo_sip_validator.v2_1._core.cancellation import (
+    Cancellation,
+    ValidationCancelled,
+)
+from meemoo_sip_validator.v2_1._core.commons_ip_pool import CommonsIPPool
+from meemoo_sip_validator.v2_1._core.context import SipContext
+
+# Speaks the protocol of `CommonsIPWorker.java`
+fake_worker = """
+import json, os, sys, time
+
+for line in sys.stdin:
+    version, path = line.rstrip("\\n").split("\\t", 1)
+    if path.endswith("crash"):
+        sys.exit(1)
+    if path.endswith("hang"):
+        time.sleep(60)
+    output = json.dumps({"summary": {"result": "VALID"}, "pid": os.getpid(), "path": path})
+    data = output.encode()
+    sys.stdout.buffer.write(f"RESULT 0 {len(data)}\\n".encode() + data)
+    sys.stdout.buffer.flush()
+"""
+
+
+def get_pool(tmp_path: Path, workers: int, max_jobs_per_worker: int) -> CommonsIPPool:
+    script = tmp_path / "fake_worker.py"
+    script.write_text(fake_worker)
+    return CommonsIPPool(workers, max_jobs_per_worker, [sys.executable, str(script)])
+
+
+def test_pool_reuses_and_restarts_workers(tmp_path: Path):
+    pool = get_pool(tmp_path, workers=1, max_jobs_per_worker=2)
+    try:
+        outputs = [json.loads(pool.validate(Path(f"sip-{i}"))[1]) for i in range(3)]
+    finally:
+        pool.close()
+
+    assert [output["path"] for output in outputs] == ["sip-0", "sip-1", "sip-2"]
+    pids = [output["pid"] for output in outputs]
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+
+
+def test_pool_recovers_from_crashes(tmp_path: Path):
+    pool = get_pool(tmp_path, workers=1, max_jobs_per_worker=10)
+    try:
+        is_valid, output = pool.validate(Path("sip-crash"))
+        assert not is_valid
+        assert "commons-ip worker" in output
+
+        is_valid, output = pool.validate(Path("sip"))
+        assert is_valid
+        assert json.loads(output)["path"] == "sip"
+    finally:
+        pool.close()
+
+
+def test_pool_concurrent_requests(tmp_path: Path):
+    pool = get_pool(tmp_path, workers=2, max_jobs_per_worker=100)
+    results: dict[int, str] = {}
+
+    def validate(i: int) -> None:
+        results[i] = json.loads(pool.validate(Path(f"sip-{i}"))[1])["path"]
+
+    threads = [threading.Thread(target=validate, args=(i,)) for i in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        pool.close()
+
+    assert results == {i: f"sip-{i}" for i in range(8)}
+
+
+def test_pool_cancellation_kills_the_worker(tmp_path: Path):
+    pool = get_pool(tmp_path, workers=1, max_jobs_per_worker=10)
+    cancellation = Cancellation()
+    timer = threading.Timer(0.5, cancellation.cancel)
+    timer.start()
+    try:
+        with pytest.raises(ValidationCancelled):
+            _ = pool.validate(Path("sip-hang"), cancellation=cancellation)
+
+        # The pool replaces the killed worker.
+        is_valid, _ = pool.validate(Path("sip"))
+        assert is_valid
+    finally:
+        timer.cancel()
+        pool.close()
+
+
+def test_cli_cancellation_kills_the_process(tmp_path: Path):
+    # Without a pool, commons-ip runs as a CLI process in every mode.
+    command = [sys.executable, "-c", "import time; time.sleep(60)"]
+    ctx = SipContext(tmp_path)
+    timer = threading.Timer(0.5, ctx.cancellation.cancel)
+    timer.start()
+    started = time.monotonic()
+    try:
+        with (
+            patch.object(commons_ip, "get_cli_command", lambda *_: command),
+            pytest.raises(ValidationCancelled),
+        ):
+            _ = commons_ip.validate_commons_ip(ctx)
+    finally:
+        timer.cancel()
+
+    assert time.monotonic() - started < 10
+
+
+@pytest.mark.skipif(
+    shutil.which("java") is None or not Path(py_commons_ip.cli_jar).is_file(),
+    reason="Needs Java and the commons-ip CLI jar",
+)
+def test_java_worker_matches_commons_ip_cli(tmp_path: Path):
+    "The real `CommonsIPWorker.java`, reused for several SIPs, gives the same result as the CLI."
+    valid_sip = generate_sip(tmp_path / "valid", SipSpec(representations=2))
+    invalid_sip = Path(
+        shutil.copytree(valid_sip, tmp_path / "invalid" / valid_sip.name)
+    )
+    (invalid_sip / "METS.xml").unlink()
+
+    pool = CommonsIPPool(workers=1, max_jobs_per_worker=10)
+    try:
+        results = [pool.validate(sip) for sip in (valid_sip, invalid_sip, valid_sip)]
+    finally:
+        pool.close()
+
+    for sip, (is_valid, output) in zip((valid_sip, invalid_sip, valid_sip), results):
+        cli_is_valid, cli_output = py_commons_ip.validate(sip, "2.2.0")
+        assert is_valid == cli_is_valid
+        assert (
+            json.loads(output)["summary"]["result"]
+            == json.loads(cli_output)["summary"]["result"]
+        )
+    assert results[1][0] is False
@@ -0,0 +1,88 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.sip_generator import SipSpec, generate_sip
+
+from meemoo_sip_validator.v2_1._core import context
+from meemoo_sip_validator.v2_1._core.context import SipContext
+from meemoo_sip_validator.v2_1._core.options import ValidationOptions
+from meemoo_sip_validator.v2_1._core.scheduler import run_stages
+from meemoo_sip_validator.v2_1._core.utils import Profile
+from meemoo_sip_validator.v2_1._core.validate import get_selected_stages
+
+ROOT_METS = """<?xml version="1.0" encoding="UTF-8"?>
+<mets:mets xmlns:mets="http://www.loc.gov/METS/"
+    xmlns:csip="https://DILCIS.eu/XML/METS/CSIPExtensionMETS"
+    csip:OTHERCONTENTINFORMATIONTYPE="https://data.hetarchief.be/id/sip/2.1/basic">
+  <mets:structMap><mets:div/></mets:structMap>
+</mets:mets>
+"""
+
+PREMIS = """<?xml version="1.0" encoding="UTF-8"?>
+<premis:premis xmlns:premis="http://www.loc.gov/premis/v3"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" version="3.0">
+  <premis:object xsi:type="premis:intellectualEntity">
+    <premis:objectIdentifier>
+      <premis:objectIdentifierType>UUID</premis:objectIdentifierType>
+      <premis:objectIdentifierValue>c8ab8c6f-1a0a-4c39-a1a6-5d2a4f3e8e11</premis:objectIdentifierValue>
+    </premis:objectIdentifier>
+  </premis:object>
+</premis:premis>
+"""
+
+
+def write_sip(sip_path: Path) -> None:
+    preservation = sip_path / "metadata" / "preservation"
+    preservation.mkdir(parents=True)
+    (sip_path / "METS.xml").write_text(ROOT_METS)
+    (preservation / "premis.xml").write_text(PREMIS)
+
+
+def test_sip_context_parses_each_document_once(tmp_path: Path):
+    write_sip(tmp_path)
+    ctx = SipContext(tmp_path)
+    premis_path = tmp_path / "metadata" / "preservation" / "premis.xml"
+
+    with patch.object(
+        context, "parse_document", wraps=context.parse_document
+    ) as parse_mock:
+        assert ctx.profile == Profile.BASIC
+        assert ctx.profile == Profile.BASIC
+        _ = ctx.document(premis_path)
+        premis = ctx.premis(premis_path)
+
+        assert ctx.premis(premis_path) is premis
+        assert parse_mock.call_count == 2
+
+    entity = premis.objects[0]
+    assert entity.xsi_type == "{http://www.loc.gov/premis/v3}intellectualEntity"
+    # Decoding the model must not alter the tree used for XSD validation.
+    document = ctx.document(premis_path)
+    object_element = document.root.find("{http://www.loc.gov/premis/v3}object")
+    assert object_element is not None
+    assert (
+        object_element.get("{http://www.w3.org/2001/XMLSchema-instance}type")
+        == "premis:intellectualEntity"
+    )
+
+
+def test_sip_context_without_root_mets(tmp_path: Path):
+    ctx = SipContext(tmp_path)
+    assert ctx.profile is None
+
+
+def test_sip_context_drops_documents_once_they_are_read(tmp_path: Path):
+    sip_path = generate_sip(tmp_path, SipSpec(representations=2, files=2))
+    options = ValidationOptions(skip_stages=("commons-ip",))
+
+    with patch.object(
+        context, "parse_document", wraps=context.parse_document
+    ) as parse_mock:
+        with SipContext(sip_path, options) as ctx:
+            report = run_stages(ctx, get_selected_stages(ctx))
+            documents = [key for key in ctx._values if key[0] == "document"]  # pyright: ignore[reportPrivateUsage]
+
+    assert report.is_valid
+    assert documents == []
+    parsed = [call.args[0] for call in parse_mock.call_args_list]
+    assert len(parsed) == len(set(parsed))
@@ -0,0 +1,49 @@
+from hashlib import md5, sha256
+from pathlib import Path
+
+import pytest
+
+from meemoo_sip_validator.v2_1._core.cancellation import (
+    Cancellation,
+    ValidationCancelled,
+)
+from meemoo_sip_validator.v2_1._core.digests import calculate_digests
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1024, 1024**2])
+def test_calculate_digests_single_pass(tmp_path: Path, block_size: int):
+    content = bytes(range(256)) * 100
+    path = tmp_path / "data.bin"
+    path.write_bytes(content)
+
+    digests = calculate_digests(path, ["MD5", "SHA-256"], block_size)
+
+    assert digests == {
+        "MD5": md5(content).hexdigest(),
+        "SHA-256": sha256(content).hexdigest(),
+    }
+
+
+def test_calculate_digests_empty_file(tmp_path: Path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+
+    assert calculate_digests(path, ["MD5"]) == {"MD5": md5(b"").hexdigest()}
+
+
+def test_calculate_digests_unsupported_algorithm(tmp_path: Path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"data")
+
+    with pytest.raises(ValueError):
+        _ = calculate_digests(path, ["CRC32"])
+
+
+def test_calculate_digests_cancelled(tmp_path: Path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"data")
+    cancellation = Cancellation()
+    cancellation.cancel()
+
+    with pytest.raises(ValidationCancelled):
+        _ = calculate_digests(path, ["MD5"], cancellation=cancellation)
@@ -0,0 +1,108 @@
+from hashlib import md5
+from pathlib import Path
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from meemoo_sip_validator.v2_1._core import digests
+from meemoo_sip_validator.v2_1._core.context import SipContext
+from meemoo_sip_validator.v2_1._core.fixity_cache import (
+    FileIdentity,
+    FixityCacheBackend,
+    FixityCachePolicy,
+    SQLiteDigestCache,
+    XattrDigestCache,
+)
+from meemoo_sip_validator.v2_1._core.options import ValidationOptions
+from meemoo_sip_validator.v2_1._core.premis import helpers
+
+
+def test_sqlite_digest_cache_eviction(tmp_path: Path):
+    cache = SQLiteDigestCache(tmp_path / "fixity.sqlite")
+    for inode in range(5):
+        identity = FileIdentity(device=1, inode=inode, size=10, mtime_ns=100)
+        cache.put(tmp_path, identity, "MD5", f"digest-{inode}")
+
+    identity = FileIdentity(device=1, inode=4, size=10, mtime_ns=100)
+    assert cache.get(tmp_path, identity, "MD5") == "digest-4"
+    assert cache.get(tmp_path, identity, "SHA256") is None
+    changed = FileIdentity(device=1, inode=4, size=10, mtime_ns=200)
+    assert cache.get(tmp_path, changed, "MD5") is None
+
+    assert cache.evict(max_age=None, max_entries=2) == 3
+    assert cache.evict(max_age=None, max_entries=2) == 0
+    assert cache.get(tmp_path, identity, "MD5") == "digest-4"
+    assert cache.evict(max_age=0, max_entries=None) == 2
+    cache.close()
+
+
+def test_sqlite_digest_cache_evicts_the_oldest_entries(tmp_path: Path):
+    cache = SQLiteDigestCache(tmp_path / "fixity.sqlite")
+    identities = [
+        FileIdentity(device=1, inode=i, size=10, mtime_ns=100) for i in range(4)
+    ]
+    with patch.object(time, "time", side_effect=[4, 1, 3, 2]):
+        for identity in identities:
+            cache.put(tmp_path, identity, "MD5", "digest")
+
+    assert cache.evict(max_age=None, max_entries=2) == 2
+    assert [cache.get(tmp_path, identity, "MD5") for identity in identities] == [
+        "digest",
+        None,
+        "digest",
+        None,
+    ]
+    cache.close()
+
+
+def test_xattr_digest_cache_ignores_foreign_values(tmp_path: Path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"a")
+    cache = XattrDigestCache()
+    identity = FileIdentity(device=1, inode=1, size=1, mtime_ns=100)
+    try:
+        cache.put(path, identity, "MD5", "digest")
+        assert cache.get(path, identity, "MD5") == "digest"
+    except OSError:
+        pytest.skip("No user extended attributes on this filesystem")
+
+    for value in [b"[1, 2]", b'"digest"', b"null", b'{"identity": [1, 1, 1, 100]}']:
+        os.setxattr(path, XattrDigestCache.prefix + "MD5", value)
+        assert cache.get(path, identity, "MD5") is None
+
+
+def test_calculate_message_digests_uses_cache(tmp_path: Path):
+    data = tmp_path / "data"
+    data.mkdir()
+    paths = [data / "a.bin", data / "b.bin"]
+    for path in paths:
+        path.write_bytes(path.name.encode())
+    expected = [{"MD5": md5(path.name.encode()).hexdigest()} for path in paths]
+
+    options = ValidationOptions(
+        fixity_cache=FixityCacheBackend.SQLITE,
+        fixity_cache_path=tmp_path / "fixity.sqlite",
+    )
+    with SipContext(tmp_path, options) as ctx:
+        assert helpers.calculate_message_digests(paths, ctx) == expected
+        assert ctx.fixity_cache_stats.misses == 2
+
+    with SipContext(tmp_path, options) as ctx:
+        with patch.object(digests, "calculate_digests") as calc_mock:
+            assert helpers.calculate_message_digests(paths, ctx) == expected
+        assert calc_mock.call_count == 0
+        assert ctx.fixity_cache_stats.hits == 2
+
+    rehash = ValidationOptions(
+        fixity_cache=FixityCacheBackend.SQLITE,
+        fixity_cache_path=tmp_path / "fixity.sqlite",
+        fixity_cache_policy=FixityCachePolicy.REHASH,
+    )
+    with SipContext(tmp_path, rehash) as ctx:
+        calc_mock = MagicMock(side_effect=digests.calculate_digests)
+        with patch.object(digests, "calculate_digests", calc_mock):
+            assert helpers.calculate_message_digests(paths, ctx) == expected
+        assert calc_mock.call_count == 2
+        assert ctx.fixity_cache_stats.misses == 2
@@ -0,0 +1,68 @@
+from pathlib import Path
+import threading
+import time
+
+from meemoo_sip_validator.v2_1._core.hashing import HashingEngine, HashJob
+
+
+def test_hashing_engine_keeps_job_order():
+    jobs = [HashJob(path=Path(f"file_{i}"), size=i) for i in range(20)]
+    engine = HashingEngine(workers=4, max_bytes_in_flight=1000)
+
+    results = engine.map(lambda path: path.name, jobs)
+
+    assert results == [f"file_{i}" for i in range(20)]
+
+
+def test_hashing_engine_bounds_bytes_in_flight():
+    lock = threading.Lock()
+    in_flight = 0
+    observed: list[int] = []
+    sizes = {Path(f"file_{i}"): 40 for i in range(10)} | {Path("large"): 500}
+
+    def fake_hash(path: Path) -> str:
+        nonlocal in_flight
+        with lock:
+            in_flight += sizes[path]
+            observed.append(in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= sizes[path]
+        return path.name
+
+    jobs = [HashJob(path=path, size=size) for path, size in sizes.items()]
+    engine = HashingEngine(workers=8, max_bytes_in_flight=100)
+
+    _ = engine.map(fake_hash, jobs)
+
+    # The oversized file runs on its own, the others at most two at a time.
+    assert 500 in observed
+    assert all(value <= 100 for value in observed if value != 500)
+
+
+def test_hashing_engine_takes_worker_slots():
+    lock = threading.Lock()
+    running = 0
+    observed: list[int] = []
+
+    def fake_hash(path: Path) -> str:
+        nonlocal running
+        with lock:
+            running += 1
+            observed.append(running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return path.name
+
+    jobs = [HashJob(path=Path(f"file_{i}"), size=1) for i in range(10)]
+    # Another stage holds one of the three slots.
+    worker_slots = threading.BoundedSemaphore(3)
+    _ = worker_slots.acquire()
+    engine = HashingEngine(
+        workers=8, max_bytes_in_flight=1000, worker_slots=worker_slots
+    )
+
+    _ = engine.map(fake_hash, jobs)
+
+    assert max(observed) == 2
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from meemoo_sip_validator.v2_1._core.manifest import EntryType, build_manifest
+
+
+def test_manifest_matches_filesystem(tmp_path: Path):
+    for representation in ("representation_1", "representation_2"):
+        preservation = tmp_path / "representations" / representation / "metadata"
+        preservation.mkdir(parents=True)
+        (preservation / "premis.xml").write_text("<premis/>")
+        (tmp_path / "representations" / representation / "data").mkdir()
+    (tmp_path / "representations" / "representation_1" / "data" / "a.mp4").write_bytes(
+        b"1234"
+    )
+    (tmp_path / "premis.xml").write_text("<premis/>")
+
+    manifest = build_manifest(tmp_path)
+
+    assert manifest.find("premis.xml") == list(tmp_path.rglob("premis.xml"))
+    representations = tmp_path / "representations"
+    assert set(manifest.iterdir(representations)) == set(representations.iterdir())
+    assert manifest.iterdir(representations / "representation_2" / "data") == ()
+
+    data_file = representations / "representation_1" / "data" / "a.mp4"
+    entry = manifest.get(data_file)
+    assert entry is not None
+    assert entry.type == EntryType.FILE
+    assert entry.size == 4
+    assert entry.mtime_ns == data_file.stat().st_mtime_ns
+    assert manifest.exists(
+        representations / "representation_1" / "data" / ".." / "data"
+    )
+    assert not manifest.exists(representations / "representation_3")
+
+
+def test_manifest_of_missing_directory(tmp_path: Path):
+    manifest = build_manifest(tmp_path / "missing")
+    assert not manifest.exists(tmp_path / "missing")
+    assert manifest.find("METS.xml") == []
+
+
+def test_manifest_follows_symlinked_directories(tmp_path: Path):
+    data = tmp_path / "elsewhere" / "data"
+    data.mkdir(parents=True)
+    (data / "a.mp4").write_bytes(b"1234")
+    (data / "loop").symlink_to(data)
+    sip = tmp_path / "sip"
+    representation = sip / "representations" / "representation_1"
+    representation.mkdir(parents=True)
+    (representation / "data").symlink_to(data)
+
+    manifest = build_manifest(sip)
+
+    assert manifest.is_dir(representation / "data")
+    assert manifest.is_file(representation / "data" / "a.mp4")
+    assert set(manifest.iterdir(representation / "data")) == set(
+        (representation / "data").iterdir()
+    )
+    # The cycle is listed, but not walked again.
+    assert manifest.iterdir(representation / "data" / "loop") == ()
+    # Like `Path.rglob`, `find` does not look into symlinked directories.
+    assert manifest.find("a.mp4") == list(sip.rglob("a.mp4")) == []
@@ -1,3 +1,5 @@
+from pathlib import Path
+import pickle
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,11 +9,21 @@ from eark_models.premis.v3_0 import (  # pyright: ignore[reportMissingTypeStubs]
     MessageDigest,
     MessageDigestAlgorithm,
     ObjectCharacteristics,
+    ObjectIdentifier,
+    ObjectIdentifierType,
+    ObjectIdentifierValue,
     Premis,
 )
 
+from meemoo_sip_validator.v2_1._core.context import SipContext
+from meemoo_sip_validator.v2_1._core.options import ValidationOptions
+from meemoo_sip_validator.v2_1._core.premis.view import PremisView, get_premis_view
 from meemoo_sip_validator.v2_1._core.premis.premis import (
     check_fixity_message_digest_matches_actual_hash,
+    check_object_identifier_type_uuid_existance,
+    check_object_identifier_type_vocabulary,
+    check_object_identifiers_uniqueness,
+    run_checks,
 )
 
 
@@ -63,7 +75,137 @@ def test_check_fixity_message_digest_matches_actual_hash(
         __source__="xml", version="3.0", objects=[premis_file], events=[], agents=[]
     )
 
-    results = check_fixity_message_digest_matches_actual_hash([premis])
+    results = check_fixity_message_digest_matches_actual_hash(PremisView([premis]))
     assert len(results.failed_items) == 0
     assert calc_mock.call_count == 1
     assert data_patch_mock.call_count == 1
+
+
+def object_identifier(
+    source: str, type: str, value: str, authority: str | None = None
+) -> ObjectIdentifier:
+    return ObjectIdentifier(
+        __source__=source,
+        type=ObjectIdentifierType(
+            __source__=source,
+            text=type,
+            authority=authority,
+            authority_uri=None,
+            value_uri=None,
+        ),
+        value=ObjectIdentifierValue(__source__=source, text=value),
+        simple_link=None,
+    )
+
+
+def test_check_object_identifiers_uniqueness():
+    identifiers = [
+        object_identifier("a.xml", "UUID", "1"),
+        object_identifier("a.xml", "UUID", "2"),
+        object_identifier("b.xml", "UUID", "1"),  # duplicate in another file
+        object_identifier("b.xml", "UUID", "2", authority="meemoo"),
+        object_identifier("b.xml", "LOCAL", "3"),
+    ]
+    premis = Premis(
+        __source__="xml",
+        version="3.0",
+        objects=[
+            File(
+                __source__="xml",
+                xsi_type="{http://www.loc.gov/premis/v3}file",
+                identifiers=identifiers,
+                significant_properties=[],
+                characteristics=[],
+                original_name=None,
+                storages=[],
+                relationships=[],
+            )
+        ],
+        events=[],
+        agents=[],
+    )
+
+    results = check_object_identifiers_uniqueness(PremisView([premis]))
+
+    # Same items, in the same order, as comparing every pair of identifiers.
+    expected = [
+        identifier
+        for identifier in identifiers
+        if len([_id for _id in identifiers if _id == identifier]) != 1
+    ]
+    assert results.failed_items == expected
+    assert [identifier.__source__ for identifier in results.failed_items] == [
+        "a.xml",
+        "b.xml",
+    ]
+
+
+def test_premis_view_is_built_once_per_sip(tmp_path: Path):
+    with SipContext(tmp_path) as ctx:
+        view, _ = get_premis_view(ctx)
+        assert get_premis_view(ctx)[0] is view
+
+
+def test_run_checks_fail_fast(tmp_path: Path):
+    file = File(
+        __source__="xml",
+        xsi_type="{http://www.loc.gov/premis/v3}file",
+        identifiers=[
+            object_identifier("a.xml", "LOCAL", "1"),
+            object_identifier("a.xml", "LOCAL", "1"),
+        ],
+        significant_properties=[],
+        characteristics=[],
+        original_name=None,
+        storages=[],
+        relationships=[],
+    )
+    premis = Premis(
+        __source__="xml", version="3.0", objects=[file], events=[], agents=[]
+    )
+    checks = [
+        check_object_identifiers_uniqueness,
+        check_object_identifier_type_uuid_existance,
+        check_object_identifier_type_vocabulary,
+    ]
+
+    with SipContext(tmp_path) as ctx:
+        report = run_checks(PremisView([premis], ctx), checks)
+    assert len(list(report.failures)) > 1
+    assert not report.truncated
+
+    # The uniqueness check is expensive, so it would run last.
+    with SipContext(tmp_path, ValidationOptions(fail_fast=True)) as ctx:
+        report = run_checks(PremisView([premis], ctx), checks)
+    assert [failure.message for failure in report.failures] == [
+        "Usage of PREMIS object ('LOCAL', '1') without identifier of type 'UUID'. All objects must have at least one identifier of type 'UUID'."
+    ]
+    assert report.truncated
+
+
+def test_report_of_failing_check_can_be_pickled():
+    premis = Premis(
+        __source__="xml",
+        version="3.0",
+        objects=[
+            File(
+                __source__="xml",
+                xsi_type="{http://www.loc.gov/premis/v3}file",
+                identifiers=[object_identifier("a.xml", "unknown", "1")],
+                significant_properties=[],
+                characteristics=[],
+                original_name=None,
+                storages=[],
+                relationships=[],
+            )
+        ],
+        events=[],
+        agents=[],
+    )
+    report = run_checks(PremisView([premis]), [check_object_identifier_type_vocabulary])
+
+    # The messages are rendered by local functions, so they are pickled as text.
+    unpickled = pickle.loads(pickle.dumps(report))
+
+    assert not report.is_valid
+    assert unpickled.to_dict() == report.to_dict()
@@ -0,0 +1,122 @@
+from eark_models.premis.v3_0 import (  # pyright: ignore[reportMissingTypeStubs]
+    ObjectIdentifier,
+    ObjectIdentifierType,
+    ObjectIdentifierValue,
+    Premis,
+    RelatedObjectIdentifier,
+    RelatedObjectIdentifierType,
+    RelatedObjectIdentifierValue,
+    Relationship,
+    RelationshipSubType,
+    RelationshipType,
+    Representation,
+)
+
+from meemoo_sip_validator.v2_1._core.premis.graph import PremisGraph
+from meemoo_sip_validator.v2_1._core.premis.view import PremisView
+from meemoo_sip_validator.v2_1._core.premis.premis import (
+    check_related_objects_identifier_uses_existing_object,
+    check_related_objects_inverse_relationship_valid,
+)
+
+
+def related(value: str) -> RelatedObjectIdentifier:
+    return RelatedObjectIdentifier(
+        __source__="xml",
+        type=RelatedObjectIdentifierType(
+            __source__="xml",
+            text="UUID",
+            authority=None,
+            authority_uri=None,
+            value_uri=None,
+        ),
+        value=RelatedObjectIdentifierValue(__source__="xml", text=value),
+        simple_link=None,
+    )
+
+
+def representation(value: str, relationships: dict[str, list[str]]) -> Representation:
+    return Representation(
+        __source__="xml",
+        xsi_type="{http://www.loc.gov/premis/v3}representation",
+        identifiers=[
+            ObjectIdentifier(
+                __source__="xml",
+                type=ObjectIdentifierType(
+                    __source__="xml",
+                    text="UUID",
+                    authority=None,
+                    authority_uri=None,
+                    value_uri=None,
+                ),
+                value=ObjectIdentifierValue(__source__="xml", text=value),
+                simple_link=None,
+            )
+        ],
+        significant_properties=[],
+        original_name=None,
+        storages=[],
+        relationships=[
+            Relationship(
+                __source__="xml",
+                type=RelationshipType(
+                    __source__="xml",
+                    text="structural",
+                    authority=None,
+                    authority_uri=None,
+                    value_uri=None,
+                ),
+                sub_type=RelationshipSubType(
+                    __source__="xml",
+                    text=sub_type,
+                    authority=None,
+                    authority_uri=None,
+                    value_uri=None,
+                ),
+                related_object_identifiers=[related(target) for target in targets],
+                related_event_identifiers=[],
+            )
+            for sub_type, targets in relationships.items()
+        ],
+    )
+
+
+def get_premises() -> list[Premis]:
+    objects = [
+        representation("a", {"includes": ["b", "c"]}),
+        representation("b", {"is included in": ["a"]}),
+        representation("c", {}),  # missing inverse relationship
+        representation("d", {"includes": ["unknown"]}),
+    ]
+    return [
+        Premis(__source__="xml", version="3.0", objects=objects, events=[], agents=[])
+    ]
+
+
+def test_premis_graph():
+    premises = get_premises()
+    a, b, c, _ = premises[0].objects
+    graph = PremisGraph.from_premises(premises)
+
+    assert graph.find_object(related("b")) is b
+    assert graph.find_object(related("unknown")) is None
+    assert [sub_type.text for sub_type in graph.relationship_sub_types(a, c)] == [
+        "includes"
+    ]
+    assert graph.relationship_sub_types(c, a) == []
+
+
+def test_relationship_checks():
+    premises = get_premises()
+
+    existing = check_related_objects_identifier_uses_existing_object(
+        PremisView(premises)
+    )
+    assert [identifier.value.text for identifier in existing.failed_items] == [
+        "unknown"
+    ]
+
+    inverse = check_related_objects_inverse_relationship_valid(PremisView(premises))
+    assert [
+        (pair.items[0].text, pair.items[1].value.text) for pair in inverse.failed_items
+    ] == [("includes", "c")]
@@ -0,0 +1,95 @@
+from pathlib import Path
+import shutil
+import tracemalloc
+
+import pytest
+
+from benchmarks.sip_generator import SipSpec, generate_sip
+from meemoo_sip_validator.v2_1 import ValidationOptions, validate_to_report
+from meemoo_sip_validator.v2_1._core.codes import Code
+from meemoo_sip_validator.v2_1._core.context import SipContext
+from meemoo_sip_validator.v2_1._core.premis.stream import read_premis
+
+
+@pytest.fixture(scope="module")
+def invalid_sip(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    "A SIP with PREMIS rule failures, an XSD failure and a PREMIS file that is not well-formed."
+    tmp_path = tmp_path_factory.mktemp("sip")
+    sip_path = generate_sip(
+        tmp_path / "valid", SipSpec(representations=2, files=3, events_per_file=2)
+    )
+    sip_path = Path(shutil.copytree(sip_path, tmp_path / "invalid" / sip_path.name))
+    preservation = Path("metadata") / "preservation" / "premis.xml"
+
+    premis_path = sip_path / "representations" / "representation_1" / preservation
+    premis_xml = premis_path.read_text()
+    premis_xml = premis_xml.replace(
+        "<premis:eventType>creation</premis:eventType>",
+        "<premis:eventType>unknown</premis:eventType>",
+        1,
+    )
+    premis_xml = premis_xml.replace("file_2.bin", "missing.bin")
+    premis_xml = premis_xml.replace(
+        "</premis:premis>", "<premis:unknown/></premis:premis>"
+    )
+    _ = premis_path.write_text(premis_xml)
+
+    premis_path = sip_path / "representations" / "representation_2" / preservation
+    _ = premis_path.write_text(premis_path.read_text()[:-20])
+    return sip_path
+
+
+def results(sip_path: Path, stream_premis: bool) -> list[tuple[str, ...]]:
+    "The results, without the XSD messages in which xmlschema names objects by address."
+    report = validate_to_report(
+        sip_path,
+        ValidationOptions(skip_stages=("commons-ip",), stream_premis=stream_premis),
+    )
+    return [
+        (
+            result.code.value,
+            result.result,
+            getattr(result, "source", ""),
+            ""
+            if result.message.startswith("XSD validation failed")
+            else result.message,
+        )
+        for result in report.results
+    ]
+
+
+def test_stream_premis_gives_the_same_report(invalid_sip: Path):
+    streamed = results(invalid_sip, stream_premis=True)
+
+    assert streamed == results(invalid_sip, stream_premis=False)
+    failed_codes = {result[0] for result in streamed if result[1] == "FAIL"}
+    assert {
+        Code.xsd_valid,
+        Code.event_type_thesauri,
+        Code.file_is_mappable_to_data,
+    } <= failed_codes
+    assert any(
+        result[3].startswith("Unable to parse premis file") for result in streamed
+    )
+
+
+def test_read_premis_drops_decoded_elements(tmp_path: Path):
+    sip_path = generate_sip(tmp_path, SipSpec(files=200, events_per_file=2))
+    premis_path = (
+        sip_path / "representations/representation_1/metadata/preservation/premis.xml"
+    )
+
+    tracemalloc.start()
+    try:
+        objects, events, agents = read_premis(premis_path)
+        streamed_size, streamed_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        premis = SipContext(sip_path).premis(premis_path)
+        _, whole_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert (objects, events, agents) == (premis.objects, premis.events, premis.agents)
+    # Little more than the models it returns, as opposed to a document and a copy.
+    assert streamed_peak < 1.5 * streamed_size
+    assert streamed_peak < whole_peak
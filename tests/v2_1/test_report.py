@@ -0,0 +1,78 @@
+from meemoo_sip_validator.v2_1._core.codes import Code
+from meemoo_sip_validator.v2_1._core.report import (
+    Failure,
+    Message,
+    Report,
+    RuleResult,
+    Severity,
+    Success,
+    TupleWithSource,
+)
+
+
+def test_combine_reports():
+    success = Success(code=Code.xsd_valid, message="ok")
+    failure = Failure(
+        code=Code.xsd_valid, message="not ok", severity=Severity.ERROR, source="a.xml"
+    )
+    reports = [
+        Report(results=[success], skipped_stages=["xsd"]),
+        Report(results=[failure], fixity_cache={"hits": 1, "misses": 0}),
+        Report(results=[success], truncated=True),
+    ]
+
+    combined = Report.combine(reports)
+
+    assert combined.results == [success, failure, success]
+    assert combined.skipped_stages == ["xsd"]
+    assert combined.fixity_cache == {"hits": 1, "misses": 0}
+    assert combined.truncated
+    assert combined == reports[0] + reports[1] + reports[2]
+    assert Report.combine([]) == Report(results=[])
+
+
+def test_failure_messages_are_rendered_when_read():
+    rendered: list[str] = []
+
+    def fail_msg(item: TupleWithSource[str]) -> str:
+        rendered.append(item.items[0])
+        return f"Invalid value '{item.items[0]}'."
+
+    items = [TupleWithSource(__source__="a.xml", items=(str(i),)) for i in range(3)]
+    report = RuleResult(
+        code=Code.xsd_valid,
+        failed_items=items,
+        fail_msg=fail_msg,
+        success_msg="ok",
+    ).to_report()
+
+    assert rendered == []
+    assert not report.is_valid
+    assert report.to_dict()["errors"][1] == {
+        "message": "Invalid value '1'.",
+        "severity": Severity.ERROR,
+        "source": "a.xml",
+        "result": "FAIL",
+    }
+    assert not hasattr(report.results[0], "__dict__")
+
+
+def test_failure_messages_are_rendered_once():
+    rendered: list[str] = []
+
+    def fail_msg(item: TupleWithSource[str]) -> str:
+        rendered.append(item.items[0])
+        return f"Invalid value '{item.items[0]}'."
+
+    message = Message(fail_msg, TupleWithSource(__source__="a.xml", items=("x",)))
+    failure = Failure(
+        code=Code.xsd_valid, message=message, severity=Severity.ERROR, source="a.xml"
+    )
+
+    assert failure.message == "Invalid value 'x'."
+    _ = Report(results=[failure]).to_dict()
+    assert failure.message == "Invalid value 'x'."
+    assert rendered == ["x"]
+    # The item and the closure of the rule are let go once the message is rendered.
+    assert message.item is None
+    assert message.render is None
@@ -0,0 +1,205 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from meemoo_sip_validator.v2_1._core.codes import Code
+from meemoo_sip_validator.v2_1._core.context import SipContext
+from meemoo_sip_validator.v2_1._core.options import ValidationOptions
+from meemoo_sip_validator.v2_1._core.report import Failure, Report, Severity, Success
+from meemoo_sip_validator.v2_1._core.scheduler import (
+    Stage,
+    iter_stages,
+    run_stages,
+    select_stages,
+)
+
+
+def passing(name: str):
+    return lambda _: Report(results=[Success(code=Code.xsd_valid, message=name)])
+
+
+def failing(name: str):
+    return lambda _: Report(
+        results=[
+            Failure(
+                code=Code.xsd_valid,
+                message=name,
+                severity=Severity.ERROR,
+                source=name,
+            )
+        ]
+    )
+
+
+def messages(report: Report) -> list[str]:
+    return [result.message for result in report.results]
+
+
+def test_stages_are_skipped_when_a_requirement_fails(tmp_path: Path):
+    stages = [
+        Stage("a", failing("a")),
+        Stage("b", passing("b"), requires=("a",)),
+        Stage("c", passing("c"), requires=("b",)),
+        Stage("d", passing("d")),
+    ]
+    with SipContext(tmp_path) as ctx:
+        report = run_stages(ctx, stages)
+
+    assert messages(report) == ["a", "d"]
+    assert report.skipped_stages == ["b", "c"]
+    assert report.to_dict()["skipped_stages"] == ["b", "c"]
+
+
+def test_reports_keep_the_stage_order(tmp_path: Path):
+    second_done = threading.Event()
+
+    def first(_: SipContext) -> Report:
+        # Finishes after the second stage, which runs at the same time.
+        assert second_done.wait(timeout=10)
+        return passing("first")(_)
+
+    def second(_: SipContext) -> Report:
+        second_done.set()
+        return passing("second")(_)
+
+    stages = [
+        Stage("first", first),
+        Stage("second", second),
+        Stage("third", passing("third"), requires=("first",)),
+    ]
+    with SipContext(tmp_path) as ctx:
+        report = run_stages(ctx, stages)
+
+    assert messages(report) == ["first", "second", "third"]
+    assert report.skipped_stages == []
+    assert "skipped_stages" not in report.to_dict()
+
+
+def test_unselected_requirements_do_not_hold_back_stages(tmp_path: Path):
+    stages = [
+        Stage("a", failing("a")),
+        Stage("b", passing("b"), requires=("a",)),
+    ]
+    with SipContext(tmp_path) as ctx:
+        report = run_stages(ctx, select_stages(stages, skip=("a",)))
+
+    assert messages(report) == ["b"]
+
+
+def test_select_stages():
+    stages = [
+        Stage("a", passing("a")),
+        Stage("b", passing("b")),
+        Stage("c", passing("c")),
+    ]
+
+    assert [stage.name for stage in select_stages(stages, only=("c", "a"))] == [
+        "a",
+        "c",
+    ]
+    assert [stage.name for stage in select_stages(stages, skip=("b",))] == ["a", "c"]
+    with pytest.raises(ValueError):
+        _ = select_stages(stages, skip=("x",))
+
+
+def test_circular_requirements(tmp_path: Path):
+    stages = [
+        Stage("a", passing("a"), requires=("b",)),
+        Stage("b", passing("b"), requires=("a",)),
+    ]
+    with SipContext(tmp_path) as ctx, pytest.raises(ValueError):
+        _ = run_stages(ctx, stages)
+
+
+def test_fail_fast_runs_cheap_stages_first(tmp_path: Path):
+    ran: list[str] = []
+
+    def expensive(ctx: SipContext) -> Report:
+        ran.append("expensive")
+        return passing("expensive")(ctx)
+
+    stages = [
+        Stage("expensive", expensive, cost=5),
+        Stage("cheap", failing("cheap"), cost=1),
+        Stage("cheaper", passing("cheaper"), cost=0),
+    ]
+    with SipContext(tmp_path, ValidationOptions(fail_fast=True)) as ctx:
+        report = run_stages(ctx, stages)
+
+    assert ran == []
+    assert messages(report) == ["cheap", "cheaper"]
+    assert report.truncated
+    assert report.to_dict()["truncated"]
+
+
+def test_fail_fast_cancels_running_stages(tmp_path: Path):
+    started = threading.Event()
+
+    def slow(ctx: SipContext) -> Report:
+        started.set()
+        while True:
+            ctx.cancellation.raise_if_cancelled()
+            time.sleep(0.01)
+
+    def fail_after_start(ctx: SipContext) -> Report:
+        assert started.wait(timeout=10)
+        return failing("fast")(ctx)
+
+    stages = [Stage("slow", slow), Stage("fast", fail_after_start)]
+    with SipContext(tmp_path, ValidationOptions(fail_fast=True)) as ctx:
+        report = run_stages(ctx, stages)
+        assert ctx.cancellation.is_cancelled
+
+    assert messages(report) == ["fast"]
+    assert report.truncated
+
+
+def test_without_fail_fast_all_stages_run(tmp_path: Path):
+    stages = [
+        Stage("a", failing("a"), cost=0),
+        Stage("b", failing("b"), cost=1),
+    ]
+    with SipContext(tmp_path) as ctx:
+        report = run_stages(ctx, stages)
+
+    assert messages(report) == ["a", "b"]
+    assert not report.truncated
+    assert "truncated" not in report.to_dict()
+
+
+def test_iter_stages_yields_stages_as_they_finish(tmp_path: Path):
+    first_seen = threading.Event()
+
+    def slow(_: SipContext) -> Report:
+        # Only finishes once the fast stage was consumed.
+        assert first_seen.wait(timeout=10)
+        return passing("slow")(_)
+
+    stages = [
+        Stage("slow", slow),
+        Stage("fast", failing("fast")),
+        Stage("after-fast", passing("after-fast"), requires=("fast",)),
+    ]
+    outcomes: list[tuple[str, str]] = []
+    with SipContext(tmp_path) as ctx:
+        for outcome in iter_stages(ctx, stages):
+            outcomes.append((outcome.stage, outcome.status))
+            first_seen.set()
+
+    assert outcomes == [("fast", "done"), ("after-fast", "skipped"), ("slow", "done")]
+
+
+def test_stopping_iter_stages_cancels_the_validation(tmp_path: Path):
+    def slow(ctx: SipContext) -> Report:
+        while True:
+            ctx.cancellation.raise_if_cancelled()
+            time.sleep(0.01)
+
+    stages = [Stage("slow", slow), Stage("fast", passing("fast"))]
+    with SipContext(tmp_path) as ctx:
+        outcomes = iter_stages(ctx, stages)
+        assert next(outcomes).stage == "fast"
+        outcomes.close()
+        assert ctx.cancellation.is_cancelled
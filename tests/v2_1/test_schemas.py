@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import Any, cast
+
+from meemoo_sip_validator.v2_1._core.schemas import (
+    Schema,
+    SchemaRegistry,
+    get_bundle_path,
+    get_bundle_prefix,
+    save_bundle,
+)
+
+
+def test_schema_registry_compiles_once():
+    registry = SchemaRegistry()
+
+    first = registry.get(Schema.PREMIS)
+    second = registry.get(Schema.PREMIS)
+
+    assert first is second
+    assert registry.stats.compilations == 1
+    assert registry.stats.hits == 1
+    assert registry.stats.compile_time > 0
+
+
+def test_schema_registry_warm_up():
+    registry = SchemaRegistry()
+
+    registry.warm_up([Schema.BASIC, Schema.FILM])
+    registry.warm_up([Schema.BASIC, Schema.FILM])
+
+    assert registry.stats.compilations == 2
+    _ = registry.get(Schema.FILM)
+    assert registry.stats.hits == 1
+
+
+def test_schema_registry_loads_bundle(tmp_path: Path):
+    first_process = SchemaRegistry(cache_dir=tmp_path)
+    _ = first_process.get(Schema.METS)
+    assert first_process.stats.compilations == len(Schema)
+    assert not first_process.stats.bundle_loaded
+
+    second_process = SchemaRegistry(cache_dir=tmp_path)
+    mets_xsd = second_process.get(Schema.METS)
+    assert second_process.stats.compilations == 0
+    assert second_process.stats.bundle_loaded
+    assert mets_xsd.name == "mets-1-12.xsd.xml"
+
+
+def test_schema_registry_ignores_corrupt_bundle(tmp_path: Path):
+    get_bundle_path(tmp_path).write_bytes(b"not a pickle")
+
+    registry = SchemaRegistry(cache_dir=tmp_path)
+    _ = registry.get(Schema.PREMIS)
+
+    assert not registry.stats.bundle_loaded
+    assert registry.stats.compilations == len(Schema)
+    assert len(list(tmp_path.glob("schemas-*.pickle"))) == 1
+
+
+def test_save_bundle_removes_stale_bundles_only(tmp_path: Path):
+    stale_bundle = tmp_path / f"{get_bundle_prefix()}0000000000000000.pickle"
+    other_version_bundle = (
+        tmp_path / "schemas-py3.0-xmlschema1.0-0000000000000000.pickle"
+    )
+    _ = stale_bundle.write_bytes(b"")
+    _ = other_version_bundle.write_bytes(b"")
+
+    bundle_path = save_bundle(tmp_path, cast(Any, {}))
+
+    assert bundle_path == get_bundle_path(tmp_path)
+    assert sorted(tmp_path.iterdir()) == sorted([bundle_path, other_version_bundle])
+
+
+def test_save_bundle_cleans_up_when_pickling_fails(tmp_path: Path):
+    unpicklable = cast(Any, {Schema.METS: lambda: None})
+
+    assert save_bundle(tmp_path, unpicklable) is None
+    assert list(tmp_path.iterdir()) == []
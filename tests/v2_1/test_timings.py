@@ -0,0 +1,54 @@
+import contextvars
+import threading
+from pathlib import Path
+
+from meemoo_sip_validator.v2_1._core import timings
+from meemoo_sip_validator.v2_1._core.digests import calculate_digests
+from meemoo_sip_validator.v2_1._core.options import ValidationOptions
+from meemoo_sip_validator.v2_1._core.validate import stage_names, validate_to_report
+
+
+def test_measure_stage_and_rules(tmp_path: Path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 1000)
+
+    with timings.measure("stage") as stage:
+        with timings.measure_rule("rule") as rule:
+            _ = calculate_digests(path, ["MD5"])
+        # Work in another thread counts when it runs in a copy of the context.
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(timings.record, 500, 1),
+        )
+        thread.start()
+        thread.join()
+
+    assert rule is not None
+    assert (rule.bytes_read, rule.files_opened) == (1000, 1)
+    assert (stage.bytes_read, stage.files_opened) == (1500, 2)
+    assert stage.rules == [rule]
+    assert stage.wall_time >= rule.wall_time > 0
+    assert not timings.is_active()
+
+
+def test_rules_are_not_measured_without_a_stage():
+    with timings.measure_rule("rule") as rule:
+        timings.record(bytes_read=10)
+    assert rule is None
+
+
+def test_report_timings(tmp_path: Path):
+    report = validate_to_report(
+        tmp_path, ValidationOptions(skip_stages=("commons-ip",), timings=True)
+    )
+    report_timings = report.to_dict()["timings"]
+
+    assert [timing["name"] for timing in report_timings] == [
+        name for name in stage_names if name not in ("commons-ip", "xsd", "descriptive")
+    ]
+    structural = report_timings[0]
+    assert len(structural["rules"]) > 1
+    assert structural["results"] == sum(rule["results"] for rule in structural["rules"])
+
+    report = validate_to_report(tmp_path, ValidationOptions(only_stages=("profile",)))
+    assert "timings" not in report.to_dict()
@@ -0,0 +1,98 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.sip_generator import SipSpec, generate_sip
+
+from meemoo_sip_validator.v2_1._core import commons_ip, structural, validate, xsd
+from meemoo_sip_validator.v2_1._core.codes import Code
+from meemoo_sip_validator.v2_1._core.context import SipContext
+from meemoo_sip_validator.v2_1._core.options import ValidationOptions
+from meemoo_sip_validator.v2_1._core.premis import premis
+from meemoo_sip_validator.v2_1._core.report import Report, Success
+
+
+def marker(message: str) -> Report:
+    return Report(results=[Success(code=Code.xsd_valid, message=message)])
+
+
+def test_commons_ip_overlaps_python_stages(tmp_path: Path):
+    xsd_started = threading.Event()
+
+    def validate_commons_ip(_: SipContext) -> Report:
+        # Only finishes when the XSD stage runs at the same time.
+        assert xsd_started.wait(timeout=10)
+        return marker("commons-ip")
+
+    def validate_xsd(_: SipContext) -> Report:
+        xsd_started.set()
+        return marker("xsd")
+
+    with (
+        patch.object(commons_ip, "validate_commons_ip", validate_commons_ip),
+        patch.object(xsd, "validate_xsd", validate_xsd),
+        patch.object(structural, "validate_structural", lambda _: marker("structural")),
+        patch.object(premis, "validate_premis", lambda _: marker("premis")),
+    ):
+        # The empty SIP has no profile, which would hold back the XSD stage.
+        report = validate.validate_to_report(
+            tmp_path, ValidationOptions(skip_stages=("profile",))
+        )
+
+    assert [result.message for result in report.results][:4] == [
+        "structural",
+        "commons-ip",
+        "xsd",
+        "premis",
+    ]
+
+
+def test_fixity_runs_when_data_is_missing(tmp_path: Path):
+    sip_path = generate_sip(tmp_path, SipSpec(files=2))
+    data_path = sip_path / "representations" / "representation_1" / "data"
+    (data_path / "file_1.bin").unlink()
+    _ = (data_path / "file_2.bin").write_bytes(b"changed")
+
+    report = validate.validate_to_report(
+        sip_path, ValidationOptions(only_stages=("file-references", "fixity"))
+    )
+
+    assert report.skipped_stages == []
+    assert [failure.code for failure in report.failures] == [
+        Code.file_is_mappable_to_data,
+        Code.fixity_message_digest_matches_actual,
+    ]
+
+
+def test_symlinked_data_directory(tmp_path: Path):
+    sip_path = generate_sip(tmp_path / "sip", SipSpec(files=2))
+    data_path = sip_path / "representations" / "representation_1" / "data"
+    moved = data_path.rename(tmp_path / "data")
+    data_path.symlink_to(moved)
+
+    report = validate.validate_to_report(
+        sip_path,
+        ValidationOptions(only_stages=("structural", "file-references", "fixity")),
+    )
+
+    assert list(report.failures) == []
+
+
+def test_stopping_iter_validation_kills_commons_ip(tmp_path: Path):
+    command = [sys.executable, "-c", "import time; time.sleep(60)"]
+    with (
+        patch.object(commons_ip, "get_cli_command", lambda *_: command),
+        patch.object(structural, "validate_structural", lambda _: marker("structural")),
+    ):
+        outcomes = validate.iter_validation(
+            tmp_path, ValidationOptions(only_stages=("structural", "commons-ip"))
+        )
+        assert next(outcomes).stage == "structural"
+
+        started = time.monotonic()
+        outcomes.close()
+
+    # Returns once the commons-ip process is killed, not when it exits.
+    assert time.monotonic() - started < 10
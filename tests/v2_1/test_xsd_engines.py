@@ -0,0 +1,70 @@
+from pathlib import Path
+import shutil
+
+import pytest
+
+from benchmarks.sip_generator import PROFILES, SipSpec, generate_sip
+from meemoo_sip_validator.v2_1 import ValidationOptions, XsdEngine, validate_to_report
+
+_ = pytest.importorskip("lxml")
+
+# All examples, including the ones that test_examples.py leaves out, as the
+# engines should also agree on invalid files.
+examples_path = Path("tests/sip-examples/2.1")
+example_paths = (
+    sorted(next(path.iterdir()) for path in examples_path.iterdir() if path.is_dir())
+    if examples_path.is_dir()
+    else []
+)
+
+
+def xsd_results(sip_path: Path, engine: XsdEngine) -> list[tuple[str, ...]]:
+    "The results of the XSD stage, without their engine-specific messages."
+    report = validate_to_report(
+        sip_path, ValidationOptions(only_stages=("profile", "xsd"), xsd_engine=engine)
+    )
+    return [
+        (result.code.value, result.result, getattr(result, "source", ""))
+        for result in report.results
+    ]
+
+
+def assert_engines_agree(sip_path: Path) -> list[tuple[str, ...]]:
+    results = xsd_results(sip_path, XsdEngine.XMLSCHEMA)
+    assert xsd_results(sip_path, XsdEngine.LXML) == results
+    return results
+
+
+@pytest.mark.parametrize(
+    "sip_path", example_paths, ids=[path.parent.name for path in example_paths]
+)
+def test_engines_agree_on_examples(sip_path: Path):
+    _ = assert_engines_agree(sip_path)
+
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_engines_agree_on_valid_sips(tmp_path: Path, profile: str):
+    sip_path = generate_sip(tmp_path, SipSpec(profile=profile, representations=2))
+
+    results = assert_engines_agree(sip_path)
+
+    assert all(result[1] == "PASS" for result in results)
+
+
+def test_engines_agree_on_invalid_files(tmp_path: Path):
+    sip_path = generate_sip(tmp_path / "valid", SipSpec(representations=2))
+    sip_path = Path(shutil.copytree(sip_path, tmp_path / "invalid" / sip_path.name))
+    premis_path = sip_path / "metadata" / "preservation" / "premis.xml"
+    _ = premis_path.write_text(
+        premis_path.read_text().replace(
+            "</premis:premis>", "<premis:unknown/></premis:premis>"
+        )
+    )
+    mets_path = sip_path / "representations" / "representation_1" / "METS.xml"
+    _ = mets_path.write_text(mets_path.read_text()[:-20])
+
+    results = assert_engines_agree(sip_path)
+
+    assert sorted(result[2] for result in results if result[1] == "FAIL") == sorted(
+        [str(premis_path), str(mets_path)]
+    )
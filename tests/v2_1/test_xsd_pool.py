@@ -0,0 +1,87 @@
+from pathlib import Path
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.sip_generator import SipSpec, generate_sip
+from meemoo_sip_validator.v2_1 import ValidationOptions, XsdEngine, validate_to_report
+from meemoo_sip_validator.v2_1._core import xsd_pool
+
+root = Path(__file__).parent.parent.parent
+
+
+@pytest.fixture(scope="module")
+def invalid_sip(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    "A SIP with three representations, of which two have an invalid METS file."
+    tmp_path = tmp_path_factory.mktemp("sip")
+    sip_path = generate_sip(tmp_path / "valid", SipSpec(representations=3))
+    sip_path = Path(shutil.copytree(sip_path, tmp_path / "invalid" / sip_path.name))
+    for representation in ["representation_1", "representation_3"]:
+        mets_path = sip_path / "representations" / representation / "METS.xml"
+        _ = mets_path.write_text(mets_path.read_text()[:-20])
+    return sip_path
+
+
+def xsd_report(sip_path: Path, xsd_workers: int, fail_fast: bool = False):
+    options = ValidationOptions(
+        only_stages=("profile", "xsd"),
+        xsd_workers=xsd_workers,
+        max_workers=2,
+        fail_fast=fail_fast,
+    )
+    return validate_to_report(sip_path, options)
+
+
+def test_xsd_pool_keeps_path_order(invalid_sip: Path):
+    in_thread = xsd_report(invalid_sip, xsd_workers=0)
+    in_pool = xsd_report(invalid_sip, xsd_workers=2)
+
+    assert [result.to_dict() for result in in_pool.results] == [
+        result.to_dict() for result in in_thread.results
+    ]
+    assert {failure.source for failure in in_pool.failures} == {
+        str(invalid_sip / "representations" / "representation_1" / "METS.xml"),
+        str(invalid_sip / "representations" / "representation_3" / "METS.xml"),
+    }
+
+
+def test_xsd_pool_fail_fast(invalid_sip: Path):
+    report = xsd_report(invalid_sip, xsd_workers=2, fail_fast=True)
+
+    assert len(list(report.failures)) == 1
+    assert report.truncated
+
+
+def test_get_pool_per_settings():
+    pool = xsd_pool.get_pool(2, XsdEngine.XMLSCHEMA)
+
+    assert xsd_pool.get_pool(2, XsdEngine.XMLSCHEMA) is pool
+    assert xsd_pool.get_pool(1, XsdEngine.XMLSCHEMA) is not pool
+    assert xsd_pool.get_pool(2, XsdEngine.LXML) is not pool
+
+
+def test_xsd_pool_without_main_guard(invalid_sip: Path, tmp_path: Path):
+    "The processes of the pool cannot import such a script, so the files are validated in the script itself."
+    script = tmp_path / "script.py"
+    _ = script.write_text(
+        "from pathlib import Path\n"
+        "from meemoo_sip_validator.v2_1 import ValidationOptions, validate_to_report\n"
+        "options = ValidationOptions(only_stages=('profile', 'xsd'), xsd_workers=2)\n"
+        f"report = validate_to_report(Path({str(invalid_sip)!r}), options)\n"
+        "print(len(list(report.failures)))\n"
+    )
+
+    result = subprocess.run(
+        [sys.executable, str(script)],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(root)},
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.splitlines()[-1] == "2"